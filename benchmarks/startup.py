@@ -0,0 +1,217 @@
+"""Benchmark measuring the start-up time of pyAlgoTask and the import time of its heaviest modules.
+
+Every measurement runs in a fresh interpreter, such that nothing is imported yet. The results are
+printed, or written to ``--output``, as JSON and compared against the budgets in
+``benchmarks/budgets.json``. The exit code is 1 if any budget is exceeded, e.g.
+
+    python benchmarks/startup.py --repeat 10 --output startup.json
+"""
+import argparse
+import json
+import os
+import pathlib
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+_ROOT = pathlib.Path(__file__).resolve().parents[1]
+_DEFAULT_BUDGETS = pathlib.Path(__file__).resolve().with_name("budgets.json")
+
+SCENARIOS = {
+    "help": ["--help"],
+    "sorting": [
+        "sorting",
+        "merge",
+        "-i",
+        "5,3,1,4,2",
+        "-e",
+        "{dir}/e",
+        "-s",
+        "{dir}/s",
+    ],
+    "hashing": [
+        "hashing",
+        "linearprobing",
+        "--div",
+        "8",
+        "-i",
+        "+3,+11,+19,-11",
+        "-e",
+        "{dir}/e",
+        "-s",
+        "{dir}/s",
+    ],
+}
+"""The command-line arguments of every measured run of pyAlgoTask"""
+
+MODULES = ["pyalgotask.main", "pyalgotask.language", "pylatex", "yaml"]
+"""The modules whose import time is measured on their own"""
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def _environment() -> dict:
+    """The environment of the measured interpreters, importing pyalgotask from this checkout
+
+    :return: a copy of the environment"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(_ROOT), env.get("PYTHONPATH")])
+    )
+    return env
+
+
+def parse_importtime(output: str) -> dict:
+    """Parses the output of ``-X importtime``
+
+    :param output: the standard error of the interpreter
+    :return: a dictionary of the self and cumulative import time in seconds of every module
+    """
+    modules = {}
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_time, cumulative, _, module = match.groups()
+            modules[module] = {
+                "self": int(self_time) / 1e6,
+                "cumulative": int(cumulative) / 1e6,
+            }
+    return modules
+
+
+def measure_scenario(
+    arguments: list, repeat: int, program=("-m", "pyalgotask.main")
+) -> dict:
+    """Measures the wall-clock time of running a program in a fresh interpreter
+
+    :param arguments: the command-line arguments of the program
+    :param repeat: the number of runs
+    :param program: the interpreter arguments selecting the program
+    :return: the minimum and median time in seconds"""
+    times = []
+    with tempfile.TemporaryDirectory() as directory:
+        command = [sys.executable, *program]
+        command += [argument.format(dir=directory) for argument in arguments]
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(
+                command,
+                cwd=directory,
+                env=_environment(),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=True,
+            )
+            times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times)}
+
+
+def measure_import(module: str, repeat: int) -> dict:
+    """Measures the cumulative import time of a module in a fresh interpreter
+
+    :param module: the name of the module
+    :param repeat: the number of runs
+    :return: the minimum and median time in seconds, or None if the module is not installed
+    """
+    times = []
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=_ROOT,
+            env=_environment(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=False,
+        )
+        if process.returncode != 0:
+            return None
+        times.append(parse_importtime(process.stderr.decode())[module]["cumulative"])
+    return {"min": min(times), "median": statistics.median(times)}
+
+
+def _check_budget(result: dict, budget) -> dict:
+    """Compares the median time of a measurement with its budget
+
+    :param result: the measurement, which is updated
+    :param budget: the budget in seconds or None
+    :return: the updated measurement"""
+    result["budget"] = budget
+    result["ok"] = budget is None or result["median"] <= budget
+    return result
+
+
+def run(repeat: int, budgets: dict) -> dict:
+    """Runs every benchmark. The baseline is the start-up time of a bare interpreter.
+
+    :param repeat: the number of runs per measurement
+    :param budgets: the budgets in seconds of the scenarios and modules
+    :return: the report as dictionary"""
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "baseline": measure_scenario([], repeat, program=("-c", "pass")),
+        "scenarios": {},
+        "imports": {},
+    }
+    for name, arguments in SCENARIOS.items():
+        report["scenarios"][name] = _check_budget(
+            measure_scenario(arguments, repeat), budgets.get("scenarios", {}).get(name)
+        )
+    for module in MODULES:
+        result = measure_import(module, repeat)
+        if result is not None:
+            result = _check_budget(result, budgets.get("imports", {}).get(module))
+        report["imports"][module] = result
+    report["ok"] = all(
+        result["ok"]
+        for results in (report["scenarios"], report["imports"])
+        for result in results.values()
+        if result is not None
+    )
+    return report
+
+
+def main(argv=None) -> int:
+    """Runs the benchmark from the command-line
+
+    :param argv: the command-line arguments
+    :return: the exit code, i.e. 0 if every budget is kept and 1 otherwise"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        type=int,
+        default=5,
+        help="The number of runs per measurement, of which the median is compared.",
+    )
+    parser.add_argument(
+        "--budgets",
+        type=pathlib.Path,
+        default=_DEFAULT_BUDGETS,
+        help="A JSON file with budgets in seconds for scenarios and imports.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=pathlib.Path,
+        help="The file the JSON report is written to instead of the standard output.",
+    )
+    args = parser.parse_args(argv)
+
+    budgets = json.loads(args.budgets.read_text(encoding="UTF-8"))
+    report = run(max(1, args.repeat), budgets)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="UTF-8")
+    else:
+        print(output)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
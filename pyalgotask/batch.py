@@ -0,0 +1,596 @@
+"""Module to generate many exercises and solutions in one process driven by a manifest file.
+
+A manifest is a YAML (or JSON) file either consisting of a list of jobs or of a mapping with
+the keys ``jobs``, ``sheets`` and ``defaults``, where the defaults are used for every job
+not setting the respective key itself. Every job may have the following keys:
+
+- ``name``: a name for reporting, defaults to the position in the manifest
+- ``category``: the cmd name of the task category, e.g. ``sorting``
+- ``task``: the cmd name of the task, e.g. ``bubble``
+- ``input``: the input of the task, either as string or as list, as for ``-i``
+- ``seed``: the seed for all randomizers of the task
+- ``arguments``: further command-line arguments of the task, either as string or list
+- ``exercise``: the file where the exercise is saved to without file extension
+- ``solution``: the file where the solution is saved to without file extension
+- ``trace``: the file where the input, parameters and steps are saved to as JSON Lines without
+  file extension
+- ``pdf``: whether a pdf should be generated as well
+- ``language``: the language of the texts, defaults to the language of the command-line
+
+A sheet writes many tasks into one exercise and one solution document and may have the keys
+``name``, ``exercise``, ``solution``, ``pdf``, ``language`` and ``tasks``, where ``tasks`` is a
+list of jobs without ``exercise``, ``solution``, ``trace`` and ``pdf``.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import dataclasses
+import logging
+import os
+import pathlib
+import shlex
+
+import yaml
+
+from pyalgotask import __settings as settings
+from pyalgotask import language as lang
+from pyalgotask.compile import (
+    CompileCache,
+    CompileScheduler,
+    FormatCache,
+    init_cache_argument_parser,
+    parse_cache,
+    parse_formats,
+)
+from pyalgotask.export import Exporter
+from pyalgotask.moodle import QuestionBank, question_xml
+from pyalgotask.output import tikz
+from pyalgotask.randomizer.randomizer_base import Randomizer
+from pyalgotask.tasks import task_base
+
+# let every task register itself
+from pyalgotask import tasks  # pylint: disable=unused-import
+
+_logger = logging.getLogger(__name__)
+
+_JOB_KEYS = {
+    "name",
+    "category",
+    "task",
+    "input",
+    "seed",
+    "arguments",
+    "exercise",
+    "solution",
+    "trace",
+    "pdf",
+    "language",
+}
+
+_OUTPUT_KEYS = {"exercise", "solution", "trace", "pdf"}
+
+_SHEET_KEYS = {"name", "tasks", "language", "exercise", "solution", "pdf"}
+
+
+@dataclasses.dataclass
+class Job:  # pylint: disable=too-many-instance-attributes
+    """Dataclass to bundle everything needed to generate one task of a manifest
+
+    :ivar name: the name of the job used for reporting
+    :ivar category: the cmd name of the category
+    :ivar task: the cmd name of the task
+    :ivar input: the input of the task in command-line syntax, if any
+    :ivar seed: the seed for the randomizers of the task, if any
+    :ivar arguments: further command-line arguments for the task
+    :ivar exercise: the file location of the exercise without file extension, if any
+    :ivar solution: the file location of the solution without file extension, if any
+    :ivar trace: the file location of the JSON Lines trace without file extension, if any
+    :ivar pdf: whether a pdf should be generated
+    :ivar language: the language of the texts, if not the current language"""
+
+    name: str
+    category: str
+    task: str
+    input: str = None
+    seed: int = None
+    arguments: list = dataclasses.field(default_factory=list)
+    exercise: str = None
+    solution: str = None
+    trace: str = None
+    pdf: bool = False
+    language: str = None
+
+    def to_arguments(self, output: bool = True) -> list:
+        """Translates the job into the command-line arguments of its task
+
+        :param output: whether the arguments of the exporter are included
+        :return: a list of command-line arguments"""
+        arguments = list(self.arguments)
+        if self.input is not None:
+            arguments += ["-i", self.input]
+        if output:
+            arguments += ["-e", self.exercise or "", "-s", self.solution or ""]
+            if self.trace:
+                arguments += ["-t", self.trace]
+            if self.pdf:
+                arguments.append("--pdf")
+        return arguments
+
+
+@dataclasses.dataclass
+class Sheet:
+    """Dataclass to bundle many jobs written into one exercise sheet and one solution sheet
+
+    :ivar name: the name of the sheet used for reporting
+    :ivar jobs: the jobs of the tasks on the sheet
+    :ivar exercise: the file location of the exercise sheet without file extension, if any
+    :ivar solution: the file location of the solution sheet without file extension, if any
+    :ivar pdf: whether a pdf should be generated
+    :ivar language: the language of the texts, if not the current language"""
+
+    name: str
+    jobs: list
+    exercise: str = None
+    solution: str = None
+    pdf: bool = False
+    language: str = None
+
+
+@dataclasses.dataclass
+class JobResult:
+    """Dataclass to bundle the outcome of a job
+
+    :ivar name: the name of the job
+    :ivar error: the error message if the job failed, otherwise None
+    :ivar question: the Moodle XML question of the job until it is written, if requested
+    """
+
+    name: str
+    error: str = None
+    question: str = None
+
+    @property
+    def success(self) -> bool:
+        """Whether the job succeeded
+
+        :return: True if no error occured"""
+        return self.error is None
+
+
+class _JobArgumentParser(argparse.ArgumentParser):
+    """Argument parser raising errors instead of exiting the program"""
+
+    def error(self, message):
+        """Raises the error message as ``ValueError``
+
+        :param message: the error message of argparse"""
+        raise ValueError(message)
+
+
+def _join_input(value) -> str:
+    """Casts the input of a manifest entry to the command-line syntax
+
+    :param value: a string or a list of input elements
+    :return: a comma separated string of the input"""
+    if isinstance(value, (list, tuple)):
+        return ",".join(str(element) for element in value)
+    return str(value)
+
+
+def _split_arguments(value) -> list:
+    """Casts the additional arguments of a manifest entry to a list
+
+    :param value: a string or a list of command-line arguments
+    :return: a list of command-line arguments"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return shlex.split(value)
+    return [str(argument) for argument in value]
+
+
+def job_from_entry(entry: dict, defaults: dict = None, index: int = 0) -> Job:
+    """Creates a job from an entry of a manifest
+
+    :param entry: the mapping describing the job
+    :param defaults: the mapping of default values for every job
+    :param index: the position of the job in the manifest
+    :return: the job described by the entry
+    :raise ValueError: if the entry is malformed"""
+    if not isinstance(entry, dict):
+        raise ValueError(f"Job {index} is not a mapping but {entry}")
+    values = dict(defaults or {})
+    values.update(entry)
+    unknown_keys = set(values) - _JOB_KEYS
+    if unknown_keys:
+        raise ValueError(f"Job {index} has unknown keys {sorted(unknown_keys)}")
+    for key in ("category", "task"):
+        if not values.get(key):
+            raise ValueError(f"Job {index} has no {key}")
+    return Job(
+        name=str(values.get("name", index)),
+        category=values["category"],
+        task=values["task"],
+        input=_join_input(values["input"]) if "input" in values else None,
+        seed=values.get("seed"),
+        arguments=_split_arguments(values.get("arguments")),
+        exercise=values.get("exercise"),
+        solution=values.get("solution"),
+        trace=values.get("trace"),
+        pdf=bool(values.get("pdf", False)),
+        language=values.get("language"),
+    )
+
+
+def sheet_from_entry(entry: dict, defaults: dict = None, index: int = 0) -> Sheet:
+    """Creates a sheet from an entry of a manifest
+
+    :param entry: the mapping describing the sheet
+    :param defaults: the mapping of default values for every job
+    :param index: the position of the sheet in the manifest
+    :return: the sheet described by the entry
+    :raise ValueError: if the entry is malformed"""
+    if not isinstance(entry, dict):
+        raise ValueError(f"Sheet {index} is not a mapping but {entry}")
+    unknown_keys = set(entry) - _SHEET_KEYS
+    if unknown_keys:
+        raise ValueError(f"Sheet {index} has unknown keys {sorted(unknown_keys)}")
+    name = str(entry.get("name", f"sheet {index}"))
+    if not isinstance(entry.get("tasks"), list) or not entry["tasks"]:
+        raise ValueError(f"Sheet {name} has no list of tasks")
+
+    task_defaults = {
+        key: value
+        for key, value in (defaults or {}).items()
+        if key not in _OUTPUT_KEYS and key != "name"
+    }
+    jobs = []
+    for task_index, task_entry in enumerate(entry["tasks"]):
+        if isinstance(task_entry, dict) and set(task_entry) & _OUTPUT_KEYS:
+            raise ValueError(
+                f"Task {task_index} of sheet {name} must not set any of {sorted(_OUTPUT_KEYS)}"
+            )
+        jobs.append(job_from_entry(task_entry, task_defaults, f"{name}.{task_index}"))
+    return Sheet(
+        name=name,
+        jobs=jobs,
+        exercise=entry.get("exercise"),
+        solution=entry.get("solution"),
+        pdf=bool(entry.get("pdf", False)),
+        language=entry.get("language", (defaults or {}).get("language")),
+    )
+
+
+def read_manifest(path) -> list:
+    """Reads a manifest file in YAML or JSON syntax
+
+    :param path: the location of the manifest
+    :return: a list of jobs followed by a list of sheets
+    :raise ValueError: if the manifest is malformed"""
+    with open(path, "r", encoding="UTF-8") as file:
+        try:
+            data = yaml.safe_load(file)
+        except yaml.YAMLError as exception:
+            raise ValueError(
+                f"Manifest {path} is malformed: {exception}"
+            ) from exception
+
+    defaults, sheets = {}, []
+    if isinstance(data, dict):
+        defaults = data.get("defaults") or {}
+        sheets = data.get("sheets") or []
+        data = data.get("jobs") or ([] if sheets else None)
+    if not isinstance(data, list) or not isinstance(sheets, list):
+        raise ValueError(f"Manifest {path} contains no list of jobs or sheets")
+    return [
+        job_from_entry(entry, defaults, index) for index, entry in enumerate(data)
+    ] + [sheet_from_entry(entry, defaults, index) for index, entry in enumerate(sheets)]
+
+
+def _seed_randomizers(task, seed):
+    """Seeds every randomizer of a task, including those created for parameters
+
+    :param task: the task whose randomizers are seeded
+    :param seed: the seed to use"""
+    randomizers = [task.task_io.randomizer] + [
+        value for value in vars(task).values() if isinstance(value, Randomizer)
+    ]
+    for randomizer in randomizers:
+        randomizer.random.seed(seed)
+
+
+def prepare_job(job: Job, exporter: Exporter = None):
+    """Creates a fresh task for the job and parses the arguments of the job into it
+
+    :param job: the job to prepare
+    :param exporter: the exporter that parses the output arguments of the job, if any
+    :return: the parsed task"""
+    task = task_base.create_task(job.category, job.task)
+    parser = _JobArgumentParser(prog=f"{job.category} {job.task}")
+    if exporter:
+        exporter.init_parser(parser)
+    task.init_argument_parser(parser)
+    args = parser.parse_args(job.to_arguments(output=exporter is not None))
+    if job.seed is not None:
+        _seed_randomizers(task, job.seed)
+    if exporter:
+        exporter.parse(args)
+    task.parse(args)
+    return task
+
+
+def run_job(job: Job, exporter: Exporter, question: bool = False) -> JobResult:
+    """Generates the exercise and solution of one job, catching every error of the job
+
+    :param job: the job to run
+    :param exporter: the exporter writing the files of the job
+    :param question: whether the Moodle XML question of the job is created
+    :return: the result of the job"""
+    _logger.debug("Running job %s: %s %s", job.name, job.category, job.task)
+    try:
+        with lang.use_language(job.language):
+            task = prepare_job(job, exporter)
+            exporter.write_exercise(task)
+            exporter.write_solution(task)
+            exporter.write_trace(task, category=job.category, seed=job.seed)
+            xml = question_xml(task, job.name) if question else None
+    except Exception as exception:  # pylint: disable=broad-exception-caught
+        return JobResult(job.name, f"{type(exception).__name__}: {exception}")
+    return JobResult(job.name, question=xml)
+
+
+def run_sheet(sheet: Sheet, exporter: Exporter) -> JobResult:
+    """Generates the exercise and solution sheet of many tasks, catching every error
+
+    :param sheet: the sheet to run
+    :param exporter: the exporter writing the files of the sheet
+    :return: the result of the sheet"""
+    _logger.debug("Running sheet %s with %d tasks", sheet.name, len(sheet.jobs))
+    try:
+        with lang.use_language(sheet.language):
+            sheet_tasks = []
+            for job in sheet.jobs:
+                try:
+                    with lang.use_language(job.language):
+                        sheet_tasks.append(prepare_job(job))
+                except Exception as exception:
+                    raise ValueError(f"Task {job.name}: {exception}") from exception
+            exporter.exercise_tex_file = sheet.exercise
+            exporter.solution_tex_file = sheet.solution
+            exporter.trace_file = None
+            exporter.pdf = sheet.pdf
+            exporter.view = False
+            exporter.html = False
+            exporter.preview = False
+            # sheets have no output arguments, thus none of a previous job may be kept
+            exporter.renderer = tikz.DEFAULT_RENDERER
+            exporter.stream = False
+            exporter.compile_cache = None
+            exporter.compile_formats = None
+            exporter.write_exercise_sheet(sheet_tasks)
+            exporter.write_solution_sheet(sheet_tasks)
+    except Exception as exception:  # pylint: disable=broad-exception-caught
+        return JobResult(sheet.name, f"{type(exception).__name__}: {exception}")
+    return JobResult(sheet.name)
+
+
+def run_unit(unit, exporter: Exporter, question: bool = False) -> JobResult:
+    """Runs a job or a sheet
+
+    :param unit: the job or sheet to run
+    :param exporter: the exporter writing the files
+    :param question: whether the Moodle XML question of a job is created, sheets have none
+    :return: the result of the job or sheet"""
+    if isinstance(unit, Sheet):
+        return run_sheet(unit, exporter)
+    return run_job(unit, exporter, question)
+
+
+def _write_question(bank: QuestionBank, result: JobResult) -> JobResult:
+    """Writes the question of a job into the question bank and releases it afterwards
+
+    :param bank: the question bank, if any
+    :param result: the result of the job
+    :return: the result without question"""
+    if bank is not None and result.question is not None:
+        bank.write(result.question)
+    result.question = None
+    return result
+
+
+def _add_compile_errors(jobs, results, compile_results):
+    """Marks every job as failed whose exercise or solution could not be compiled
+
+    :param jobs: the jobs that were run
+    :param results: the results of the jobs, which are updated
+    :param compile_results: the results of the compilations of the jobs"""
+    errors = {
+        compile_result.tex_file: compile_result
+        for compile_result in compile_results
+        if not compile_result.success
+    }
+    for job, result in zip(jobs, results):
+        messages = []
+        for file in filter(None, (job.exercise, job.solution)):
+            failed = errors.get(str(pathlib.Path(file + ".tex").absolute()))
+            if failed:
+                messages.append(
+                    f"Compiling {failed.tex_file} failed:\n{failed.log_excerpt}"
+                )
+        if result.success and messages:
+            result.error = "\n".join(messages)
+
+
+_worker_state = {}
+"""State shared by all jobs of one worker process"""
+
+
+def _init_worker(cache_dir, cache_size, format_dir=None, language=None, question=False):
+    """Initializes a worker process once. The task registry is filled by importing this
+    module, thus only the exporter of the worker is left to create. Every worker compiles
+    one pdf at a time, such that the number of workers bounds the number of compilations.
+
+    :param cache_dir: the directory of the compile cache, if any
+    :param cache_size: the maximal size of the compile cache in bytes
+    :param format_dir: the directory of the precompiled formats, if any
+    :param language: the language of jobs without own language, if any
+    :param question: whether the Moodle XML questions of the jobs are created"""
+    if language:
+        settings.LANGUAGE = language
+    _worker_state["question"] = question
+    cache = CompileCache(cache_dir, cache_size) if cache_dir else None
+    formats = FormatCache(format_dir) if format_dir else None
+    _worker_state["exporter"] = Exporter(
+        CompileScheduler(max_workers=1, cache=cache, formats=formats)
+    )
+
+
+def _run_worker_job(job) -> JobResult:
+    """Runs a job or sheet inside a worker process with the exporter of the worker
+
+    :param job: the job or sheet to run
+    :return: the result of the job"""
+    exporter = _worker_state["exporter"]
+    result = run_unit(job, exporter, _worker_state["question"])
+    _add_compile_errors([job], [result], exporter.finish())
+    return result
+
+
+def run_batch(
+    jobs,
+    num_workers: int = 1,
+    compile_workers: int = None,
+    cache: CompileCache = None,
+    formats: FormatCache = None,
+    *,
+    bank: QuestionBank = None,
+) -> list:
+    """Runs every job with one shared exporter per process. Failing jobs do not abort the batch.
+    Since every job uses a fresh task and its own seed, the generated files do not depend on
+    the number of workers.
+
+    :param jobs: the jobs and sheets to run
+    :param num_workers: the number of worker processes, 1 runs every job in this process
+    :param compile_workers: the number of parallel compilations when running in this process,
+        defaults to every core
+    :param cache: the compile cache shared by every job, if any
+    :param formats: the precompiled formats shared by every job, if any
+    :param bank: the question bank the Moodle XML question of every job is written to in the
+        order of the jobs as soon as it is generated, if any
+    :return: a list of results in the order of the jobs"""
+    jobs = list(jobs)
+    num_workers = min(num_workers, len(jobs))
+    if num_workers <= 1:
+        exporter = Exporter(
+            CompileScheduler(max_workers=compile_workers, cache=cache, formats=formats)
+        )
+        results = [
+            _write_question(bank, run_unit(job, exporter, bank is not None))
+            for job in jobs
+        ]
+        _add_compile_errors(jobs, results, exporter.finish())
+        exporter.compile_scheduler.close()
+        return results
+
+    _logger.debug("Running %d jobs on %d workers", len(jobs), num_workers)
+    with ProcessPoolExecutor(
+        max_workers=num_workers,
+        initializer=_init_worker,
+        initargs=(
+            cache.directory if cache else None,
+            cache.max_size if cache else None,
+            formats.directory if formats else None,
+            lang.current_language(),
+            bank is not None,
+        ),
+    ) as executor:
+        chunksize = max(1, len(jobs) // (4 * num_workers))
+        return [
+            _write_question(bank, result)
+            for result in executor.map(_run_worker_job, jobs, chunksize=chunksize)
+        ]
+
+
+def worker_count(value: str) -> int:
+    """Cast method for the number of workers, where 0 stands for every core
+
+    :param value: the number of workers as string
+    :return: a positive number of workers"""
+    num_workers = int(value)
+    if num_workers < 0:
+        raise ValueError(f"Number of jobs needs to be non-negative, but is {value}")
+    if num_workers == 0:
+        return os.cpu_count() or 1
+    return num_workers
+
+
+def init_argument_parser(parser):
+    """Initializes the arguments for the batch mode
+
+    :param parser: the argparse parser"""
+    parser.add_argument(
+        "manifest",
+        type=pathlib.Path,
+        help="The YAML or JSON manifest file listing the jobs to generate.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=worker_count,
+        dest="num_workers",
+        default=1,
+        metavar="N",
+        help="The number of worker processes generating jobs in parallel, 0 uses every core.",
+    )
+    parser.add_argument(
+        "--compile-jobs",
+        type=worker_count,
+        dest="compile_workers",
+        default=0,
+        metavar="N",
+        help=(
+            "The number of parallel latexmk processes if jobs are generated in one process, "
+            "0 uses every core. Otherwise every worker process compiles one pdf at a time."
+        ),
+    )
+    parser.add_argument(
+        "--moodle",
+        type=str,
+        dest="moodle",
+        metavar="FILE",
+        help=(
+            "The file without file extension where every job is additionally saved to as "
+            "cloze question of one Moodle XML question bank. Sheets are not included."
+        ),
+    )
+    init_cache_argument_parser(parser)
+
+
+def main(args) -> int:
+    """Runs the batch mode on the parsed arguments and reports failed jobs
+
+    :param args: the result of argparse
+    :return: the exit code, i.e. 0 if every job succeeded and 1 otherwise"""
+    jobs = read_manifest(args.manifest)
+    bank = (
+        QuestionBank(args.moodle + ".xml", f"pyAlgoTask/{args.manifest.stem}")
+        if args.moodle
+        else None
+    )
+    try:
+        results = run_batch(
+            jobs,
+            args.num_workers,
+            args.compile_workers,
+            parse_cache(args),
+            parse_formats(args),
+            bank=bank,
+        )
+    finally:
+        if bank is not None:
+            bank.close()
+
+    failed = [result for result in results if not result.success]
+    for result in failed:
+        _logger.error("Job %s failed: %s", result.name, result.error)
+    _logger.info("%d of %d jobs succeeded", len(results) - len(failed), len(results))
+    return 1 if failed else 0
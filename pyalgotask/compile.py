@@ -0,0 +1,444 @@
+"""Module to compile LaTeX files to pdf files with latexmk in a bounded pool of subprocesses"""
+from concurrent.futures import ThreadPoolExecutor
+import dataclasses
+import hashlib
+import logging
+import os
+import pathlib
+import shutil
+import subprocess
+import tempfile
+import threading
+
+_logger = logging.getLogger(__name__)
+
+_EXCERPT_LINES = 20
+"""Maximal number of lines of a log excerpt"""
+
+
+@dataclasses.dataclass
+class CompileResult:
+    """Dataclass to bundle the outcome of compiling one LaTeX file
+
+    :ivar tex_file: the compiled LaTeX file
+    :ivar pdf_file: the generated pdf file
+    :ivar success: whether the pdf file was generated
+    :ivar log_excerpt: the relevant part of the LaTeX log if compilation failed
+    :ivar cached: whether the pdf file was taken from the compile cache"""
+
+    tex_file: str
+    pdf_file: str
+    success: bool
+    log_excerpt: str = ""
+    cached: bool = False
+
+
+def log_excerpt(log: str) -> str:
+    """Extracts the error messages from a LaTeX log, or its end if no error message is found
+
+    :param log: the content of the log
+    :return: an excerpt of at most ``_EXCERPT_LINES`` lines"""
+    lines = log.splitlines()
+    excerpt = []
+    for index, line in enumerate(lines):
+        if line.startswith("!"):
+            excerpt += lines[index : index + 3]
+    if not excerpt:
+        excerpt = lines[-_EXCERPT_LINES:]
+    return "\n".join(excerpt[:_EXCERPT_LINES])
+
+
+class CompileCache:
+    """Class for a content-addressed cache of compiled pdf files. The key of a pdf file is the
+    hash of its LaTeX source, including the preamble, and of the compiler settings.
+    If the cache exceeds its size, the least recently used pdf files are removed.
+
+    :ivar directory: the directory containing the cached pdf files
+    :ivar max_size: the maximal size of the cache in bytes"""
+
+    def __init__(self, directory, max_size: int = 512 * 2**20):
+        """Constructor creating the cache directory if necessary
+
+        :param directory: the directory containing the cached pdf files
+        :param max_size: the maximal size of the cache in bytes"""
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(tex_source: bytes, settings: str) -> str:
+        """Computes the key of a LaTeX source compiled with some settings
+
+        :param tex_source: the content of the LaTeX file
+        :param settings: a description of the compiler settings
+        :return: the hexadecimal hash of source and settings"""
+        digest = hashlib.sha256(settings.encode())
+        digest.update(b"\0")
+        digest.update(tex_source)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> pathlib.Path:
+        """The location of a cached pdf file
+
+        :param key: the key of the pdf file
+        :return: the path of the pdf file in the cache"""
+        return self.directory / f"{key}.pdf"
+
+    def fetch(self, key: str, pdf_file) -> bool:
+        """Hardlinks, or copies if impossible, a cached pdf file to the given location
+
+        :param key: the key of the pdf file
+        :param pdf_file: the location the pdf file is requested at
+        :return: whether the pdf file was found in the cache"""
+        cached = self._path(key)
+        try:
+            os.utime(cached)
+        except FileNotFoundError:
+            return False
+
+        pdf_file = pathlib.Path(pdf_file)
+        temporary = pdf_file.with_name(f".{pdf_file.name}.{threading.get_ident()}")
+        try:
+            os.link(cached, temporary)
+        except OSError:
+            try:
+                shutil.copyfile(cached, temporary)
+            except FileNotFoundError:
+                return False
+        os.replace(temporary, pdf_file)
+        _logger.debug("Took %s from the compile cache", pdf_file)
+        return True
+
+    def store(self, key: str, pdf_file):
+        """Copies a compiled pdf file into the cache and evicts old entries if necessary
+
+        :param key: the key of the pdf file
+        :param pdf_file: the location of the compiled pdf file"""
+        cached = self._path(key)
+        temporary = cached.with_name(f".{cached.name}.{threading.get_ident()}")
+        shutil.copyfile(pdf_file, temporary)
+        os.replace(temporary, cached)
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used pdf files until the cache fits its size"""
+        with self._lock:
+            entries = []
+            for cached in self.directory.glob("*.pdf"):
+                try:
+                    stat = cached.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, cached))
+            size = sum(entry[1] for entry in entries)
+            for _, entry_size, cached in sorted(entries):
+                if size <= self.max_size:
+                    break
+                cached.unlink(missing_ok=True)
+                size -= entry_size
+
+
+class FormatCache:
+    """Class for precompiled LaTeX formats, which contain the dumped preamble of a document.
+    Documents sharing a preamble are compiled against the same format, such that packages like
+    TikZ are not loaded again for every document. The formats are built with mylatexformat and
+    their name is the hash of the preamble and of the format settings.
+
+    :ivar directory: the directory containing the format files
+    :ivar builder: the TeX engine dumping the formats
+    :ivar builder_args: the arguments for the TeX engine before the output arguments
+    :ivar base_format: the format the dumped preamble is loaded on top of"""
+
+    def __init__(
+        self, directory, builder="pdftex", builder_args=None, base_format="pdflatex"
+    ):
+        """Constructor creating the format directory if necessary
+
+        :param directory: the directory containing the format files
+        :param builder: the TeX engine dumping the formats
+        :param builder_args: the arguments for the TeX engine
+        :param base_format: the format the dumped preamble is loaded on top of"""
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.builder = builder
+        self.builder_args = (
+            ["-ini", "-interaction=nonstopmode"]
+            if builder_args is None
+            else list(builder_args)
+        )
+        self.base_format = base_format
+        self._lock = threading.Lock()
+        self._name_locks = {}
+        self._failed = set()
+
+    def settings(self) -> str:
+        """A description of the format settings as used for the compile cache
+
+        :return: the builder and base format"""
+        return " ".join(
+            [self.builder]
+            + self.builder_args
+            + [f"&{self.base_format}", "mylatexformat"]
+        )
+
+    def name(self, tex_source: bytes) -> str:
+        """Computes the name of the format for a LaTeX source
+
+        :param tex_source: the content of the LaTeX file
+        :return: the name of the format of its preamble"""
+        preamble = tex_source.split(rb"\begin{document}", 1)[0]
+        return "pyalgotask-" + CompileCache.key(preamble, self.settings())[:32]
+
+    def get(self, tex_path) -> str:
+        """Returns the name of the format for a LaTeX file, which is built if necessary
+
+        :param tex_path: the LaTeX file whose preamble is dumped
+        :return: the name of the format or None if it cannot be built"""
+        tex_path = pathlib.Path(tex_path)
+        name = self.name(tex_path.read_bytes())
+        with self._lock:
+            name_lock = self._name_locks.setdefault(name, threading.Lock())
+        with name_lock:
+            if name in self._failed:
+                return None
+            if not (self.directory / f"{name}.fmt").exists() and not self._build(
+                name, tex_path
+            ):
+                self._failed.add(name)
+                return None
+        return name
+
+    def _build(self, name: str, tex_path: pathlib.Path) -> bool:
+        """Dumps the preamble of a LaTeX file into a format
+
+        :param name: the name of the format
+        :param tex_path: the LaTeX file whose preamble is dumped
+        :return: whether the format was built"""
+        build_dir = tempfile.mkdtemp(prefix=f".{name}-", dir=self.directory)
+        try:
+            command = [self.builder] + self.builder_args
+            command += [
+                f"-jobname={name}",
+                f"-output-directory={build_dir}",
+                f"&{self.base_format}",
+                "mylatexformat.ltx",
+                tex_path.name,
+            ]
+            _logger.debug("Building format %s from %s", name, tex_path)
+            try:
+                process = subprocess.run(
+                    command,
+                    cwd=tex_path.parent,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    check=False,
+                )
+            except OSError as exception:
+                _logger.warning("Could not build format %s: %s", name, exception)
+                return False
+            built_format = pathlib.Path(build_dir, f"{name}.fmt")
+            if process.returncode != 0 or not built_format.exists():
+                _logger.warning(
+                    "Could not build format %s:\n%s",
+                    name,
+                    log_excerpt(process.stdout.decode(errors="replace")),
+                )
+                return False
+            os.replace(built_format, self.directory / f"{name}.fmt")
+            return True
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+
+def init_cache_argument_parser(parser):
+    """Initializes the arguments for the compile cache
+
+    :param parser: the argparse parser"""
+    parser.add_argument(
+        "--cache-dir",
+        type=pathlib.Path,
+        dest="cache_dir",
+        help=(
+            "The directory of the compile cache. If set, pdf files of unchanged LaTeX "
+            "sources are taken from the cache instead of being compiled again."
+        ),
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        dest="cache_size",
+        default=512,
+        metavar="MB",
+        help="The maximal size of the compile cache in megabytes.",
+    )
+    parser.add_argument(
+        "--precompile",
+        action="store_true",
+        dest="precompile",
+        help=(
+            "If set, the preamble is dumped once into a precompiled format, against which "
+            "every document with the same preamble is compiled. The formats are kept in "
+            "the compile cache directory or in the temporary directory."
+        ),
+    )
+
+
+def parse_cache(args):
+    """Creates the compile cache after argparse parsed its arguments
+
+    :param args: the result of argparse
+    :return: the compile cache or None if no cache directory is given"""
+    if not args.cache_dir:
+        return None
+    return CompileCache(args.cache_dir, args.cache_size * 2**20)
+
+
+def parse_formats(args):
+    """Creates the cache of precompiled formats after argparse parsed its arguments
+
+    :param args: the result of argparse
+    :return: the format cache or None if no precompiled formats are requested"""
+    if not args.precompile:
+        return None
+    if args.cache_dir:
+        return FormatCache(pathlib.Path(args.cache_dir, "formats"))
+    return FormatCache(pathlib.Path(tempfile.gettempdir(), "pyalgotask-formats"))
+
+
+class CompileScheduler:
+    """Class to compile LaTeX files with latexmk in a bounded pool of subprocesses.
+    Every file is compiled in its own build directory, such that auxiliary files never collide,
+    and the pdf is moved next to the LaTeX file afterwards.
+
+    :ivar max_workers: the maximal number of latexmk processes running at the same time
+    :ivar compiler: the compiler command
+    :ivar compiler_args: the arguments for the compiler before the LaTeX file
+    :ivar cache: the compile cache, if any
+    :ivar formats: the precompiled formats to compile against, if any"""
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        *,
+        compiler="latexmk",
+        compiler_args=None,
+        cache: CompileCache = None,
+        formats: FormatCache = None,
+    ):
+        """Constructor setting the pool size and the compiler
+
+        :param max_workers: the maximal number of parallel compilations, defaults to all cores
+        :param compiler: the compiler command
+        :param compiler_args: the arguments for the compiler
+        :param cache: the compile cache, if any
+        :param formats: the precompiled formats to compile against, if any"""
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.compiler = compiler
+        self.compiler_args = (
+            ["--pdf", "--interaction=nonstopmode"]
+            if compiler_args is None
+            else list(compiler_args)
+        )
+        self.cache = cache
+        self.formats = formats
+        self._executor = None
+        self._futures = []
+
+    def submit(self, tex_file):
+        """Queues a LaTeX file for compilation, which starts as soon as a worker is free
+
+        :param tex_file: the LaTeX file to compile
+        :return: a future of the ``CompileResult``"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="latexmk"
+            )
+        future = self._executor.submit(self.compile, str(tex_file))
+        self._futures.append(future)
+        return future
+
+    def wait(self) -> list:
+        """Waits for every queued compilation
+
+        :return: a list of ``CompileResult`` in the order of submission"""
+        futures, self._futures = self._futures, []
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Waits for every queued compilation and stops the workers"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def settings(self) -> str:
+        """A description of the compiler settings as used for the compile cache
+
+        :return: the compiler command with its arguments"""
+        settings = " ".join([self.compiler] + self.compiler_args)
+        if self.formats is not None:
+            settings += " " + self.formats.settings()
+        return settings
+
+    def compile(self, tex_file: str) -> CompileResult:
+        """Compiles one LaTeX file, or takes its pdf file from the compile cache
+
+        :param tex_file: the LaTeX file to compile
+        :return: the result of the compilation"""
+        tex_path = pathlib.Path(tex_file).absolute()
+        pdf_path = tex_path.with_suffix(".pdf")
+        if self.cache is None:
+            return self._run_compiler(tex_path, pdf_path)
+
+        key = self.cache.key(tex_path.read_bytes(), self.settings())
+        if self.cache.fetch(key, pdf_path):
+            return CompileResult(str(tex_path), str(pdf_path), True, cached=True)
+        result = self._run_compiler(tex_path, pdf_path)
+        if result.success:
+            self.cache.store(key, pdf_path)
+        return result
+
+    def _run_compiler(self, tex_path, pdf_path) -> CompileResult:
+        """Compiles one LaTeX file in its own build directory
+
+        :param tex_path: the absolute path of the LaTeX file to compile
+        :param pdf_path: the absolute path of the pdf file to generate
+        :return: the result of the compilation"""
+        build_dir = tempfile.mkdtemp(prefix=f".{tex_path.stem}-", dir=tex_path.parent)
+        try:
+            command = [self.compiler] + self.compiler_args
+            env = None
+            format_name = self.formats.get(tex_path) if self.formats else None
+            if format_name:
+                command.append(f"-pdflatex=pdflatex -fmt={format_name} %O %S")
+                env = dict(os.environ)
+                env["TEXFORMATS"] = f"{self.formats.directory}{os.pathsep}"
+            command += [f"-outdir={build_dir}", tex_path.name]
+            _logger.debug("Compiling %s", tex_path)
+            try:
+                process = subprocess.run(
+                    command,
+                    cwd=tex_path.parent,
+                    env=env,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    check=False,
+                )
+            except OSError as exception:
+                return CompileResult(
+                    str(tex_path), str(pdf_path), False, str(exception)
+                )
+
+            built_pdf = pathlib.Path(build_dir, pdf_path.name)
+            if process.returncode == 0 and built_pdf.exists():
+                os.replace(built_pdf, pdf_path)
+                return CompileResult(str(tex_path), str(pdf_path), True)
+
+            log_file = pathlib.Path(build_dir, tex_path.stem + ".log")
+            if log_file.exists():
+                log = log_file.read_text(encoding="UTF-8", errors="replace")
+            else:
+                log = process.stdout.decode(errors="replace")
+            return CompileResult(str(tex_path), str(pdf_path), False, log_excerpt(log))
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
@@ -1,27 +1,60 @@
 """Module to export pylatex classes into a file, compile it and view it in the internal viewer"""
+import json
 import logging
-import webbrowser
+import pathlib
 
 import pylatex as latex
 
+from pyalgotask import language as lang
+from pyalgotask.output import tikz
+from pyalgotask.trace import is_highlighted
+from pyalgotask.compile import (
+    CompileScheduler,
+    init_cache_argument_parser,
+    parse_cache,
+    parse_formats,
+)
+
 _logger = logging.getLogger(__name__)
 
 
-class Exporter:
+class Exporter:  # pylint: disable=too-many-instance-attributes
     """Class for exporting pylatex classes to exercise and solution files
 
     :ivar exercise_tex_file: The file location of the exercise tex file
     :ivar solution_tex_file: The file location of the solution tex file
+    :ivar trace_file: The file location of the JSON Lines trace
     :ivar pdf: Whether a pdf should be generated
     :ivar view: Whether an pdf should be generated and viewed afterwards
+    :ivar compile_scheduler: The scheduler compiling the pdf files
+    :ivar compile_cache: The cache of compiled pdf files, if any
+    :ivar compile_formats: The precompiled formats to compile against, if any
+    :ivar renderer: The name of the backend rendering the LaTeX code of the outputs
+    :ivar stream: Whether solutions are rendered only while they are written, without
+        keeping the steps of the algorithm
+    :ivar html: Whether an HTML preview is written next to every LaTeX file
+    :ivar preview: Whether an HTML preview is written and viewed afterwards
     """
 
-    def __init__(self):
-        """Initializes every member variable with None and False respectively"""
+    def __init__(self, compile_scheduler: CompileScheduler = None):
+        """Initializes every member variable with None and False respectively
+
+        :param compile_scheduler: The scheduler compiling the pdf files, if None a default
+            scheduler is created as soon as a pdf is requested"""
         self.exercise_tex_file = None
         self.solution_tex_file = None
+        self.trace_file = None
         self.pdf = False
         self.view = False
+        self.compile_scheduler = compile_scheduler
+        self.compile_cache = None
+        self.compile_formats = None
+        self.renderer = tikz.DEFAULT_RENDERER
+        self.stream = False
+        self.html = False
+        self.preview = False
+        self._view_files = []
+        self._preview_files = []
 
     def init_parser(self, parser):
         """
@@ -45,6 +78,17 @@ class Exporter:
             default="solution",
             help="The file where the solution description will be saved to without file extension.",
         )
+        parser.add_argument(
+            "-t",
+            "--trace",
+            type=str,
+            dest="trace_file",
+            default=None,
+            help=(
+                "The file where the input, the parameters and every step of the algorithm "
+                "will be saved to as JSON Lines without file extension."
+            ),
+        )
         parser.add_argument(
             "--pdf",
             action="store_true",
@@ -57,6 +101,43 @@ class Exporter:
             dest="view",
             help="If set, a pdf will be generated and viewed afterwards.",
         )
+        parser.add_argument(
+            "--renderer",
+            choices=list(tikz.RENDERERS),
+            dest="renderer",
+            default=tikz.DEFAULT_RENDERER,
+            help=(
+                "The backend rendering the LaTeX code of arrays. pylatex and string produce the "
+                "same code, but string avoids creating pylatex objects for every entry. macro "
+                "writes one macro call per array, which is much smaller. table writes every "
+                "array as one node containing a tabular."
+            ),
+        )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            dest="stream",
+            help=(
+                "If set, the solution is written while the algorithm runs, such that only one "
+                "step is kept in memory. Requires the string, macro or table renderer."
+            ),
+        )
+        parser.add_argument(
+            "--html",
+            action="store_true",
+            dest="html",
+            help=(
+                "If set, a standalone HTML preview with SVG pictures is written next to every "
+                "LaTeX file, which requires no LaTeX installation."
+            ),
+        )
+        parser.add_argument(
+            "--preview",
+            action="store_true",
+            dest="preview",
+            help="If set, an HTML preview will be written and viewed afterwards.",
+        )
+        init_cache_argument_parser(parser)
 
     def parse(self, input_arguments):
         """
@@ -66,14 +147,27 @@ class Exporter:
         """
         self.exercise_tex_file = input_arguments.exercise_tex
         self.solution_tex_file = input_arguments.solution_tex
+        self.trace_file = input_arguments.trace_file
         self.pdf = input_arguments.pdf
         self.view = input_arguments.view
+        self.renderer = input_arguments.renderer
+        self.stream = input_arguments.stream
+        self.html = input_arguments.html
+        self.preview = input_arguments.preview
+        # raises a ValueError if the renderer cannot stream
+        tikz.create_renderer(self.renderer, self.stream)
+        self.compile_cache = parse_cache(input_arguments)
+        self.compile_formats = parse_formats(input_arguments)
         logging.debug(
             "Parsed pathes to export to: %s %s",
             self.exercise_tex_file,
             self.solution_tex_file,
         )
-        if not self.exercise_tex_file and not self.solution_tex_file:
+        if (
+            not self.exercise_tex_file
+            and not self.solution_tex_file
+            and not self.trace_file
+        ):
             _logger.error("No output specified! Did you forget to specify -e or -s?")
 
     def write_exercise(self, task) -> str:
@@ -85,15 +179,10 @@ class Exporter:
         :return: A string consisting of the LaTeX code for the task
         """
         if self.exercise_tex_file:
-            doc = latex.Document()
-            doc.preamble.append(task.task_io.output.get_exercise_preamble())
-            doc.append(task.task_io.output.generate_exercise())
-            if not self.pdf and not self.view:
-                doc.generate_tex(self.exercise_tex_file)
-            else:
-                doc.generate_pdf(self.exercise_tex_file)
-            if self.view:
-                webbrowser.open_new(self.exercise_tex_file + ".pdf")
+            task.task_io.output.keep_steps(not self.stream)
+            task.task_io.output.use_renderer(self.renderer)
+            self.write_document(exercise_document(task), self.exercise_tex_file)
+            self.write_preview([task], self.exercise_tex_file)
 
     def write_solution(self, task) -> str:
         """
@@ -104,12 +193,223 @@ class Exporter:
         :return: A string consisting of the LaTeX code for the task
         """
         if self.solution_tex_file:
-            doc = latex.Document()
-            doc.preamble.append(task.task_io.output.get_solution_preamble())
-            doc.append(task.task_io.output.generate_solution())
-            if not self.pdf and not self.view:
-                doc.generate_tex(self.solution_tex_file)
-            else:
-                doc.generate_pdf(self.solution_tex_file)
-            if self.view:
-                webbrowser.open_new(self.solution_tex_file + ".pdf")
+            task.task_io.output.keep_steps(not self.stream)
+            task.task_io.output.use_renderer(self.renderer, self.stream)
+            self.write_document(solution_document(task), self.solution_tex_file)
+            self.write_preview([task], self.solution_tex_file, solution=True)
+
+    def write_trace(self, task, *, category=None, seed=None):
+        """
+        Method to write the trace of a task as JSON Lines, straight from its algorithm and
+        without generating any LaTeX code
+
+        :param task: the task for which to write the trace
+        :param category: the cmd name of the category of the task, if known
+        :param seed: the seed of the randomizers of the task, if any
+        """
+        if self.trace_file:
+            with open(self.trace_file + ".jsonl", "w", encoding="UTF-8") as file:
+                for record in trace_records(task, category=category, seed=seed):
+                    file.write(json.dumps(record, default=str) + "\n")
+
+    def write_exercise_sheet(self, tasks):
+        """
+        Method to write the exercises of many tasks into one sheet, such that only one
+        document has to be compiled. Every task gets its own numbered section.
+
+        :param tasks: The tasks for which to create the exercise sheet
+        """
+        if self.exercise_tex_file:
+            outputs = [task.task_io.output for task in tasks]
+            for output in outputs:
+                output.keep_steps(not self.stream)
+                output.use_renderer(self.renderer)
+            doc = sheet_document(
+                [output.get_exercise_preamble() for output in outputs],
+                [output.generate_exercise() for output in outputs],
+            )
+            self.write_document(doc, self.exercise_tex_file)
+            self.write_preview(tasks, self.exercise_tex_file)
+
+    def write_solution_sheet(self, tasks):
+        """
+        Method to write the solutions of many tasks into one sheet matching the exercise sheet.
+
+        :param tasks: The tasks for which to create the solution sheet
+        """
+        if self.solution_tex_file:
+            outputs = [task.task_io.output for task in tasks]
+            for output in outputs:
+                output.keep_steps(not self.stream)
+                output.use_renderer(self.renderer, self.stream)
+            doc = sheet_document(
+                [output.get_solution_preamble() for output in outputs],
+                [output.generate_solution() for output in outputs],
+            )
+            self.write_document(doc, self.solution_tex_file)
+            self.write_preview(tasks, self.solution_tex_file, solution=True)
+
+    def write_document(self, doc, file):
+        """
+        Method to write a LaTeX document and to queue its compilation if a pdf is requested.
+        The compilation runs in the background until ``finish`` is called.
+
+        :param doc: the pylatex document to write
+        :param file: the file location without file extension
+        """
+        tikz.write_document(doc, file)
+        if not self.pdf and not self.view:
+            return
+        if self.compile_scheduler is None:
+            self.compile_scheduler = CompileScheduler()
+        if self.compile_scheduler.cache is None:
+            self.compile_scheduler.cache = self.compile_cache
+        if self.compile_scheduler.formats is None:
+            self.compile_scheduler.formats = self.compile_formats
+        self.compile_scheduler.submit(file + ".tex")
+        if self.view:
+            self._view_files.append(str(pathlib.Path(file + ".pdf").absolute()))
+
+    def write_preview(self, tasks, file, solution=False):
+        """
+        Method to write the HTML preview of tasks if it is requested
+
+        :param tasks: the tasks to preview in one document
+        :param file: the file location without file extension
+        :param solution: whether the solutions are previewed instead of the exercises
+        """
+        if not self.html and not self.preview:
+            return
+        # pylint: disable-next=import-outside-toplevel
+        from pyalgotask.output import preview
+
+        render = preview.solution_body if solution else preview.exercise_body
+        document = preview.html_document(
+            pathlib.Path(file).name,
+            [render(task.task_io.output) for task in tasks],
+        )
+        html_file = preview.write_html(document, file)
+        if self.preview:
+            self._preview_files.append(str(pathlib.Path(html_file).absolute()))
+
+    def finish(self) -> list:
+        """
+        Method to wait for every queued compilation and to view the requested pdf files
+        afterwards. HTML previews are viewed right away.
+
+        :return: A list of ``CompileResult`` of every compilation since the last call
+        """
+        if self._preview_files:
+            import webbrowser  # pylint: disable=import-outside-toplevel
+
+            for html_file in self._preview_files:
+                webbrowser.open_new(html_file)
+            self._preview_files = []
+        if self.compile_scheduler is None:
+            return []
+        results = self.compile_scheduler.wait()
+        viewed_files = [
+            result.pdf_file
+            for result in results
+            if result.success and result.pdf_file in self._view_files
+        ]
+        if viewed_files:
+            import webbrowser  # pylint: disable=import-outside-toplevel
+
+            for pdf_file in viewed_files:
+                webbrowser.open_new(pdf_file)
+        self._view_files = []
+        return results
+
+
+def exercise_document(task) -> latex.Document:
+    """
+    Creates the exercise document of a parsed task
+
+    :param task: The task for which to create the exercise document
+    :return: A pylatex document containing the exercise
+    """
+    doc = latex.Document()
+    doc.preamble.append(task.task_io.output.get_exercise_preamble())
+    doc.append(task.task_io.output.generate_exercise())
+    return doc
+
+
+def solution_document(task) -> latex.Document:
+    """
+    Creates the solution document of a parsed task
+
+    :param task: The task for which to create the solution document
+    :return: A pylatex document containing the solution
+    """
+    doc = latex.Document()
+    doc.preamble.append(task.task_io.output.get_solution_preamble())
+    doc.append(task.task_io.output.generate_solution())
+    return doc
+
+
+def trace_records(task, *, category=None, seed=None):
+    """
+    Creates the records of the trace of a parsed task. The first record describes the task,
+    every further record one step of the algorithm with the indices of its highlighted entries.
+    The steps are shared with the exercise and the solution of the task.
+
+    :param task: the task for which to create the records
+    :param category: the cmd name of the category of the task, if known
+    :param seed: the seed of the randomizers of the task, if any
+    :yield: dictionaries that can be dumped as JSON, where values without JSON type, e.g. the
+        empty entries of hash tables, are dumped as their string
+    """
+    yield {
+        "record": "task",
+        "category": category,
+        "task": task.cmd_info.cmd,
+        "seed": seed,
+        "randomized": task.task_io.randomized,
+        "input": task.input_data(),
+        "parameters": task.parameters(),
+    }
+    get_trace = getattr(task.task_io.output, "get_trace", None)
+    steps = get_trace() if get_trace else task.algorithm()
+    for number, (array, highlights) in enumerate(steps):
+        yield {
+            "record": "step",
+            "step": number,
+            "array": list(array),
+            "highlights": (
+                [
+                    index
+                    for index in range(len(array))
+                    if is_highlighted(highlights, index)
+                ]
+                if highlights
+                else None
+            ),
+        }
+
+
+def sheet_document(preambles, contents) -> latex.Document:
+    """
+    Creates a document containing many tasks, where every preamble is only added once.
+
+    :param preambles: The preambles of the tasks, which may be None
+    :param contents: The contents of the tasks
+    :return: A pylatex document with one numbered section per task
+    """
+    doc = latex.Document()
+    added_preambles = set()
+    for preamble in preambles:
+        if preamble is None:
+            continue
+        code = preamble.dumps()
+        if code not in added_preambles:
+            added_preambles.add(code)
+            doc.preamble.append(preamble)
+
+    for number, content in enumerate(contents, start=1):
+        section = latex.Section(
+            lang.get_text("sheet", "task-title").format(number), numbering=False
+        )
+        section.append(content)
+        doc.append(section)
+    return doc
@@ -1,7 +1,17 @@
-"""Module to get localisated data, especially text data"""
+"""Module to get localisated data, especially text data.
+
+Every language file is parsed only when a text of its language is requested for the first time.
+The parsed catalogue is kept in memory and pickled next to the language file, such that later
+runs do not parse the YAML file again until it changes. The language is selected per call with
+``use_language`` and defaults to the language of the settings."""
+import contextlib
+import contextvars
+import dataclasses
 from pathlib import Path
 import logging
-import yaml
+import os
+import pickle
+import threading
 
 from pyalgotask import __settings as settings
 
@@ -9,16 +19,154 @@ _logger = logging.getLogger(__name__)
 
 
 _project_folder = Path(__file__).parent
-_language_file = Path(_project_folder, "languages", settings.LANGUAGE).with_suffix(
-    ".yaml"
-)
+_language_folder = Path(_project_folder, "languages")
+_cache_folder = Path(_language_folder, "__pycache__")
+
+_PICKLE_VERSION = 1
+"""Version of the pickled catalogues, to be increased whenever ``Catalogue`` changes"""
+
+
+@dataclasses.dataclass
+class Catalogue:
+    """Dataclass to bundle the parsed data of one language file
+
+    :ivar language_name: the english name of the language
+    :ivar language_original_name: the name of the language in the language itself
+    :ivar missing_language_message: the text used if a localization is missing
+    :ivar texts: the texts by their path in the language file"""
+
+    language_name: str
+    language_original_name: str
+    missing_language_message: str
+    texts: dict
+
+
+_catalogues = {}
+"""Dictionary of every catalogue loaded in this process"""
+_catalogues_lock = threading.Lock()
+
+_current_language = contextvars.ContextVar("language", default=None)
+"""The language selected by ``use_language``, if any"""
+
+
+def _flatten(texts: dict, prefix: tuple = ()) -> dict:
+    """Flattens the nested texts of a language file into a dictionary of paths
+
+    :param texts: the nested texts
+    :param prefix: the path of the texts
+    :return: a dictionary mapping every path to its text"""
+    flat = {}
+    for key, value in texts.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, prefix + (key,)))
+        elif isinstance(value, str):
+            flat[prefix + (key,)] = value
+    return flat
+
+
+def _parse_language_file(language_file: Path) -> Catalogue:
+    """Parses a language file
+
+    :param language_file: the location of the YAML language file
+    :return: the catalogue of the language file"""
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with language_file.open("r", encoding="UTF-8") as file:
+        data = yaml.load(file, Loader=loader)
+    return Catalogue(
+        data["language"],
+        data["language-origin"],
+        data["missing-local"],
+        _flatten(data["texts"]),
+    )
+
+
+def _load_catalogue(language: str) -> Catalogue:
+    """Loads the catalogue of a language from its pickle if it is up to date,
+    otherwise parses the language file and pickles it
+
+    :param language: the name of the language, e.g. enUK
+    :return: the catalogue of the language
+    :raise ValueError: if there is no such language"""
+    language_file = Path(_language_folder, language).with_suffix(".yaml")
+    try:
+        stat = language_file.stat()
+    except OSError as exception:
+        raise ValueError(
+            f"Unknown language {language}. Available: {', '.join(available_languages())}"
+        ) from exception
+    stamp = (_PICKLE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+    pickle_file = Path(_cache_folder, language).with_suffix(".pickle")
+    try:
+        with pickle_file.open("rb") as file:
+            pickled_stamp, catalogue = pickle.load(file)
+        if pickled_stamp == stamp:
+            return catalogue
+    except (OSError, pickle.PickleError, EOFError, ValueError, TypeError):
+        pass
+
+    _logger.debug("Parsing language file %s", language_file)
+    catalogue = _parse_language_file(language_file)
+    try:
+        _cache_folder.mkdir(exist_ok=True)
+        temporary = pickle_file.with_name(f".{pickle_file.name}.{os.getpid()}")
+        with temporary.open("wb") as file:
+            pickle.dump((stamp, catalogue), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, pickle_file)
+    except OSError as exception:
+        _logger.debug("Could not cache language file %s: %s", language_file, exception)
+    return catalogue
+
+
+def available_languages() -> list:
+    """Method to list every language with a language file
+
+    :return: a sorted list of the names of the languages"""
+    return sorted(file.stem for file in _language_folder.glob("*.yaml"))
+
+
+def get_catalogue(language: str = None) -> Catalogue:
+    """Method to get the catalogue of a language, which is loaded once per process
 
-with _language_file.open("r", encoding="UTF-8") as file:
-    _data = yaml.load(file, Loader=yaml.CLoader)
-    _language_name = _data["language"]
-    _language_original_name = _data["language-origin"]
-    _missing_language_message = _data["missing-local"]
-    _texts = _data["texts"]
+    :param language: the name of the language, defaults to the current language
+    :return: the catalogue of the language
+    :raise ValueError: if there is no such language"""
+    language = language or current_language()
+    catalogue = _catalogues.get(language)
+    if catalogue is None:
+        with _catalogues_lock:
+            catalogue = _catalogues.get(language)
+            if catalogue is None:
+                catalogue = _load_catalogue(language)
+                _catalogues[language] = catalogue
+    return catalogue
+
+
+def current_language() -> str:
+    """Method to get the language selected for the current call
+
+    :return: the language given to ``use_language`` or the language of the settings"""
+    return _current_language.get() or settings.LANGUAGE
+
+
+@contextlib.contextmanager
+def use_language(language: str = None):
+    """Context manager selecting the language of every text requested inside of it.
+    The selection is local to the current thread or asyncio task.
+
+    :param language: the name of the language, None keeps the current language
+    :raise ValueError: if there is no such language"""
+    if language is None:
+        yield
+        return
+    get_catalogue(language)
+    token = _current_language.set(language)
+    try:
+        yield
+    finally:
+        _current_language.reset(token)
 
 
 def get_text(*args):
@@ -29,15 +177,9 @@ def get_text(*args):
     :param args: the path of the textfile in the languages files found in the folder languages
     :return: A string of the localized version of the references text.
     """
-    current = _texts
-    try:
-        for arg in args:
-            current = current[arg]
-    except KeyError as _:
+    catalogue = get_catalogue()
+    text = catalogue.texts.get(args)
+    if text is None:
         _logger.error("Missing Localization for name %s found!", args)
-        return _missing_language_message
-    if isinstance(current, str):
-        return current
-
-    _logger.error("Missing Localization for name %s found!", args)
-    return _missing_language_message
+        return catalogue.missing_language_message
+    return text
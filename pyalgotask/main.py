@@ -1,26 +1,148 @@
 """Main module for pyAlgoTask handling calling other classes and the general work flow."""
 import argparse
+import functools
+import importlib
 import sys
 import logging
 
 import pyalgotask.__meta as meta
 import pyalgotask.__settings as settings
+from pyalgotask import language as lang
 from pyalgotask.tasks import task_base
 
 from pyalgotask.export import Exporter  # pylint: disable=wrong-import-position
 
-# let every task register itself
+# let every category register its tasks without importing them
 from pyalgotask import tasks  # pylint: disable=unused-import
 
-
 logging.basicConfig(level=settings.LOGGING_LEVEL)
 
 logger = logging.getLogger(__name__)
 
 
-def main():
-    """Main method of the algorithm and is called when executing the program on the folder."""
+_MODES = {
+    "batch": (
+        "pyalgotask.batch",
+        "Generates many tasks listed in a manifest file",
+        "Generates the exercises and solutions of all jobs listed in a YAML or "
+        "JSON manifest file in one process. Failing jobs are reported at the end.",
+    ),
+    "serve": (
+        "pyalgotask.server",
+        "Runs a server generating tasks on request",
+        "Runs a server reading one JSON request per line and answering with the "
+        "LaTeX code or the compiled pdf files of the requested task.",
+    ),
+}
+"""The modules, help texts and descriptions of the modes not generating a single task given on
+the command-line. Every module offers the methods ``init_argument_parser`` and ``main``."""
+
+
+class _LazyArgumentParser(argparse.ArgumentParser):
+    """Parser which adds its arguments only once it parses or prints help.
+    Thus only the modules of the requested task or mode are imported.
+
+    :ivar init_arguments: the function adding the arguments to this parser, if not done yet
+    """
+
+    def __init__(self, *args, init_arguments=None, **kwargs):
+        """Constructor remembering how to add the arguments of this parser
+
+        :param init_arguments: the function adding the arguments to this parser"""
+        super().__init__(*args, **kwargs)
+        self.init_arguments = init_arguments
+
+    def _add_arguments(self):
+        """Adds the arguments of this parser if not done yet"""
+        if self.init_arguments is not None:
+            init_arguments, self.init_arguments = self.init_arguments, None
+            init_arguments(self)
+
+    def parse_known_args(self, args=None, namespace=None):
+        self._add_arguments()
+        return super().parse_known_args(args, namespace)
+
+    def format_usage(self):
+        self._add_arguments()
+        return super().format_usage()
+
+    def format_help(self):
+        self._add_arguments()
+        return super().format_help()
+
+
+def _init_task_arguments(exporter, category: str, cmd: str, parser):
+    """Adds the arguments of the exporter and of a task, importing the module of the task.
+
+    :param exporter: the exporter initializing its arguments for the task
+    :param category: the cmd name of the category of the task
+    :param cmd: the cmd name of the task
+    :param parser: the parser of the task"""
+    exporter.init_parser(parser)
+    task_base.get_task_by_cmd(category, cmd).init_argument_parser(parser)
+
 
+def _init_mode_arguments(module: str, parser):
+    """Adds the arguments of a mode, importing the module of the mode.
+
+    :param module: the name of the module of the mode
+    :param parser: the parser of the mode"""
+    importlib.import_module(module).init_argument_parser(parser)
+
+
+def _init_mode_parsers(subparser):
+    """Adds the parsers of the modes generating tasks without a single task given on the
+    command-line.
+
+    :param subparser: the subparsers of the main parser"""
+    for mode, (module, help_string, description) in _MODES.items():
+        subparser.add_parser(
+            mode,
+            help=help_string,
+            description=description,
+            init_arguments=functools.partial(_init_mode_arguments, module),
+        )
+
+
+def _init_language_argument(parser):
+    """Adds the argument selecting the language of the generated files.
+
+    :param parser: the main parser"""
+    parser.add_argument(
+        "-l",
+        "--language",
+        type=str,
+        dest="lang",
+        default=settings.LANGUAGE,
+        help=(
+            "Sets the language of the task. Currently available: "
+            + ", ".join(lang.available_languages())
+        ),
+    )
+
+
+def _pre_parse_arguments(argv):
+    """Resolves the requested language and category before the parser is created. The language
+    is required before the task parsers create their task, since tasks request their texts on
+    creation, and the category decides which task parsers are created.
+
+    :param argv: the command-line arguments without the program name
+    :return: a tuple of the name of the requested language and the requested category or None
+    """
+    pre_parser = argparse.ArgumentParser(add_help=False)
+    _init_language_argument(pre_parser)
+    pre_parser.add_argument("rest", nargs=argparse.REMAINDER)
+    known_args, _ = pre_parser.parse_known_args(argv)
+    return known_args.lang, (known_args.rest[0] if known_args.rest else None)
+
+
+def _create_parser(exporter, category: str = None):
+    """Creates the argument parser with the parsers of every category. The parsers of the tasks
+    are only created for the requested category and add their arguments only once they are used.
+
+    :param exporter: the exporter initializing its arguments for the requested task
+    :param category: the requested category, None creates the parsers of every task
+    :return: a tuple of the main parser and a dictionary of the category parsers"""
     # create argument parser
     logger.debug("Creating argument parser.")
     parser = argparse.ArgumentParser(
@@ -40,36 +162,61 @@ def main():
         version=f"%(prog)s {meta.__version__}",
     )
 
-    parser.add_argument(
-        "-l",
-        "--language",
-        type=str,
-        dest="lang",
-        default=settings.LANGUAGE,
-        help="Sets the language of the task. Currently available: enUK, deDE",
-    )
+    _init_language_argument(parser)
 
-    exporter = Exporter()
-    subparser = parser.add_subparsers(title="Task categories", dest="cat")
+    subparser = parser.add_subparsers(
+        title="Task categories", dest="cat", parser_class=_LazyArgumentParser
+    )
     subparser.metavar = ""
     cat_parsers = {}
 
     for cat in task_base.category_iterator():
-        (help_string, description) = task_base.get_category_info(cat)
+        help_string, description = task_base.get_category_info(cat)
         cat_parser = subparser.add_parser(
             cat, help=help_string, description=description
         )
         cat_parsers[cat] = cat_parser
         cat_subparser = cat_parser.add_subparsers(dest="cmd")
-        for this_task in task_base.task_iterator(cat):
-            task_parser = cat_subparser.add_parser(
-                this_task.cmd_info.cmd,
-                help=this_task.cmd_info.help,
-                description=this_task.cmd_info.description,
+        if category not in (None, cat):
+            continue
+        for cmd_info in task_base.task_iterator(cat):
+            cat_subparser.add_parser(
+                cmd_info.cmd,
+                help=cmd_info.help,
+                description=cmd_info.description,
+                init_arguments=functools.partial(
+                    _init_task_arguments, exporter, cat, cmd_info.cmd
+                ),
             )
-            exporter.init_parser(task_parser)
-            this_task.init_argument_parser(task_parser)
 
+    _init_mode_parsers(subparser)
+
+    return parser, cat_parsers
+
+
+def main():
+    """Main method of the algorithm and is called when executing the program on the folder."""
+
+    language, category = _pre_parse_arguments(sys.argv[1:])
+    exporter = Exporter()
+    parser, cat_parsers = _create_parser(exporter, category)
+
+    # sets the language of every text generated by this call
+    if language not in lang.available_languages():
+        parser.error(
+            f"Unknown language {language}. "
+            f"Available: {', '.join(lang.available_languages())}"
+        )
+    with lang.use_language(language):
+        _run(exporter, parser, cat_parsers)
+
+
+def _run(exporter, parser, cat_parsers):
+    """Parses the command-line arguments and generates the requested task or mode.
+
+    :param exporter: the exporter initializing its arguments for every task
+    :param parser: the main parser
+    :param cat_parsers: a dictionary of the category parsers"""
     # parse arguments
     logger.debug("Argument parser working.")
     try:
@@ -85,13 +232,17 @@ def main():
     if not args.cat:
         parser.error("No category given!")
 
+    if args.cat in _MODES:
+        try:
+            mode_module = importlib.import_module(_MODES[args.cat][0])
+            sys.exit(mode_module.main(args))
+        except (ValueError, OSError) as exception:
+            parser.error(str(exception))
+
     if not args.cmd:
         cat_parsers[args.cat].print_help()
         sys.exit()
 
-    # sets the language
-    settings.LANGUAGE = args.lang
-
     # get requested task
     this_task = task_base.get_task_by_cmd(args.cat, args.cmd)
     logger.debug("Selected task: %s %s", args.cat, args.cmd)
@@ -118,6 +269,16 @@ def main():
     except ValueError as exception:
         parser.error(str(exception))
 
+    # write trace to file
+    exporter.write_trace(this_task, category=args.cat)
+
+    # wait for the pdf files
+    failed = [result for result in exporter.finish() if not result.success]
+    for result in failed:
+        logger.error("Compiling %s failed:\n%s", result.tex_file, result.log_excerpt)
+    if failed:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,201 @@
+"""Module to write generated tasks as cloze questions into one Moodle XML question bank.
+
+Every question states the task with its input array or list of operations and asks for every
+array of the solution with one short answer field per entry, whose expected answer is the
+entry recorded in the trace of the algorithm. The whole solution, including its highlights, is
+shown as general feedback. Moodle does not accept SVG pictures in questions, thus arrays are
+drawn as HTML tables with inline styles.
+
+The questions are written into the file one after another, such that a bank of thousands of
+tasks is streamed and imported into Moodle in one step."""
+import html
+import re
+
+from pyalgotask import language as lang
+from pyalgotask.output.array import ArrayOutput, OperationsArrayOutput
+from pyalgotask.output import preview
+from pyalgotask.trace import is_highlighted
+
+EMPTY_ENTRY = "-"
+"""The answer expected for empty entries of an array, e.g. of a hash table"""
+
+_CELL_STYLE = "border: 2px solid black; padding: 4px 8px; text-align: center"
+_HIGHLIGHT_STYLE = _CELL_STYLE + "; background-color: #d9d9d9"
+_LABEL_STYLE = "padding: 4px 8px; text-align: center"
+_CLOZE_SPECIAL = re.compile(r'([}#~/"\\])')
+
+
+def cloze_answer(value) -> str:
+    """
+    Creates a short answer field of a cloze question
+
+    :param value: the expected value, where an empty value expects ``EMPTY_ENTRY``
+    :return: the cloze code of the field
+    """
+    text = str(value) or EMPTY_ENTRY
+    return "{1:SHORTANSWER:=" + _CLOZE_SPECIAL.sub(r"\\\1", text) + "}"
+
+
+def html_table(rows, cell) -> str:
+    """
+    Draws arrays below each other as HTML table with inline styles
+
+    :param rows: the ``pyalgotask.output.preview.Row`` of every array
+    :param cell: a function creating the HTML code of an entry from its value
+    :return: the HTML code of the table
+    """
+    rows = list(rows)
+    left_labels = any(row.left_label for row in rows)
+    lines = []
+    for row in rows:
+        if row.top_labels:
+            labels = "".join(
+                f'<th style="{_LABEL_STYLE}">{preview.latex_to_html(label)}</th>'
+                for label in row.top_labels
+            )
+            lines.append(f"<tr>{'<th></th>' if left_labels else ''}{labels}</tr>")
+        line = ""
+        if left_labels:
+            label = preview.latex_to_html(row.left_label) if row.left_label else ""
+            line += f'<th style="{_LABEL_STYLE}">{label}</th>'
+        for i, value in enumerate(row.values or [""]):
+            style = (
+                _HIGHLIGHT_STYLE if is_highlighted(row.highlights, i) else _CELL_STYLE
+            )
+            line += f'<td style="{style}">{cell(value)}</td>'
+        lines.append(f"<tr>{line}</tr>")
+    return (
+        '<table style="border-collapse: collapse; margin: 1em 0">'
+        + "".join(lines)
+        + "</table>"
+    )
+
+
+def answer_rows(output: ArrayOutput):
+    """
+    Creates the arrays asked for, i.e. every step of the algorithm padded to the length and
+    labeled as the array of the solution space in the exercise
+
+    :param output: the output of the task
+    :yield: a ``pyalgotask.output.preview.Row`` per step without highlights
+    """
+    exercise_rows = preview.exercise_rows(output)
+    for line_num, (array, _) in enumerate(output.get_trace()):
+        values = [str(value) for value in array]
+        if line_num < len(exercise_rows):
+            row = exercise_rows[line_num]
+            values += [""] * (len(row.values) - len(values))
+            yield preview.Row(values, None, row.left_label, row.top_labels)
+        else:
+            yield preview.Row(values, None, None, None)
+
+
+def question_text(output: ArrayOutput) -> str:
+    """
+    Creates the text of the question, i.e. the task with its input and the answer fields
+
+    :param output: the output of the task
+    :return: the HTML code of the question text
+    """
+    parts = [f"<p>{preview.latex_to_html(output.task_info.prefix)}</p>"]
+    if isinstance(output, OperationsArrayOutput):
+        parts.append(
+            "<ol>"
+            + "".join(
+                f"<li>{preview.latex_to_html(operation)}</li>"
+                for operation in output.operations
+            )
+            + "</ol>"
+        )
+    else:
+        task_row = preview.Row(
+            [str(value) for value in output.task_info.task_array], None, None, None
+        )
+        parts.append(html_table([task_row], html.escape))
+    parts.append(f"<p>{preview.latex_to_html(output.get_postfix())}</p>")
+    parts.append(f"<p>{html.escape(lang.get_text('moodle', 'empty-entry'))}</p>")
+    parts.append(html_table(answer_rows(output), cloze_answer))
+    return "\n".join(parts)
+
+
+def _cdata(text: str) -> str:
+    """
+    Wraps a text into a CDATA section
+
+    :param text: the text, which may contain the end of a CDATA section
+    :return: the XML code of the section
+    """
+    return "<![CDATA[" + text.replace("]]>", "]]]]><![CDATA[>") + "]]>"
+
+
+def question_xml(task, name: str) -> str:
+    """
+    Creates the cloze question of a parsed task
+
+    :param task: the task
+    :param name: the name of the question in the question bank
+    :raise ValueError: if the output of the task is not an array output
+    :return: the XML code of the question
+    """
+    output = task.task_io.output
+    if not isinstance(output, ArrayOutput):
+        raise ValueError(f"{type(output).__name__} cannot be exported to Moodle.")
+    solution = html_table(preview.solution_rows(output), html.escape)
+    return (
+        '<question type="cloze">\n'
+        f"<name><text>{html.escape(name)}</text></name>\n"
+        f'<questiontext format="html"><text>{_cdata(question_text(output))}'
+        "</text></questiontext>\n"
+        f'<generalfeedback format="html"><text>{_cdata(solution)}</text></generalfeedback>\n'
+        "<penalty>0.3333333</penalty>\n"
+        "<hidden>0</hidden>\n"
+        "</question>\n"
+    )
+
+
+class QuestionBank:
+    """Moodle XML file, into which questions are written one after another
+
+    :ivar path: the location of the file
+    :ivar count: the number of questions written so far"""
+
+    def __init__(self, path, category: str = "pyAlgoTask"):
+        """
+        Constructor opening the file and writing the category of the questions
+
+        :param path: the location of the file
+        :param category: the category of the questions below the default category of the
+            course
+        """
+        self.path = path
+        self.count = 0
+        self._file = open(  # pylint: disable=consider-using-with
+            path, "w", encoding="UTF-8"
+        )
+        self._file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n<quiz>\n'
+            '<question type="category">\n'
+            f"<category><text>$course$/{html.escape(category)}</text></category>\n"
+            "</question>\n"
+        )
+
+    def write(self, question: str):
+        """
+        Writes a question into the file
+
+        :param question: the XML code of the question, see ``question_xml``
+        """
+        self._file.write(question)
+        self.count += 1
+
+    def close(self):
+        """Finishes and closes the file"""
+        if not self._file.closed:
+            self._file.write("</quiz>\n")
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
@@ -1,9 +1,12 @@
 """Outputs arrays with various special options"""
 import dataclasses
+from typing import Callable
 import pylatex as latex
 from pyalgotask.output import pylatex_classes as clatex
+from pyalgotask.output import tikz as tikz_renderer
 
 from pyalgotask.output.output_base import Output
+from pyalgotask.trace import DeltaTrace, StreamedTrace, Trace, is_highlighted
 
 
 @dataclasses.dataclass
@@ -12,11 +15,14 @@ class TaskInfo:
 
     :ivar prefix: prefix of the task explanation
     :ivar task_array: the task_array of the task
-    :ivar postfix: postfix of the task explanation"""
+    :ivar postfix: postfix of the task explanation
+    :ivar trace_postfix: a function creating text appended to the postfix once the algorithm
+        has run, if the task explanation depends on its steps"""
 
     prefix: str
     task_array: list
     postfix: str
+    trace_postfix: Callable[[], str] = None
 
 
 @dataclasses.dataclass
@@ -40,16 +46,20 @@ class LatexOptions:
     exercise_phantom_length: int
 
 
-class ArrayOutput(Output):
+class ArrayOutput(Output):  # pylint: disable=too-many-public-methods
     """Class to create LaTeX exercise and solution code for static array lengths
 
     :ivar task_info: information concerning the task description
     :ivar latex_option: various options regarding the latex output
     :ivar algorithm: the algorithm to generate the exercise for
+    :ivar delta_algorithm: the algorithm as generator of deltas to the task array, if any
+    :ivar renderer: the backend rendering the TikZ pictures
+    :ivar keep_trace_steps: whether the trace of an algorithm yielding copies of its array
+        keeps them, see ``keep_steps``
 
     """
 
-    def __init__(self, task_array, prefix, postfix, algorithm):
+    def __init__(self, task_array, prefix, postfix, algorithm, *, delta_algorithm=None):
         """
         Constructor for arrays with fixed input
 
@@ -57,6 +67,8 @@ class ArrayOutput(Output):
         :param prefix: the prefix of the task explanation
         :param postfix: the postfix of the task explanation
         :param algorithm: the algorithm generator
+        :param delta_algorithm: the algorithm as generator of ``Step`` deltas to the task
+            array, which is recorded instead of ``algorithm`` if given
         """
         self.task_info = TaskInfo(prefix, task_array, postfix)
         phantom_length = (
@@ -72,6 +84,50 @@ class ArrayOutput(Output):
             exercise_phantom_length=None,
         )
         self.algorithm = algorithm
+        self.delta_algorithm = delta_algorithm
+        self.renderer = tikz_renderer.create_renderer()
+        self.keep_trace_steps = True
+        self._trace = None
+
+    def get_trace(self) -> Trace:
+        """
+        Getter for the trace of the algorithm, which is shared by the exercise and the solution
+
+        :return: the trace recording the steps of the algorithm once
+        """
+        if self._trace is None and self.delta_algorithm is not None:
+            self._trace = DeltaTrace(self.task_info.task_array, self.delta_algorithm)
+        elif self._trace is None and not self.keep_trace_steps:
+            self._trace = StreamedTrace(self.algorithm)
+        elif self._trace is None:
+            self._trace = Trace(self.algorithm)
+        return self._trace
+
+    def use_renderer(self, renderer: str, stream: bool = False) -> None:
+        self.renderer = tikz_renderer.create_renderer(renderer, stream)
+
+    def get_postfix(self) -> str:
+        """
+        Getter for the postfix of the task explanation. If a part of it depends on the steps
+        of the algorithm, the trace is recorded first, which runs the algorithm only once.
+
+        :return: the postfix
+        """
+        if self.task_info.trace_postfix is None:
+            return self.task_info.postfix
+        self.get_trace().record()
+        return self.task_info.postfix + self.task_info.trace_postfix()
+
+    def keep_steps(self, keep: bool) -> None:
+        """
+        Selects whether the trace keeps the arrays yielded by the algorithm. Otherwise only
+        their lengths are kept and the algorithm runs again for every further iteration. Delta
+        algorithms always keep their deltas, which are small. Takes effect only before the
+        trace is created.
+
+        :param keep: whether the arrays are kept
+        """
+        self.keep_trace_steps = keep
 
     def init_argument_parser(self, parser) -> None:
         """No parsers needed herer."""
@@ -98,13 +154,29 @@ class ArrayOutput(Output):
             self.latex_options.phantom_length
             < self.latex_options.exercise_phantom_length
         ):
-            self.latex_options.phantom_length = self.latex_options.exercise_phantom_length
+            self.latex_options.phantom_length = (
+                self.latex_options.exercise_phantom_length
+            )
 
     def get_exercise_preamble(self):
-        return self.latex_options.preamble
+        return self.get_preamble()
 
     def get_solution_preamble(self):
-        return self.latex_options.preamble
+        return self.get_preamble()
+
+    def get_preamble(self):
+        """
+        Getter for the preamble of exercise and solution, including the definitions
+        required by the renderer
+
+        :return: A LaTeX object containing the preamble
+        """
+        renderer_preamble = self.renderer.preamble()
+        if renderer_preamble is None:
+            return self.latex_options.preamble
+        return clatex.EmptyContainer(
+            data=[self.latex_options.preamble, renderer_preamble]
+        )
 
     def generate_exercise(self):
         """Generates a ``LatexObject`` consisting of the exercise without preamble"""
@@ -138,7 +210,7 @@ class ArrayOutput(Output):
         container.append(latex.LargeText(tikz))
         container.append(clatex.Line(options="2ex"))
 
-        container.append(latex.NoEscape(self.task_info.postfix))
+        container.append(latex.NoEscape(self.get_postfix()))
 
         container.append(clatex.Line(options="4ex"))
 
@@ -207,22 +279,36 @@ class ArrayOutput(Output):
         """Fille an LaTeX Container with the actual solution
 
         :param container: The container that is filled"""
+        tikz = self.create_tikz_array()
+        container.append(
+            self.renderer.finish_picture(tikz, self.generate_solution_rows(tikz))
+        )
+
+    def generate_solution_rows(self, tikz):
+        """Fills the tikz environment with the task array and one array per step of the
+        algorithm, such that the steps are only computed while the rows are rendered
+
+        :param tikz: the tikz environment to fill
+        :yield: after every array appended to the tikz environment"""
         last_start_index = 0
         new_start_index = 0
         line_num = 0
 
-        tikz = self.create_tikz_array()
         self.task_array_to_tikz(tikz=tikz)
 
         new_start_index += len(self.task_info.task_array)
 
-        for array, highlights in self.algorithm():
+        for array, highlights in self.get_trace():
             self.filled_tikz_array(
                 tikz=tikz,
                 array=array,
                 tikz_start_index=new_start_index,
                 highlights=highlights,
-                node_option_first="below=of n" + str(last_start_index),
+                node_option_first=(
+                    "below=of n" + str(last_start_index)
+                    if not self.latex_options.exercise_top_labels
+                    else "below=4ex of n" + str(last_start_index)
+                ),
             )
 
             if self.latex_options.exercise_left_labels:
@@ -240,8 +326,7 @@ class ArrayOutput(Output):
             last_start_index = new_start_index
             new_start_index += max(len(array), 1)
             line_num += 1
-
-        container.append(tikz)
+            yield
 
     def task_array_to_tikz(
         self, tikz, *, new_start_index=0, highlights=None, node_options_first=""
@@ -251,7 +336,7 @@ class ArrayOutput(Output):
 
         :param tikz: the tikz environment to fill
         :param new_start_index: the first index the array should start with
-        :param highlights: the array where each entry signifies the node should be highlighted
+        :param highlights: the highlighted entries, see ``pyalgotask.trace.is_highlighted``
         :param node_options_first: Special additional options for the first node
         """
 
@@ -270,13 +355,10 @@ class ArrayOutput(Output):
 
         :return: tikz environment with array styles
         """
-        options = latex.NoEscape(
-            (
-                "node/.style={rectangle,draw=black,thick,inner sep=5pt}, "
-                "highlight/.style={fill=gray!30}, node distance=0.25 and 0"
-            )
+        return self.renderer.create_picture(
+            "node/.style={rectangle,draw=black,thick,inner sep=5pt}, "
+            "highlight/.style={fill=gray!30}, node distance=0.25 and 0"
         )
-        return latex.TikZ(options=options)
 
     def zero_length_tikz_array(self, tikz, *, tikz_start_index=0, first_options=""):
         """
@@ -286,14 +368,11 @@ class ArrayOutput(Output):
         :param tikz_start_index: the index where the first node should start
         :param first_options: special options for the first node
         """
-        tikz.append(
-            latex.TikZNode(
-                handle="n" + str(tikz_start_index),
-                options=first_options,
-                text=clatex.StringEmptyContainer(
-                    clatex.PhantomLength(self.latex_options.phantom_length)
-                ),
-            )
+        self.renderer.phantom_node(
+            tikz,
+            "n" + str(tikz_start_index),
+            list(first_options),
+            self.latex_options.phantom_length,
         )
 
     def empty_tikz_array(
@@ -309,39 +388,23 @@ class ArrayOutput(Output):
         :param node_option_first: special style options for the first node
         """
 
-        first_options = filter(None, ["node", node_option, node_option_first])
+        first_options = list(filter(None, ["node", node_option, node_option_first]))
 
         if length < 1:
             self.zero_length_tikz_array(
                 tikz, tikz_start_index=tikz_start_index, first_options=first_options
             )
+            return
 
-        tikz.append(
-            latex.TikZNode(
-                handle="n" + str(tikz_start_index),
-                options=first_options,
-                text=clatex.StringEmptyContainer(
-                    clatex.PhantomLength(self.latex_options.phantom_length)
-                ),
-            )
+        self.renderer.empty_row(
+            tikz,
+            tikz_start_index,
+            length,
+            self.latex_options.phantom_length,
+            node_option=node_option,
+            node_option_first=node_option_first,
         )
 
-        for i in range(1, length):
-            options = filter(
-                None,
-                ["node", "right=of n" + str(tikz_start_index + i - 1), node_option],
-            )
-
-            tikz.append(
-                latex.TikZNode(
-                    handle="n" + str(tikz_start_index + i),
-                    options=options,
-                    text=clatex.StringEmptyContainer(
-                        clatex.PhantomLength(self.latex_options.phantom_length)
-                    ),
-                )
-            )
-
     def filled_tikz_array(
         self,
         tikz,
@@ -358,21 +421,23 @@ class ArrayOutput(Output):
 
         :param tikz: the tikz environment to fill
         :param array: the array to fill the tikz environment
-        :param highlights: a list where each entry signifies whether highlights should be used
+        :param highlights: the highlighted entries, see ``pyalgotask.trace.is_highlighted``
         :param node_option: style options for the node
         :param highlight_option: which style options should be used for highlights
         :param tikz_start_index: the start index for the first node
         :param node_option_first: special style options for the first node
         """
 
-        first_options = filter(
-            None,
-            [
-                "node",
-                node_option,
-                node_option_first,
-                highlight_option if highlights and highlights[0] else "",
-            ],
+        first_options = list(
+            filter(
+                None,
+                [
+                    "node",
+                    node_option,
+                    node_option_first,
+                    highlight_option if is_highlighted(highlights, 0) else "",
+                ],
+            )
         )
 
         if len(array) < 1:
@@ -381,48 +446,16 @@ class ArrayOutput(Output):
             )
             return
 
-        max_str_length = max(len(str(i)) for i in array)
-
-        diff = max_str_length - len(str(array[0]))
-
-        container = clatex.StringEmptyContainer()
-        container.append(clatex.VPhantomLength())
-        container.append(clatex.PhantomLength(diff))
-        container.append(latex.NoEscape(str(array[0])))
-
-        tikz.append(
-            latex.TikZNode(
-                handle="n" + str(tikz_start_index),
-                options=first_options,
-                text=container,
-            )
+        self.renderer.filled_row(
+            tikz,
+            tikz_start_index,
+            [str(value) for value in array],
+            highlights,
+            node_option=node_option,
+            highlight_option=highlight_option,
+            node_option_first=node_option_first,
         )
 
-        for i in range(1, len(array)):
-            diff = max_str_length - len(str(array[i]))
-            options = filter(
-                None,
-                [
-                    "node",
-                    "right=of n" + str(tikz_start_index + i - 1),
-                    node_option,
-                    highlight_option if highlights and highlights[i] else "",
-                ],
-            )
-
-            container = clatex.StringEmptyContainer()
-            container.append(clatex.VPhantomLength())
-            container.append(clatex.PhantomLength(diff))
-            container.append(latex.NoEscape(str(array[i])))
-
-            tikz.append(
-                latex.TikZNode(
-                    handle="n" + str(tikz_start_index + i),
-                    options=options,
-                    text=container,
-                )
-            )
-
     def tikz_array_left_label(self, tikz, start_index, label):
         """
         Creates labels left of the array with start_index
@@ -431,12 +464,11 @@ class ArrayOutput(Output):
         :param start_index: the start_index of the array where the label should be created for
         :param label: the label
         """
-        tikz.append(
-            latex.TikZNode(
-                handle="left_label" + str(start_index),
-                options="left=of n" + str(start_index),
-                text=label,
-            )
+        self.renderer.label_node(
+            tikz,
+            "left_label" + str(start_index),
+            ["left=of n" + str(start_index)],
+            label,
         )
 
     def tikz_array_top_labels(self, tikz, start_index, labels):
@@ -445,18 +477,10 @@ class ArrayOutput(Output):
 
         :param tikz: the tikz environment
         :param start_index: the start_index of the array where the labels should be created for
-        :param labels: the labels
-        """
-        i = start_index
-        for label in labels:
-            tikz.append(
-                latex.TikZNode(
-                    handle="top_label" + str(i),
-                    options="above=of n" + str(i),
-                    text=label,
-                )
-            )
-            i += 1
+        :param labels: the labels, where arrays without labels have None
+        """
+        if labels:
+            self.renderer.top_labels(tikz, start_index, labels)
 
 
 class AlgorithmArrayOutput(ArrayOutput):
@@ -475,7 +499,7 @@ class AlgorithmArrayOutput(ArrayOutput):
                 solution space in the exercise file
     """
 
-    def __init__(self, task_array, prefix, postfix, algorithm):
+    def __init__(self, task_array, prefix, postfix, algorithm, *, delta_algorithm=None):
         """
         Constructor for arrays with fixed input
 
@@ -483,8 +507,12 @@ class AlgorithmArrayOutput(ArrayOutput):
         :param prefix: the prefix of the task explanation
         :param postfix: the postfix of the task explanation
         :param algorithm: the algorithm generator
+        :param delta_algorithm: the algorithm as generator of ``Step`` deltas to the task
+            array, which is recorded instead of ``algorithm`` if given
         """
-        super().__init__(task_array, prefix, postfix, algorithm)
+        super().__init__(
+            task_array, prefix, postfix, algorithm, delta_algorithm=delta_algorithm
+        )
         self.exercise_num_of_additional_arrays = 0
 
     init_exercise_output = None
@@ -505,16 +533,16 @@ class AlgorithmArrayOutput(ArrayOutput):
         :param container: The container that is filled"""
         tikz = self.create_tikz_array()
 
-        output = list(self.algorithm())
-        if len(output) == 0:
+        trace = self.get_trace()
+        if len(trace) == 0:
             return
 
-        max_array_length = max(len(array) for (array, _) in output)
+        max_array_length = trace.max_length
 
         last_start_index = 0
         new_start_index = 0
-        for array, _ in output:
-            array_length = max(len(array), 1)
+        for length in trace.lengths:
+            array_length = max(length, 1)
             if new_start_index == 0:
                 self.empty_tikz_array(tikz=tikz, length=array_length)
                 new_start_index += array_length
@@ -585,22 +613,22 @@ class OperationsArrayOutput(ArrayOutput):
 
         container.append(latex_list)
 
-        container.append(latex.NoEscape(self.task_info.postfix))
+        container.append(latex.NoEscape(self.get_postfix()))
 
         container.append(clatex.Line(options="4ex"))
 
-    def generate_solution_space(self, container):
-        """Fille an LaTeX Container with the actual solution.
+    def generate_solution_rows(self, tikz):
+        """Fills the tikz environment with one array per step of the algorithm,
+        such that the steps are only computed while the rows are rendered.
         It does not repeat the task_array here.
 
-        :param container: The container that is filled"""
+        :param tikz: the tikz environment to fill
+        :yield: after every array appended to the tikz environment"""
         last_start_index = 0
         new_start_index = 0
         line_num = 0
 
-        tikz = self.create_tikz_array()
-
-        for array, highlights in self.algorithm():
+        for array, highlights in self.get_trace():
             node_option_first = (
                 "" if new_start_index == 0 else "below=of n" + str(last_start_index)
             )
@@ -626,5 +654,4 @@ class OperationsArrayOutput(ArrayOutput):
             last_start_index = new_start_index
             new_start_index += max(len(array), 1)
             line_num += 1
-
-        container.append(tikz)
+            yield
@@ -23,17 +23,36 @@ class Output(ABC):
         :param args: The output of the argparser parser
         """
 
+    def use_renderer(self, renderer: str, stream: bool = False) -> None:
+        """
+        Method to select the backend rendering the LaTeX code, if the output has several
+
+        :param renderer: the name of the backend
+        :param stream: whether the solution should be rendered only while it is written
+        """
+
+    def keep_steps(self, keep: bool) -> None:
+        """
+        Method to select whether the steps of the algorithm are kept once computed, if the
+        output records them
+
+        :param keep: whether the steps are kept, otherwise they are computed again when
+            needed again
+        """
+
     def get_exercise_preamble(self) -> LatexObject:
         """
         Getter for the preamble designated for the exercise sheet.
-        
-        :return: A base LaTeX object from pylatex containing the preamble for the exercise sheet"""
+
+        :return: A base LaTeX object from pylatex containing the preamble for the exercise sheet
+        """
 
     def get_solution_preamble(self) -> LatexObject:
         """
         Getter for the preamble designated for the solution sheet.
-        
-        :return: A base LaTeX object from pylatex containing the preamble for the solution sheet"""
+
+        :return: A base LaTeX object from pylatex containing the preamble for the solution sheet
+        """
 
     @abstractmethod
     def generate_exercise(self) -> LatexObject:
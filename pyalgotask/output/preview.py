@@ -0,0 +1,336 @@
+"""Module rendering array outputs as standalone HTML documents with inline SVG pictures,
+such that exercises and solutions can be previewed in a browser without compiling LaTeX.
+
+The texts of the tasks are LaTeX code, of which only the commands used by the language files
+are translated to HTML. The arrays are drawn from the same trace as the LaTeX code."""
+from collections import namedtuple
+import html
+import re
+
+from pyalgotask import language as lang
+from pyalgotask.output.array import (
+    AlgorithmArrayOutput,
+    ArrayOutput,
+    OperationsArrayOutput,
+)
+from pyalgotask.trace import is_highlighted
+
+CELL_HEIGHT = 32
+"""The height of an entry of an array in pixels"""
+CHARACTER_WIDTH = 10
+"""The width of a character of an entry or label in pixels"""
+PADDING = 8
+"""The padding between the value of an entry and its border in pixels"""
+ROW_GAP = 8
+"""The vertical distance between two arrays in pixels"""
+LABEL_HEIGHT = 20
+"""The height of the labels above an array in pixels"""
+
+STYLE = """body { font-family: sans-serif; max-width: 60em; margin: 2em auto; }
+svg { display: block; margin: 1em 0; }
+svg text { font-family: monospace; font-size: 16px; dominant-baseline: central; }
+rect { fill: white; stroke: black; stroke-width: 2; }
+rect.highlight { fill: #d9d9d9; }
+.math { font-style: italic; }
+.display { display: block; text-align: center; margin: 1em 0; }
+.large svg text { font-size: 20px; }"""
+"""The style sheet of every preview, where highlights match the gray of the LaTeX code"""
+
+
+class Row(namedtuple("Row", ["values", "highlights", "left_label", "top_labels"])):
+    """
+    One array of a picture
+
+    :ivar values: the values of the entries as strings, empty strings for empty entries
+    :ivar highlights: the highlights, see ``pyalgotask.trace.is_highlighted``
+    :ivar left_label: the label left of the array or None
+    :ivar top_labels: the labels above the entries or None
+    """
+
+    __slots__ = ()
+
+
+_SYMBOLS = {
+    "cdot": "·",
+    "bmod": "mod",
+    "lfloor": "⌊",
+    "rfloor": "⌋",
+    "rr": "≫",
+    "gg": "≫",
+    "ldots": "…",
+}
+_TEXT_COMMANDS = {"emph": "em", "textbf": "strong", "textit": "i"}
+_TEXT_COMMAND = re.compile(r"\\(" + "|".join(_TEXT_COMMANDS) + r")\{([^{}]*)\}")
+_SCRIPT = re.compile(r"([_^])(?:\{([^{}]*)\}|(\w))")
+_COMMAND = re.compile(r"\\([a-zA-Z]+)")
+
+
+def latex_to_html(text: str) -> str:
+    """
+    Translates LaTeX code of a text into HTML. Text formatting, sub- and superscripts and
+    the symbols of the hash functions are translated, further commands are removed.
+
+    :param text: the LaTeX code
+    :return: the HTML code of the text
+    """
+    text = html.escape(str(text), quote=False)
+    text = re.sub(
+        r"\$\$(.*?)\$\$", r'<span class="display math">\1</span>', text, flags=re.S
+    )
+    text = re.sub(r"\$(.*?)\$", r'<span class="math">\1</span>', text, flags=re.S)
+    text = _TEXT_COMMAND.sub(
+        lambda match: _tag(_TEXT_COMMANDS[match.group(1)], match.group(2)), text
+    )
+    text = _SCRIPT.sub(
+        lambda match: _tag(
+            "sub" if match.group(1) == "_" else "sup",
+            match.group(2) if match.group(2) is not None else match.group(3),
+        ),
+        text,
+    )
+    text = text.replace("\\\\", "<br>").replace("~", "&nbsp;")
+    text = _COMMAND.sub(lambda match: _SYMBOLS.get(match.group(1), ""), text)
+    return text.replace("{", "").replace("}", "")
+
+
+def _tag(tag: str, content: str) -> str:
+    """
+    Encloses HTML code into a tag
+
+    :param tag: the name of the tag
+    :param content: the HTML code
+    :return: the enclosed HTML code
+    """
+    return f"<{tag}>{content}</{tag}>"
+
+
+def latex_to_text(text: str) -> str:
+    """
+    Translates LaTeX code of a label into plain text, e.g. to be drawn into a picture
+
+    :param text: the LaTeX code
+    :return: the plain text
+    """
+    return html.unescape(re.sub(r"<[^>]*>", "", latex_to_html(text)))
+
+
+def svg_picture(rows, phantom_length: int) -> str:
+    """
+    Draws arrays below each other as SVG picture, where every entry has the same width
+
+    :param rows: the ``Row`` of every array
+    :param phantom_length: the minimal number of characters fitting into an entry
+    :return: the SVG code of the picture
+    """
+    rows = [
+        Row(
+            row.values or [""],
+            row.highlights,
+            latex_to_text(row.left_label) if row.left_label else None,
+            [latex_to_text(label) for label in row.top_labels or []],
+        )
+        for row in rows
+    ]
+    characters = max(
+        [phantom_length]
+        + [len(value) for row in rows for value in row.values]
+        + [len(label) for row in rows for label in row.top_labels]
+    )
+    cell_width = characters * CHARACTER_WIDTH + 2 * PADDING
+    left_characters = max((len(row.left_label or "") for row in rows), default=0)
+    left = left_characters * CHARACTER_WIDTH + PADDING if left_characters else 0
+
+    elements = []
+    top = 0
+    for row in rows:
+        if row.top_labels:
+            top += LABEL_HEIGHT
+            elements += [
+                _text(left + (i + 0.5) * cell_width, top - LABEL_HEIGHT / 2, label)
+                for i, label in enumerate(row.top_labels)
+            ]
+        if row.left_label:
+            elements.append(
+                _text(left - PADDING, top + CELL_HEIGHT / 2, row.left_label, "end")
+            )
+        for i, value in enumerate(row.values):
+            highlight = (
+                ' class="highlight"' if is_highlighted(row.highlights, i) else ""
+            )
+            elements.append(
+                f'<rect{highlight} x="{left + i * cell_width}" y="{top}" '
+                f'width="{cell_width}" height="{CELL_HEIGHT}"/>'
+            )
+            if value:
+                elements.append(
+                    _text(left + (i + 0.5) * cell_width, top + CELL_HEIGHT / 2, value)
+                )
+        top += CELL_HEIGHT + ROW_GAP
+
+    width = left + max((len(row.values) for row in rows), default=0) * cell_width
+    height = max(top - ROW_GAP, 0)
+    # the border of the outer entries is drawn half outside of the picture
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width + 2}" '
+        f'height="{height + 2}" viewBox="-1 -1 {width + 2} {height + 2}">'
+        + "".join(elements)
+        + "</svg>"
+    )
+
+
+def _text(x, y, text: str, anchor: str = "middle") -> str:
+    """
+    Creates an SVG text element
+
+    :param x: the horizontal position of the anchor
+    :param y: the vertical center of the text
+    :param text: the plain text
+    :param anchor: the horizontal anchor of the text
+    :return: the SVG code of the text
+    """
+    return (
+        f'<text x="{x:g}" y="{y:g}" text-anchor="{anchor}">'
+        f"{html.escape(text, quote=False)}</text>"
+    )
+
+
+def _label(labels, line_num: int):
+    """
+    Selects the label of an array, if any
+
+    :param labels: the labels of every array or None
+    :param line_num: the number of the array
+    :return: the label or None
+    """
+    return labels[line_num] if labels else None
+
+
+def exercise_rows(output: ArrayOutput) -> list:
+    """
+    Creates the empty arrays of the solution space of an exercise
+
+    :param output: the output of the task
+    :return: a list of ``Row``
+    """
+    options = output.latex_options
+    if isinstance(output, AlgorithmArrayOutput):
+        trace = output.get_trace().record()
+        lengths = [max(length, 1) for length in trace.lengths]
+        if lengths:
+            lengths += [trace.max_length] * output.exercise_num_of_additional_arrays
+        return [Row([""] * length, None, None, None) for length in lengths]
+    return [
+        Row(
+            [""] * length,
+            None,
+            _label(options.exercise_left_labels, line_num),
+            _label(options.exercise_top_labels, line_num),
+        )
+        for line_num, length in enumerate(options.exercise_lengths_of_arrays)
+    ]
+
+
+def solution_rows(output: ArrayOutput):
+    """
+    Creates the arrays of the solution, i.e. the task array followed by every step of the
+    algorithm. Outputs over operations do not repeat their empty task array.
+
+    :param output: the output of the task
+    :yield: a ``Row`` per array
+    """
+    options = output.latex_options
+    if not isinstance(output, OperationsArrayOutput):
+        yield Row(
+            [str(value) for value in output.task_info.task_array], None, None, None
+        )
+    for line_num, (array, highlights) in enumerate(output.get_trace()):
+        yield Row(
+            [str(value) for value in array],
+            highlights,
+            _label(options.exercise_left_labels, line_num),
+            _label(options.exercise_top_labels, line_num),
+        )
+
+
+def exercise_body(output: ArrayOutput) -> str:
+    """
+    Renders the exercise of a task as HTML
+
+    :param output: the output of the task
+    :raise ValueError: if the output is not an array output
+    :return: the HTML code of the exercise without document
+    """
+    if not isinstance(output, ArrayOutput):
+        raise ValueError(f"{type(output).__name__} has no HTML preview.")
+    phantom_length = output.latex_options.phantom_length
+    parts = [f"<p>{latex_to_html(output.task_info.prefix)}</p>"]
+    if isinstance(output, OperationsArrayOutput):
+        parts.append(
+            "<ol>"
+            + "".join(
+                f"<li>{latex_to_html(operation)}</li>"
+                for operation in output.operations
+            )
+            + "</ol>"
+        )
+    else:
+        task_row = Row(
+            [str(value) for value in output.task_info.task_array], *[None] * 3
+        )
+        parts.append(
+            f'<div class="large">{svg_picture([task_row], phantom_length)}</div>'
+        )
+    parts.append(f"<p>{latex_to_html(output.get_postfix())}</p>")
+    rows = exercise_rows(output)
+    if rows:
+        parts.append(svg_picture(rows, phantom_length))
+    return "\n".join(parts)
+
+
+def solution_body(output: ArrayOutput) -> str:
+    """
+    Renders the solution of a task as HTML
+
+    :param output: the output of the task
+    :raise ValueError: if the output is not an array output
+    :return: the HTML code of the solution without document
+    """
+    if not isinstance(output, ArrayOutput):
+        raise ValueError(f"{type(output).__name__} has no HTML preview.")
+    return svg_picture(solution_rows(output), output.latex_options.phantom_length)
+
+
+def html_document(title: str, bodies) -> str:
+    """
+    Creates a standalone HTML document
+
+    :param title: the title of the document
+    :param bodies: the HTML code of every task, which get a numbered heading as in a
+        sheet if there are several
+    :return: the HTML code of the document
+    """
+    bodies = list(bodies)
+    if len(bodies) > 1:
+        heading = lang.get_text("sheet", "task-title")
+        bodies = [
+            f"<section><h2>{html.escape(heading.format(number))}</h2>\n{body}</section>"
+            for number, body in enumerate(bodies, start=1)
+        ]
+    return (
+        '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+        f"<title>{html.escape(title)}</title>\n<style>\n{STYLE}\n</style>\n"
+        "</head>\n<body>\n" + "\n".join(bodies) + "\n</body>\n</html>\n"
+    )
+
+
+def write_html(document: str, file: str) -> str:
+    """
+    Writes an HTML document into a file
+
+    :param document: the HTML code
+    :param file: the file location without file extension
+    :return: the location of the written file
+    """
+    with open(file + ".html", "w", encoding="UTF-8") as html_file:
+        html_file.write(document)
+    return file + ".html"
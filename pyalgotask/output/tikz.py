@@ -0,0 +1,654 @@
+"""Backends rendering the TikZ pictures of the array outputs.
+
+The pylatex backend builds one pylatex object per node and is the reference implementation.
+The string backend writes the same markup directly as text, avoiding the creation and
+traversal of the pylatex object tree for every node. Both backends produce identical LaTeX code.
+
+The macro backend writes one call of a macro defined in the preamble per array row instead of
+one node per entry, such that the LaTeX code is much smaller and TeX expands the layout itself.
+
+The table backend renders every array row as a single node containing a ``tabular``, such
+that TikZ positions one node per row instead of one node per entry.
+
+The string, macro and table backends can also stream a picture, i.e. its rows are only rendered
+while the document is written by ``write_document``, such that only the nodes of one row are kept
+in memory. HTML previews without LaTeX are rendered by ``pyalgotask.output.preview`` instead.
+"""
+from abc import ABC, abstractmethod
+import itertools
+
+import pylatex as latex
+from pylatex.base_classes import Container, LatexObject
+from pylatex.utils import escape_latex
+
+from pyalgotask.output import pylatex_classes as clatex
+from pyalgotask.trace import is_highlighted
+
+
+class TikzRenderer(ABC):
+    """Base class for backends rendering TikZ pictures of nodes.
+    The options of nodes are lists of strings and are escaped by the backend."""
+
+    @abstractmethod
+    def create_picture(self, options: str) -> LatexObject:
+        """
+        Creates an empty TikZ picture
+
+        :param options: the options of the picture, which are not escaped
+        :return: the picture, which can be appended to pylatex containers
+        """
+
+    @abstractmethod
+    def phantom_node(self, picture, handle: str, options: list, length: int):
+        """
+        Appends a node reserving the space of ``length`` characters
+
+        :param picture: the picture to append the node to
+        :param handle: the name of the node
+        :param options: the options of the node
+        :param length: the number of characters to reserve
+        """
+
+    @abstractmethod
+    def value_node(self, picture, handle: str, options: list, value, padding: int):
+        """
+        Appends a node containing a value, right aligned by a phantom
+
+        :param picture: the picture to append the node to
+        :param handle: the name of the node
+        :param options: the options of the node
+        :param value: the value of the node, which is not escaped
+        :param padding: the number of characters to pad the value with
+        """
+
+    @abstractmethod
+    def label_node(self, picture, handle: str, options: list, label):
+        """
+        Appends a node containing a label
+
+        :param picture: the picture to append the node to
+        :param handle: the name of the node
+        :param options: the options of the node
+        :param label: the label, which is not escaped
+        """
+
+    def preamble(self) -> LatexObject:
+        """
+        Getter for the definitions the backend requires in the preamble
+
+        :return: A LaTeX object containing the definitions or None
+        """
+        return None
+
+    def empty_row(
+        self,
+        picture,
+        start_index: int,
+        length: int,
+        phantom_length: int,
+        *,
+        node_option="",
+        node_option_first="",
+    ):
+        """
+        Appends a row of empty nodes named ``n<start_index>`` onwards, where every node is
+        placed right of its predecessor
+
+        :param picture: the picture to append the row to
+        :param start_index: the index of the first node
+        :param length: the number of nodes, at least 1
+        :param phantom_length: the number of characters to reserve per node
+        :param node_option: style options for every node
+        :param node_option_first: special style options for the first node
+        """
+        self.phantom_node(
+            picture,
+            "n" + str(start_index),
+            list(filter(None, ["node", node_option, node_option_first])),
+            phantom_length,
+        )
+        for i in range(1, length):
+            options = list(
+                filter(
+                    None,
+                    ["node", "right=of n" + str(start_index + i - 1), node_option],
+                )
+            )
+            self.phantom_node(
+                picture, "n" + str(start_index + i), options, phantom_length
+            )
+
+    def filled_row(
+        self,
+        picture,
+        start_index: int,
+        values: list,
+        highlights,
+        *,
+        node_option="",
+        highlight_option="highlight",
+        node_option_first="",
+    ):
+        """
+        Appends a row of nodes named ``n<start_index>`` onwards containing the values
+        right aligned, where every node is placed right of its predecessor
+
+        :param picture: the picture to append the row to
+        :param start_index: the index of the first node
+        :param values: the values of the nodes as strings, at least one
+        :param highlights: the highlighted entries, see ``pyalgotask.trace.is_highlighted``
+        :param node_option: style options for every node
+        :param highlight_option: which style options should be used for highlights
+        :param node_option_first: special style options for the first node
+        """
+        max_str_length = max(len(value) for value in values)
+        for i, value in enumerate(values):
+            if i == 0:
+                options = ["node", node_option, node_option_first]
+            else:
+                options = ["node", "right=of n" + str(start_index + i - 1), node_option]
+            if is_highlighted(highlights, i):
+                options.append(highlight_option)
+            self.value_node(
+                picture,
+                "n" + str(start_index + i),
+                list(filter(None, options)),
+                value,
+                max_str_length - len(value),
+            )
+
+    def top_labels(self, picture, start_index: int, labels: list):
+        """
+        Appends labels above the entries of the row starting with node ``n<start_index>``
+
+        :param picture: the picture to append the labels to
+        :param start_index: the index of the first node of the row
+        :param labels: the labels, one per entry, which are not escaped
+        """
+        for i, label in enumerate(labels, start=start_index):
+            self.label_node(
+                picture, "top_label" + str(i), ["above=of n" + str(i)], label
+            )
+
+    def finish_picture(self, picture, rows) -> LatexObject:
+        """
+        Renders the rows of a picture
+
+        :param picture: the picture the rows append their nodes to
+        :param rows: an iterator appending the nodes of one row per step
+        :return: the picture, which can be appended to pylatex containers
+        """
+        for _ in rows:
+            pass
+        return picture
+
+
+class PylatexTikzRenderer(TikzRenderer):
+    """Backend creating a pylatex object for every node"""
+
+    def create_picture(self, options: str) -> LatexObject:
+        return latex.TikZ(options=latex.NoEscape(options))
+
+    def phantom_node(self, picture, handle: str, options: list, length: int):
+        picture.append(
+            latex.TikZNode(
+                handle=handle,
+                options=options,
+                text=clatex.StringEmptyContainer(clatex.PhantomLength(length)),
+            )
+        )
+
+    def value_node(self, picture, handle: str, options: list, value, padding: int):
+        container = clatex.StringEmptyContainer()
+        container.append(clatex.VPhantomLength())
+        container.append(clatex.PhantomLength(padding))
+        container.append(latex.NoEscape(str(value)))
+        picture.append(latex.TikZNode(handle=handle, options=options, text=container))
+
+    def label_node(self, picture, handle: str, options: list, label):
+        picture.append(latex.TikZNode(handle=handle, options=options, text=label))
+
+
+class TikzPicture(LatexObject):
+    """TikZ picture consisting of the LaTeX code of its nodes
+
+    :ivar options: the options of the picture
+    :ivar nodes: the LaTeX code of every node"""
+
+    packages = [latex.Package("tikz")]
+
+    def __init__(self, options: str):
+        """
+        Constructor of an empty picture
+
+        :param options: the options of the picture, which are not escaped
+        """
+        super().__init__()
+        self.options = options
+        self.nodes = []
+
+    def write(self, file):
+        """
+        Writes the LaTeX code of the picture into a file without joining it first
+
+        :param file: a text file or stream
+        """
+        file.write("\\begin{tikzpicture}[" + self.options + "]%\n")
+        for node in self.nodes:
+            file.write(node)
+            file.write("%\n")
+        if not self.nodes:
+            file.write("%\n")
+        file.write("\\end{tikzpicture}")
+
+    def dumps(self):
+        """
+        Represents the picture as LaTeX code
+
+        :return: the LaTeX code of the picture
+        """
+        return (
+            "\\begin{tikzpicture}["
+            + self.options
+            + "]%\n"
+            + "%\n".join(self.nodes)
+            + "%\n\\end{tikzpicture}"
+        )
+
+
+def _node(handle: str, options: list, text: str) -> str:
+    """
+    Creates the LaTeX code of a node
+
+    :param handle: the name of the node
+    :param options: the options of the node
+    :param text: the text of the node
+    :return: the LaTeX code of the node
+    """
+    if options:
+        return (
+            "\\node["
+            + ",".join(escape_latex(option) for option in options)
+            + "] ("
+            + handle
+            + ") {"
+            + text
+            + "};"
+        )
+    return "\\node (" + handle + ") {" + text + "};"
+
+
+class StreamedPicture(LatexObject):
+    """TikZ picture whose rows are rendered while it is written. It can be written only once.
+
+    :ivar picture: the picture the rows append their nodes to
+    :ivar rows: an iterator appending the nodes of one row per step
+    :ivar placeholder: the code written by ``dumps`` instead of the picture, if any"""
+
+    packages = [latex.Package("tikz")]
+
+    def __init__(self, picture: TikzPicture, rows):
+        """
+        Constructor of a picture rendered later
+
+        :param picture: the picture the rows append their nodes to
+        :param rows: an iterator appending the nodes of one row per step
+        """
+        super().__init__()
+        self.picture = picture
+        self.rows = rows
+        self.placeholder = None
+
+    def write(self, file):
+        """
+        Renders the picture row by row and writes every row as soon as it is rendered
+
+        :param file: a text file or stream
+        """
+        file.write("\\begin{tikzpicture}[" + self.picture.options + "]%\n")
+        empty = True
+        for _ in itertools.chain((None,), self.rows):
+            for node in self.picture.nodes:
+                file.write(node)
+                file.write("%\n")
+                empty = False
+            self.picture.nodes.clear()
+        if empty:
+            file.write("%\n")
+        file.write("\\end{tikzpicture}")
+
+    def dumps(self):
+        """
+        Renders the whole picture as LaTeX code, unless a placeholder is set
+
+        :return: the LaTeX code of the picture or the placeholder
+        """
+        if self.placeholder is not None:
+            return self.placeholder
+        for _ in self.rows:
+            pass
+        return self.picture.dumps()
+
+
+class StringTikzRenderer(TikzRenderer):
+    """Backend writing the LaTeX code of every node directly as string
+
+    :ivar stream: whether pictures are rendered only while they are written"""
+
+    def __init__(self, stream: bool = False):
+        """
+        Constructor selecting whether pictures are streamed
+
+        :param stream: whether pictures are rendered only while they are written
+        """
+        self.stream = stream
+
+    def create_picture(self, options: str) -> TikzPicture:
+        return TikzPicture(options)
+
+    def phantom_node(self, picture, handle: str, options: list, length: int):
+        picture.nodes.append(_node(handle, options, "\\phantom{" + "A" * length + "}"))
+
+    def value_node(self, picture, handle: str, options: list, value, padding: int):
+        picture.nodes.append(
+            _node(
+                handle,
+                options,
+                "\\vphantom{A} \\phantom{" + "A" * padding + "} " + str(value),
+            )
+        )
+
+    def label_node(self, picture, handle: str, options: list, label):
+        picture.nodes.append(_node(handle, options, str(label)))
+
+    def finish_picture(self, picture, rows) -> LatexObject:
+        if self.stream:
+            return StreamedPicture(picture, rows)
+        return super().finish_picture(picture, rows)
+
+
+MACRO_PREAMBLE = r"""\tikzset{pyahighlight/.code={\ifnum#1>0 \pgfkeysalso{highlight}\fi}}%
+\newcommand{\pyanode}[4]{%
+  \ifnum\pyaindex=#1\relax
+    \node[node,#2,pyahighlight=#3] (n\pyaindex) {#4};%
+  \else
+    \pgfmathtruncatemacro{\pyaprevious}{\pyaindex-1}%
+    \node[node,right=of n\pyaprevious,pyahighlight=#3] (n\pyaindex) {#4};%
+  \fi}%
+\newcommand{\pyaarray}[4]{%
+  \foreach \pyavalue/\pyahighlighted [count=\pyaindex from #1] in {#4} {%
+    \pyanode{#1}{#2}{\pyahighlighted}{\vphantom{A}\phantom{#3}\llap{\pyavalue}}}}%
+\newcommand{\pyaemptyarray}[4]{%
+  \foreach \pyaindex in {#1,...,#4} {\pyanode{#1}{#2}{0}{\phantom{#3}}}}"""
+r"""Definitions of the macros used by the macro backend:
+
+- ``\pyaarray{first index}{options of the first node}{widest value}{value/highlighted,...}``
+- ``\pyaemptyarray{first index}{options of the first node}{phantom}{last index}``"""
+
+
+class MacroTikzRenderer(StringTikzRenderer):
+    """Backend writing one macro call per array row, which TeX expands into the nodes.
+    Rows with custom node or highlight options are written node by node."""
+
+    def preamble(self) -> LatexObject:
+        return latex.NoEscape(MACRO_PREAMBLE)
+
+    def empty_row(
+        self,
+        picture,
+        start_index: int,
+        length: int,
+        phantom_length: int,
+        *,
+        node_option="",
+        node_option_first="",
+    ):
+        if node_option:
+            super().empty_row(
+                picture,
+                start_index,
+                length,
+                phantom_length,
+                node_option=node_option,
+                node_option_first=node_option_first,
+            )
+            return
+        picture.nodes.append(
+            "\\pyaemptyarray{"
+            + str(start_index)
+            + "}{"
+            + escape_latex(node_option_first)
+            + "}{"
+            + "A" * phantom_length
+            + "}{"
+            + str(start_index + length - 1)
+            + "}"
+        )
+
+    def filled_row(
+        self,
+        picture,
+        start_index: int,
+        values: list,
+        highlights,
+        *,
+        node_option="",
+        highlight_option="highlight",
+        node_option_first="",
+    ):
+        if node_option or highlight_option != "highlight":
+            super().filled_row(
+                picture,
+                start_index,
+                values,
+                highlights,
+                node_option=node_option,
+                highlight_option=highlight_option,
+                node_option_first=node_option_first,
+            )
+            return
+        cells = ",".join(
+            "{" + value + "}/" + ("1" if is_highlighted(highlights, i) else "0")
+            for i, value in enumerate(values)
+        )
+        picture.nodes.append(
+            "\\pyaarray{"
+            + str(start_index)
+            + "}{"
+            + escape_latex(node_option_first)
+            + "}{"
+            + max(values, key=len)
+            + "}{"
+            + cells
+            + "}"
+        )
+
+
+class TableTikzRenderer(StringTikzRenderer):
+    """Backend writing every array row as one node containing a table, where highlighted
+    entries are colored like the highlight style. Labels above the entries are written
+    as one node containing a table with invisible rules aligned to the row."""
+
+    def __init__(self, stream: bool = False):
+        super().__init__(stream)
+        self._last_row = None
+
+    def preamble(self) -> LatexObject:
+        return clatex.EmptyContainer(
+            data=[
+                latex.Package("colortbl"),
+                latex.NoEscape(r"\tikzset{pyatable/.style={inner sep=0pt}}"),
+            ]
+        )
+
+    def _row(self, picture, start_index: int, options: list, phantom: str, cells: list):
+        """
+        Appends a row as one node named ``n<start_index>``
+
+        :param picture: the picture to append the row to
+        :param start_index: the index of the row
+        :param options: the options of the node, where the style ``node`` is replaced
+        :param phantom: the text determining the width of every entry
+        :param cells: the LaTeX code of every entry
+        """
+        self._last_row = (start_index, phantom, len(cells))
+        options = ["pyatable" if option == "node" else option for option in options]
+        table = (
+            "\\begin{tabular}{|"
+            + "c|" * len(cells)
+            + "}\\hline "
+            + " & ".join(cells)
+            + "\\\\\\hline\\end{tabular}"
+        )
+        picture.nodes.append(_node("n" + str(start_index), options, table))
+
+    def phantom_node(self, picture, handle: str, options: list, length: int):
+        phantom = "A" * length
+        self._row(
+            picture, int(handle[1:]), options, phantom, ["\\phantom{" + phantom + "}"]
+        )
+
+    def empty_row(
+        self,
+        picture,
+        start_index: int,
+        length: int,
+        phantom_length: int,
+        *,
+        node_option="",
+        node_option_first="",
+    ):
+        phantom = "A" * phantom_length
+        self._row(
+            picture,
+            start_index,
+            list(filter(None, ["node", node_option, node_option_first])),
+            phantom,
+            ["\\phantom{" + phantom + "}"] * length,
+        )
+
+    def filled_row(
+        self,
+        picture,
+        start_index: int,
+        values: list,
+        highlights,
+        *,
+        node_option="",
+        highlight_option="highlight",
+        node_option_first="",
+    ):
+        phantom = max(values, key=len)
+        cells = [
+            ("\\cellcolor{gray!30}" if is_highlighted(highlights, i) else "")
+            + "\\vphantom{A}\\phantom{"
+            + phantom
+            + "}\\llap{"
+            + value
+            + "}"
+            for i, value in enumerate(values)
+        ]
+        self._row(
+            picture,
+            start_index,
+            list(filter(None, ["node", node_option, node_option_first])),
+            phantom,
+            cells,
+        )
+
+    def top_labels(self, picture, start_index: int, labels: list):
+        if self._last_row is None or self._last_row[0] != start_index:
+            super().top_labels(picture, start_index, labels)
+            return
+        _, phantom, length = self._last_row
+        labels = list(labels)[:length]
+        labels += [""] * (length - len(labels))
+        cells = [
+            "\\ooalign{\\phantom{"
+            + phantom
+            + "}\\cr\\hidewidth "
+            + str(label)
+            + "\\hidewidth\\cr}"
+            for label in labels
+        ]
+        rule = "!{\\hspace{\\arrayrulewidth}}"
+        table = (
+            "\\begin{tabular}{"
+            + rule
+            + ("c" + rule) * length
+            + "}"
+            + " & ".join(cells)
+            + "\\end{tabular}"
+        )
+        picture.nodes.append(
+            _node(
+                "top_label" + str(start_index),
+                ["pyatable", "above=of n" + str(start_index)],
+                table,
+            )
+        )
+
+
+RENDERERS = {
+    "pylatex": PylatexTikzRenderer,
+    "string": StringTikzRenderer,
+    "macro": MacroTikzRenderer,
+    "table": TableTikzRenderer,
+}
+"""The available backends by their name"""
+
+DEFAULT_RENDERER = "string"
+"""The name of the backend used if none is selected"""
+
+
+def create_renderer(name: str = DEFAULT_RENDERER, stream: bool = False) -> TikzRenderer:
+    """
+    Creates a backend by its name
+
+    :param name: the name of the backend
+    :param stream: whether pictures are rendered only while they are written
+    :return: the backend
+    :raise ValueError: if there is no such backend or it cannot stream
+    """
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown renderer {name}. Available: {', '.join(RENDERERS)}")
+    if not stream:
+        return RENDERERS[name]()
+    if not issubclass(RENDERERS[name], StringTikzRenderer):
+        raise ValueError(f"The renderer {name} cannot stream")
+    return RENDERERS[name](stream=True)
+
+
+def _streamed_pictures(latex_object):
+    """
+    Finds every streamed picture in a pylatex object
+
+    :param latex_object: the pylatex object to search in
+    :yield: the streamed pictures in the order of the LaTeX code
+    """
+    if isinstance(latex_object, StreamedPicture):
+        yield latex_object
+    elif isinstance(latex_object, Container):
+        for item in latex_object.data:
+            yield from _streamed_pictures(item)
+
+
+def write_document(doc, file):
+    """
+    Writes a pylatex document into a .tex file, where streamed pictures are rendered
+    while they are written. Without streamed pictures, this equals ``doc.generate_tex(file)``.
+
+    :param doc: the pylatex document
+    :param file: the file location without file extension
+    """
+    pictures = list(_streamed_pictures(doc))
+    for index, picture in enumerate(pictures):
+        picture.placeholder = f"%pyalgotask-streamed-picture-{index}%"
+    code = doc.dumps()
+    with open(file + ".tex", "w", encoding="utf-8") as tex_file:
+        for picture in pictures:
+            head, found, code = code.partition(picture.placeholder)
+            tex_file.write(head)
+            if found:
+                picture.write(tex_file)
+        tex_file.write(code)
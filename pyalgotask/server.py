@@ -0,0 +1,316 @@
+"""Module for a long-running server generating tasks on request, such that the interpreter
+start-up and the imports of pylatex, yaml and every task are paid only once.
+
+The server listens on a local TCP port or a unix socket and reads one JSON object per line.
+A request may have the keys of a batch job (see ``pyalgotask.batch``) except the output files
+``exercise``, ``solution`` and ``trace``, and additionally:
+
+- ``id``: an arbitrary value copied into the response
+- ``pdf``: whether pdf files should be compiled instead of returning the LaTeX code
+- ``language``: the language of the texts, defaults to the language of the server
+
+The server answers every request with one JSON object per line, containing the ``id``, and
+either the keys ``exercise`` and ``solution`` with the LaTeX code or the location of the pdf
+files respectively, or the key ``error`` with a description of the failure.
+
+The returned pdf files belong to the server. Clients copy them before further requests, as
+only the most recently generated pdf files are kept in the output directory and older ones
+are deleted. The LaTeX files of pdf requests are deleted right after compiling.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+import pathlib
+import tempfile
+import uuid
+
+from pyalgotask import __settings as settings
+from pyalgotask import batch
+from pyalgotask import language as lang
+from pyalgotask.compile import (
+    CompileScheduler,
+    CompileCache,
+    FormatCache,
+    init_cache_argument_parser,
+    parse_cache,
+    parse_formats,
+)
+from pyalgotask.export import exercise_document, solution_document
+
+_logger = logging.getLogger(__name__)
+
+_FORBIDDEN_KEYS = {"exercise", "solution", "trace"}
+"""Keys of batch jobs not allowed in requests, as the server decides where files are written"""
+
+DEFAULT_MAX_PDFS = 256
+"""The default number of pdf files kept in the output directory"""
+
+_worker_state = {}
+"""State of a worker process, containing the compile scheduler for pdf requests"""
+
+
+def _init_worker(cache_dir, cache_size, format_dir, language):
+    """Initializes a worker process with its own compile scheduler
+
+    :param cache_dir: the directory of the compile cache or None
+    :param cache_size: the maximal size of the compile cache in bytes
+    :param format_dir: the directory of the precompiled formats or None
+    :param language: the language of requests without own language"""
+    settings.LANGUAGE = language
+    cache = CompileCache(cache_dir, cache_size) if cache_dir else None
+    formats = FormatCache(format_dir) if format_dir else None
+    _worker_state["scheduler"] = CompileScheduler(
+        max_workers=1, cache=cache, formats=formats
+    )
+
+
+def pdf_count(value: str) -> int:
+    """Cast method for the number of pdf files kept, where 0 stands for every file
+
+    :param value: the number of pdf files as string
+    :return: a non-negative number of pdf files"""
+    max_pdfs = int(value)
+    if max_pdfs < 0:
+        raise ValueError(
+            f"Number of pdf files needs to be non-negative, but is {value}"
+        )
+    return max_pdfs
+
+
+def remove_old_pdfs(output_dir, max_pdfs: int):
+    """Removes the least recently generated pdf files until the output directory keeps at
+    most the given number
+
+    :param output_dir: the directory the pdf files are written into
+    :param max_pdfs: the number of pdf files to keep, 0 keeps every file"""
+    if not max_pdfs:
+        return
+    entries = []
+    for pdf_file in pathlib.Path(output_dir).glob("*.pdf"):
+        try:
+            entries.append((pdf_file.stat().st_mtime, pdf_file))
+        except FileNotFoundError:
+            continue
+    for _, pdf_file in sorted(entries)[: max(len(entries) - max_pdfs, 0)]:
+        pdf_file.unlink(missing_ok=True)
+
+
+def compile_sources(sources: dict, output_dir) -> dict:
+    """Compiles LaTeX documents into pdf files with the compile scheduler of the worker,
+    deleting the LaTeX files afterwards
+
+    :param sources: the LaTeX code of every document by its key
+    :param output_dir: the directory to write pdf files into
+    :raise ValueError: if a document cannot be compiled
+    :return: the location of the pdf file of every document by its key"""
+    scheduler = _worker_state.setdefault("scheduler", CompileScheduler(1))
+    stem = pathlib.Path(output_dir, uuid.uuid4().hex)
+    pdf_files = {}
+    for key, source in sources.items():
+        tex_file = pathlib.Path(f"{stem}-{key}.tex")
+        tex_file.write_text(source, encoding="UTF-8")
+        try:
+            result = scheduler.compile(tex_file)
+        finally:
+            tex_file.unlink(missing_ok=True)
+        if not result.success:
+            raise ValueError(f"Compiling {key} failed:\n{result.log_excerpt}")
+        pdf_files[key] = result.pdf_file
+    return pdf_files
+
+
+def generate(request: dict, output_dir, max_pdfs: int = DEFAULT_MAX_PDFS) -> dict:
+    """Generates the exercise and solution of one request, catching every error
+
+    :param request: the decoded JSON request
+    :param output_dir: the directory to write pdf files into
+    :param max_pdfs: the number of pdf files kept in the output directory, see
+        ``remove_old_pdfs``
+    :return: the response to encode as JSON"""
+    response = {"id": request.get("id")} if isinstance(request, dict) else {"id": None}
+    try:
+        if not isinstance(request, dict):
+            raise ValueError(f"Request is not a JSON object but {request}")
+        entry = {key: value for key, value in request.items() if key != "id"}
+        forbidden = _FORBIDDEN_KEYS & set(entry)
+        if forbidden:
+            raise ValueError(f"Request must not set {sorted(forbidden)}")
+        job = batch.job_from_entry(entry)
+        with lang.use_language(job.language):
+            task = batch.prepare_job(job)
+            sources = {
+                "exercise": exercise_document(task).dumps(),
+                "solution": solution_document(task).dumps(),
+            }
+        if not job.pdf:
+            response.update(sources)
+            return response
+
+        response.update(compile_sources(sources, output_dir))
+        remove_old_pdfs(output_dir, max_pdfs)
+    except Exception as exception:  # pylint: disable=broad-exception-caught
+        response["error"] = f"{type(exception).__name__}: {exception}"
+    return response
+
+
+class Server:
+    """Class for an asyncio server answering generation requests. The CPU-bound generation
+    and compilation runs in a pool of worker processes, such that the event loop only
+    handles the connections.
+
+    :ivar executor: the pool of workers generating the requests
+    :ivar output_dir: the directory to write pdf files into
+    :ivar max_pdfs: the number of pdf files kept in the output directory"""
+
+    def __init__(self, executor, output_dir, max_pdfs: int = DEFAULT_MAX_PDFS):
+        """Constructor setting the worker pool and the output directory
+
+        :param executor: the pool of workers generating the requests
+        :param output_dir: the directory to write pdf files into
+        :param max_pdfs: the number of pdf files kept in the output directory, 0 keeps
+            every file"""
+        self.executor = executor
+        self.output_dir = pathlib.Path(output_dir)
+        self.max_pdfs = max_pdfs
+
+    async def answer(self, line: bytes) -> dict:
+        """Decodes one request and generates it in the worker pool
+
+        :param line: the encoded JSON request
+        :return: the response to encode as JSON"""
+        try:
+            request = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError) as exception:
+            return {"id": None, "error": f"Malformed request: {exception}"}
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, generate, request, str(self.output_dir), self.max_pdfs
+        )
+
+    async def handle_client(self, reader, writer):
+        """Answers every request of one connection in order until the client disconnects
+
+        :param reader: the stream reader of the connection
+        :param writer: the stream writer of the connection"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await self.answer(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as exception:
+            _logger.warning("Closing connection: %s", exception)
+        finally:
+            writer.close()
+
+    async def start(self, host=None, port=None, unix_socket=None):
+        """Starts listening on a TCP port or, if given, on a unix socket
+
+        :param host: the host name of the TCP server
+        :param port: the port of the TCP server, 0 for any free port
+        :param unix_socket: the location of the unix socket
+        :return: the started asyncio server"""
+        if unix_socket:
+            server = await asyncio.start_unix_server(
+                self.handle_client, path=str(unix_socket)
+            )
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        for sock in server.sockets:
+            _logger.info("Listening on %s", sock.getsockname())
+        return server
+
+    async def serve_forever(self, host=None, port=None, unix_socket=None):
+        """Starts the server and answers requests until cancelled
+
+        :param host: the host name of the TCP server
+        :param port: the port of the TCP server
+        :param unix_socket: the location of the unix socket"""
+        server = await self.start(host, port, unix_socket)
+        async with server:
+            await server.serve_forever()
+
+
+def init_argument_parser(parser):
+    """Initializes the arguments for the server mode
+
+    :param parser: the argparse parser"""
+    parser.add_argument(
+        "--host",
+        type=str,
+        dest="host",
+        default="127.0.0.1",
+        help="The host name the server listens on.",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        dest="port",
+        default=8765,
+        help="The TCP port the server listens on, 0 for any free port.",
+    )
+    parser.add_argument(
+        "--socket",
+        type=pathlib.Path,
+        dest="unix_socket",
+        help="If set, the server listens on this unix socket instead of a TCP port.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=batch.worker_count,
+        dest="num_workers",
+        default=0,
+        metavar="N",
+        help="The number of worker processes generating requests, 0 uses every core.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=pathlib.Path,
+        dest="output_dir",
+        help="The directory for compiled pdf files, defaults to a temporary directory.",
+    )
+    parser.add_argument(
+        "--max-pdfs",
+        type=pdf_count,
+        dest="max_pdfs",
+        default=DEFAULT_MAX_PDFS,
+        metavar="N",
+        help=(
+            "The number of most recent pdf files kept in the output directory, older ones "
+            "are deleted. 0 keeps every file."
+        ),
+    )
+    init_cache_argument_parser(parser)
+
+
+def main(args) -> int:
+    """Runs the server until it is interrupted
+
+    :param args: the result of argparse
+    :return: the exit code"""
+    output_dir = args.output_dir or pathlib.Path(tempfile.mkdtemp(prefix="pyalgotask-"))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cache = parse_cache(args)
+    formats = parse_formats(args)
+    with ProcessPoolExecutor(
+        max_workers=args.num_workers,
+        initializer=_init_worker,
+        initargs=(
+            cache.directory if cache else None,
+            cache.max_size if cache else None,
+            formats.directory if formats else None,
+            lang.current_language(),
+        ),
+    ) as executor:
+        server = Server(executor, output_dir, args.max_pdfs)
+        try:
+            asyncio.run(server.serve_forever(args.host, args.port, args.unix_socket))
+        except KeyboardInterrupt:
+            _logger.info("Server stopped")
+    return 0
@@ -1,9 +1,63 @@
-"""Various tasks about hash tables"""
-from pyalgotask.tasks.hashing import hashing_base, open_hashing, closed_hashing
+"""Various tasks about hash tables. The tasks are registered here and their modules are only
+imported once a task is requested."""
+from pyalgotask.tasks import task_base
+from pyalgotask.tasks.task_base import TaskCmd
 
-__all__ = [
-    # tasks
-    "hashing_base",
-    "open_hashing",
-    "closed_hashing",
-]
+task_base.register_category(
+    "hashing",
+    "Hashtables with hash functions",
+    "Various hashtable data structures with various hash functions",
+)
+
+task_base.register_task(
+    "hashing",
+    TaskCmd(
+        cmd="chaining",
+        description=(
+            "Exercise to apply open hashing (i.e. chaining) "
+            "on insert and delete operations into hashtables."
+        ),
+        help="Open hashing (i.e. chaining) for operations on integers.",
+    ),
+    f"{__name__}.open_hashing",
+    "ChainingHashing",
+)
+task_base.register_task(
+    "hashing",
+    TaskCmd(
+        cmd="linearprobing",
+        description=(
+            "Exercise to apply closed hashing (i.e. with probing) "
+            "on insert and delete operations into hashtables with linear probing."
+        ),
+        help="Linear closed hashing (i.e. probing) for operations on integers.",
+    ),
+    f"{__name__}.closed_hashing",
+    "LinearProbingHashing",
+)
+task_base.register_task(
+    "hashing",
+    TaskCmd(
+        cmd="quadraticprobing",
+        description=(
+            "Exercise to apply closed hashing (i.e. with probing) "
+            "on insert and delete operations into hashtables with linear probing."
+        ),
+        help="Quadratic closed hashing (i.e. probing) for operations on integers.",
+    ),
+    f"{__name__}.closed_hashing",
+    "QuadraticProbingHashing",
+)
+task_base.register_task(
+    "hashing",
+    TaskCmd(
+        cmd="doublehashing",
+        description=(
+            "Exercise to apply closed hashing (i.e. with probing) "
+            "on insert and delete operations into hashtables with double hashing."
+        ),
+        help="Double closed hashing (i.e. probing) for operations on integers.",
+    ),
+    f"{__name__}.closed_hashing",
+    "DoubleProbingHashing",
+)
@@ -131,14 +131,7 @@ class LinearProbingHashing(ProbingHashing):
     def __init__(self):
         """Constructor to set cmd and exercise text"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="linearprobing",
-            description=(
-                "Exercise to apply closed hashing (i.e. with probing) "
-                "on insert and delete operations into hashtables with linear probing."
-            ),
-            help="Linear closed hashing (i.e. probing) for operations on integers.",
-        )
+        self.cmd_info = task_base.get_task_info("hashing", "linearprobing")
         self.exercise_texts[0] = lang.get_text("hashing", "probing-prefix")
         self.exercise_texts[1] = lang.get_text(
             "hashing", "probing-postfix"
@@ -180,14 +173,7 @@ class QuadraticProbingHashing(ProbingHashing):
     def __init__(self):
         """Constructor to set cmd and exercise text"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="quadraticprobing",
-            description=(
-                "Exercise to apply closed hashing (i.e. with probing) "
-                "on insert and delete operations into hashtables with linear probing."
-            ),
-            help="Quadratic closed hashing (i.e. probing) for operations on integers.",
-        )
+        self.cmd_info = task_base.get_task_info("hashing", "quadraticprobing")
         self.exercise_texts[0] = lang.get_text("hashing", "probing-prefix")
         self.exercise_texts[1] = lang.get_text(
             "hashing", "probing-postfix"
@@ -223,6 +209,12 @@ class QuadraticProbingHashing(ProbingHashing):
             self.constant[0] = self.random_constant.get_random_input()
             self.constant[1] = self.random_constant.get_random_input()
 
+    def parameters(self) -> dict:
+        """Getter for the parameters including the constants of the quadratic probing
+
+        :return: a dictionary of the parameters"""
+        return {**super().parameters(), "constants": list(self.constant)}
+
     def probing(self, value, index):
         """quadratic probing method
 
@@ -255,14 +247,7 @@ class DoubleProbingHashing(ProbingHashing):
     def __init__(self):
         """Constructor to set cmd and exercise text"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="doublehashing",
-            description=(
-                "Exercise to apply closed hashing (i.e. with probing) "
-                "on insert and delete operations into hashtables with double hashing."
-            ),
-            help="Double closed hashing (i.e. probing) for operations on integers.",
-        )
+        self.cmd_info = task_base.get_task_info("hashing", "doublehashing")
         self.exercise_texts[0] = lang.get_text("hashing", "probing-prefix")
         self.exercise_texts[1] = lang.get_text("hashing", "probing-double-postfix")
 
@@ -305,6 +290,15 @@ class DoubleProbingHashing(ProbingHashing):
 
         :param arg_input: the argparse result"""
 
+    def parameters(self) -> dict:
+        """Getter for the parameters including the second hash function
+
+        :return: a dictionary of the parameters"""
+        return {
+            **super().parameters(),
+            "hash_function_2": dict(self.hash_function_2.parameters),
+        }
+
     def parse_hash_function(self, arg_input):
         """Reads the arguments for the constants in this probing mechanism
 
@@ -447,8 +441,3 @@ class DoubleProbingHashing(ProbingHashing):
         return (
             self.hash_function(value) + self.hash_function_2(index)
         ) % self.hashtable_size
-
-
-task_base.register_task("hashing", LinearProbingHashing())
-task_base.register_task("hashing", QuadraticProbingHashing())
-task_base.register_task("hashing", DoubleProbingHashing())
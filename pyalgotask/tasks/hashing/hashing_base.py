@@ -1,5 +1,4 @@
 """Modul for the hashing category and its base class"""
-
 from abc import abstractmethod
 import math
 
@@ -11,7 +10,8 @@ from pyalgotask import language as lang
 
 
 def division_hashing(size_constant):
-    """generates a hashing method with fixed size_constant
+    """generates a hashing method with fixed size_constant.
+    Its constants are kept in the attribute ``parameters`` of the hash function.
 
     :param size_constant: the size of the hashtable"""
 
@@ -22,11 +22,13 @@ def division_hashing(size_constant):
         :return: value modulo size_constant"""
         return value % size_constant
 
+    hash_method.parameters = {"method": "division", "size": size_constant}
     return hash_method
 
 
 def mutlitpilcation_hashing(multiplication_constant, size_constant):
-    """generates a mutliplication method hash function
+    """generates a mutliplication method hash function.
+    Its constants are kept in the attribute ``parameters`` of the hash function.
 
     :param size_constant: the hashtable size
     :param multiplication_constant: the constant for multiplication with"""
@@ -38,6 +40,11 @@ def mutlitpilcation_hashing(multiplication_constant, size_constant):
         :return: (value * constant) modulo 1 * size_constant"""
         return math.floor(((value * multiplication_constant) % 1) * size_constant)
 
+    hash_method.parameters = {
+        "method": "multiplication",
+        "constant": multiplication_constant,
+        "size": size_constant,
+    }
     return hash_method
 
 
@@ -54,7 +61,8 @@ def get_int_bits():
 
 
 def multiply_shift_hashing(multiplication_constant, shift_constant):
-    """generates a multipliy Shift method hash function
+    """generates a multipliy Shift method hash function.
+    Its constants are kept in the attribute ``parameters`` of the hash function.
 
     :param shift_constant: the hashtable size in logarithm
     :param multiplication_constant: the constant for multiplication with"""
@@ -70,6 +78,12 @@ def multiply_shift_hashing(multiplication_constant, shift_constant):
             _INT_BITS - shift_constant
         )
 
+    hash_method.parameters = {
+        "method": "multiply-shift",
+        "constant": multiplication_constant,
+        "shift": shift_constant,
+        "int_bits": _INT_BITS,
+    }
     return hash_method
 
 
@@ -101,6 +115,24 @@ class Hashing(task_base.Task):
         self.exercise_texts = [None, None]
         self.operations = None
 
+    def input_data(self):
+        """Getter for the operations on the hash table
+
+        :return: a list of dictionaries with the type and value of every operation"""
+        return [
+            {"operation": operation.type.name.lower(), "value": operation.value}
+            for operation in self.operations
+        ]
+
+    def parameters(self) -> dict:
+        """Getter for the size of the hash table and the constants of the hash function
+
+        :return: a dictionary of the parameters"""
+        return {
+            "hashtable_size": self.hashtable_size,
+            "hash_function": dict(self.hash_function.parameters),
+        }
+
     @abstractmethod
     def init_hashing_argument_parser(self, parser):
         """Method for hashing method specific argument initialization
@@ -237,10 +269,3 @@ class Hashing(task_base.Task):
         )
 
         self.parse_hashing(arg_input)
-
-
-task_base.register_category(
-    "hashing",
-    "Hashtables with hash functions",
-    "Various hashtable data structures with various hash functions",
-)
@@ -21,14 +21,7 @@ class ChainingHashing(hashing_base.Hashing):
     def __init__(self):
         """Initialized cmd and exercise text information"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="chaining",
-            description=(
-                "Exercise to apply open hashing (i.e. chaining) "
-                "on insert and delete operations into hashtables."
-            ),
-            help="Open hashing (i.e. chaining) for operations on integers.",
-        )
+        self.cmd_info = task_base.get_task_info("hashing", "chaining")
         self.exercise_texts[0] = lang.get_text("hashing", "chaining-prefix")
         self.exercise_texts[1] = lang.get_text("hashing", "chaining-postfix")
 
@@ -115,6 +108,3 @@ class ChainingHashing(hashing_base.Hashing):
             hashtable[hash_value].remove(value)
             return True
         return False
-
-
-task_base.register_task("hashing", ChainingHashing())
@@ -1,27 +1,117 @@
-"""Tasks dealing with sorting"""
-from pyalgotask.tasks.sorting import (
-    quicksort,
-    sorting_base,
-    bubble,
-    insertion,
-    selection,
-    merge,
-    heapsort,
-    countingsort,
-    radixsort,
-    bucketsort,
+"""Tasks dealing with sorting. The tasks are registered here and their modules are only
+imported once a task is requested."""
+from pyalgotask.tasks import task_base
+from pyalgotask.tasks.task_base import TaskCmd
+
+task_base.register_category(
+    "sorting",
+    "Various sorting algorithms",
+    "Various tasks involving for sorting algorithms",
 )
 
-__all__ = [
-    # tasks
-    "sorting_base",
-    "bubble",
-    "insertion",
-    "selection",
-    "merge",
-    "heapsort",
-    "quicksort",
-    "countingsort",
-    "radixsort",
-    "bucketsort",
-]
+task_base.register_task(
+    "sorting",
+    TaskCmd(
+        cmd="quick-lomuto",
+        description=(
+            "Exercise to apply quicksort "
+            "on an unsorted array using Lomuto's partition scheme."
+        ),
+        help="Quicksort on array of integers.",
+    ),
+    f"{__name__}.quicksort",
+    "QuicksortLomuto",
+)
+task_base.register_task(
+    "sorting",
+    TaskCmd(
+        cmd="quick-hoare",
+        description=(
+            "Exercise to apply quicksort "
+            "on an unsorted array with Hoares partition scheme."
+        ),
+        help="Quicksort on array of integers with Hoares partition.",
+    ),
+    f"{__name__}.quicksort",
+    "QuicksortHoare",
+)
+task_base.register_task(
+    "sorting",
+    TaskCmd(
+        cmd="bubble",
+        description="Exercise to apply bubble sort on an unsorted array.",
+        help="Bubble sort on array of integers.",
+    ),
+    f"{__name__}.bubble",
+    "Bubble",
+)
+task_base.register_task(
+    "sorting",
+    TaskCmd(
+        cmd="insertion",
+        description="Exercise to apply insertion sort on an unsorted array.",
+        help="Insertion sort on array of integers.",
+    ),
+    f"{__name__}.insertion",
+    "Insertion",
+)
+task_base.register_task(
+    "sorting",
+    TaskCmd(
+        cmd="selection",
+        description="Exercise to apply selection sort on an unsorted array.",
+        help="Selection sort on array of integers.",
+    ),
+    f"{__name__}.selection",
+    "Selection",
+)
+task_base.register_task(
+    "sorting",
+    TaskCmd(
+        cmd="merge",
+        description="Exercise to apply merge sort on an unsorted array.",
+        help="Merge sort on array of integers.",
+    ),
+    f"{__name__}.merge",
+    "Merge",
+)
+task_base.register_task(
+    "sorting",
+    TaskCmd(
+        cmd="heap",
+        description="Exercise to apply heap sort on an unsorted array.",
+        help="Heap sort on array of integers.",
+    ),
+    f"{__name__}.heapsort",
+    "Heapsort",
+)
+task_base.register_task(
+    "sorting",
+    TaskCmd(
+        cmd="counting",
+        description="Exercise to apply counting sort on an unsorted array.",
+        help="Counting sort on array of integers.",
+    ),
+    f"{__name__}.countingsort",
+    "Countingsort",
+)
+task_base.register_task(
+    "sorting",
+    TaskCmd(
+        cmd="radix",
+        description="Exercise to apply radix sort on an unsorted array of natural numbers.",
+        help="Radix sort on array of natural numbers, by digits in base 10 or --base.",
+    ),
+    f"{__name__}.radixsort",
+    "Radixsort",
+)
+task_base.register_task(
+    "sorting",
+    TaskCmd(
+        cmd="bucket",
+        description="Exercise to apply bucket sort on an unsorted array in decimal system.",
+        help="Bucket sort on array of decimal integers.",
+    ),
+    f"{__name__}.bucketsort",
+    "Bucketsort",
+)
@@ -3,6 +3,7 @@ from pyalgotask import language as lang
 
 from pyalgotask.tasks import task_base
 from pyalgotask.tasks.sorting.sorting_base import Sorting
+from pyalgotask.trace import Step, Swap
 
 
 class Bubble(Sorting):
@@ -17,11 +18,7 @@ class Bubble(Sorting):
     def __init__(self):
         """Constructor initialized cmd and exercise texts infos"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="bubble",
-            description="Exercise to apply bubble sort on an unsorted array.",
-            help="Bubble sort on array of integers.",
-        )
+        self.cmd_info = task_base.get_task_info("sorting", "bubble")
         self.exercise_texts[0] = lang.get_text("sorting", "bubble-prefix")
         self.exercise_texts[1] = lang.get_text("sorting", "bubble-postfix")
 
@@ -35,7 +32,7 @@ class Bubble(Sorting):
 
         :param arg_input: result of argparser"""
 
-    def algorithm(self):
+    def delta_algorithm(self):
         """Classic Bubblesort going from right to left
 
         :yield: one step after each swap"""
@@ -46,7 +43,4 @@ class Bubble(Sorting):
             for j in reversed(range(i + 1, length)):
                 if array[j] < array[j - 1]:
                     array[j], array[j - 1] = array[j - 1], array[j]
-                    yield (array.copy(), None)
-
-
-task_base.register_task("sorting", Bubble())
+                    yield Step((Swap(j, j - 1),), None)
@@ -46,11 +46,7 @@ class Bucketsort(Sorting):
     def __init__(self):
         """Constructor initialized cmd and exercise texts infos"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="bucket",
-            description="Exercise to apply bucket sort on an unsorted array in decimal system.",
-            help="Bucket sort on array of decimal integers.",
-        )
+        self.cmd_info = task_base.get_task_info("sorting", "bucket")
         self.exercise_texts[0] = lang.get_text("sorting", "bucket-prefix")
         self.exercise_texts[1] = lang.get_text("sorting", "bucket-postfix")
         self.task_io.parser.cast_function = str_to_zero_one
@@ -110,6 +106,3 @@ class Bucketsort(Sorting):
 
         array = [x for sublist in array_b for x in sublist]
         yield (array.copy(), None)
-
-
-task_base.register_task("sorting", Bucketsort())
@@ -1,5 +1,4 @@
 """Module for counting sort task"""
-
 from pyalgotask import language as lang
 from pyalgotask.output.array import ArrayOutput
 from pyalgotask.randomizer.array import RandomIntArray
@@ -15,40 +14,84 @@ class Countingsort(Sorting):
     :ivar cmd_info: a bundle of cmd information
     :ivar task_io: an TaskIO object containing a parser, randomizer and output
     :ivar exercise_texts: texts for the exercise explanation
-    :ivar array: the array to sort"""
+    :ivar array: the array to sort
+    :ivar mode: which values get an entry in the counting array C, see ``MODES``"""
+
+    MODES = ("dense", "offset", "sparse")
+    """The modes of the counting array C. In dense mode, C has an entry for every value from 0
+    to the maximum as in the book. In offset mode, C has an entry for every value from the
+    minimum to the maximum, such that negative values can be sorted. In sparse mode, C has an
+    entry only for the values present in the array."""
 
     def __init__(self):
         """Constructor initialized cmd and exercise texts infos"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="counting",
-            description="Exercise to apply counting sort on an unsorted array.",
-            help="Counting sort on array of integers.",
-        )
+        self.cmd_info = task_base.get_task_info("sorting", "counting")
         self.exercise_texts[0] = lang.get_text("sorting", "counting-prefix")
         self.exercise_texts[1] = lang.get_text("sorting", "counting-postfix")
         self.task_io.randomizer = RandomIntArray(0, 9)
+        self.mode = "dense"
 
     def init_sorting_argument_parser(self, parser):
-        """No additional parseres required
+        """Initializes the argument for the mode of the counting array
 
         :param parser: argparser parser"""
+        parser.add_argument(
+            "--counting-mode",
+            choices=self.MODES,
+            dest="counting_mode",
+            default="dense",
+            help=(
+                "Which values get an entry in the counting array C. dense counts every value "
+                "from 0 to the maximum, offset every value from the minimum to the maximum "
+                "and sparse only the values of the array, each labeled with its value."
+            ),
+        )
 
     def sorting_parse(self, arg_input) -> None:
-        """Checks that the input is non-negative
+        """Checks that the input is non-negative in dense mode and sizes the counting arrays
 
         :param arg_input: result from argparse"""
+        self.mode = arg_input.counting_mode
+        if self.mode == "dense" and min(self.array) < 0:
+            raise ValueError(
+                f"Input {self.array} contains negative values, "
+                "which require the offset or sparse counting mode!"
+            )
         self.task_io.output = ArrayOutput(
             self.array, self.exercise_texts[0], self.exercise_texts[1], self.algorithm
         )
-        max_int = max(self.array) + 1
+        keys = self.counting_keys()
         length = len(self.array)
+        if self.mode == "dense":
+            phantom_length = len(str(len(keys)))
+            top_labels = None
+        else:
+            phantom_length = len(str(length))
+            top_labels = [[str(key) for key in keys]] * 2 + [None]
         self.task_io.output.init_exercise_output(
-            lengths_of_arrays=[max_int, max_int, length],
-            phantom_length=len(str(max_int)),
+            lengths_of_arrays=[len(keys), len(keys), length],
+            phantom_length=phantom_length,
             left_labels=["C:", "C:", "B:"],
+            top_labels=top_labels,
         )
 
+    def counting_keys(self):
+        """Getter for the values with an entry in the counting array C in the current mode
+
+        :return: a range or a sorted list of the values"""
+        if self.mode == "dense":
+            return range(0, max(self.array) + 1)
+        if self.mode == "offset":
+            return range(min(self.array), max(self.array) + 1)
+        return sorted(set(self.array))
+
+    def parameters(self) -> dict:
+        """Getter for the mode of the counting array
+
+        :return: a dictionary of the parameters"""
+        return {"counting_mode": self.mode}
+
     def algorithm(self):
         """Countingsort that yields after the fillings of the (help) arrays
 
@@ -57,25 +100,27 @@ class Countingsort(Sorting):
         """
         array = self.array.copy()
         length = len(array)
-        max_int = max(array)
+        keys = self.counting_keys()
+        if isinstance(keys, range):
+            indices = [value - keys.start for value in array]
+        else:
+            positions = {key: i for i, key in enumerate(keys)}
+            indices = [positions[value] for value in array]
         array_b = [0] * length
-        array_c = [0] * (max_int + 1)
+        array_c = [0] * len(keys)
 
         for j in range(0, length):
-            array_c[array[j]] = array_c[array[j]] + 1
+            array_c[indices[j]] = array_c[indices[j]] + 1
 
         yield (array_c.copy(), None)
 
-        for i in range(1, max_int + 1):
+        for i in range(1, len(keys)):
             array_c[i] = array_c[i] + array_c[i - 1]
 
         yield (array_c.copy(), None)
 
         for j in reversed(range(0, length)):
-            array_b[array_c[array[j]] - 1] = array[j]
-            array_c[array[j]] = array_c[array[j]] - 1
+            array_b[array_c[indices[j]] - 1] = array[j]
+            array_c[indices[j]] = array_c[indices[j]] - 1
 
         yield (array_b.copy(), None)
-
-
-task_base.register_task("sorting", Countingsort())
@@ -5,6 +5,7 @@ from pyalgotask import language as lang
 from pyalgotask.tasks import task_base
 
 from pyalgotask.tasks.sorting.sorting_base import Sorting
+from pyalgotask.trace import Step, Swap, Write
 
 
 def _parent(index):
@@ -34,11 +35,13 @@ def _right(index):
     return 2 * (index + 1)
 
 
-def _max_heapify(array, index, length):
+def _max_heapify(array, index, length, swaps=None):
     """Makes array to a max heap starting with index
 
     :param array: the heap
-    :param index: start index"""
+    :param index: start index
+    :param length: the length of the heap
+    :param swaps: a list to append every swap to, if any"""
     largest = index
     while True:
         index = largest
@@ -55,6 +58,8 @@ def _max_heapify(array, index, length):
             break
 
         array[index], array[largest] = array[largest], array[index]
+        if swaps is not None:
+            swaps.append(Swap(index, largest))
 
 
 def _build_max_heap(array):
@@ -84,11 +89,7 @@ class Heapsort(Sorting):
     def __init__(self):
         """Constructor initialized cmd and exercise texts infos"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="heap",
-            description="Exercise to apply heap sort on an unsorted array.",
-            help="Heap sort on array of integers.",
-        )
+        self.cmd_info = task_base.get_task_info("sorting", "heap")
         self.exercise_texts[0] = lang.get_text("sorting", "heap-prefix")
         self.exercise_texts[1] = lang.get_text("sorting", "heap-postfix")
 
@@ -102,22 +103,21 @@ class Heapsort(Sorting):
 
         :param arg_input: result of argparser"""
 
-    def algorithm(self):
+    def delta_algorithm(self):
         """Heapsort yielding after building max heap and every get highest operation
 
-        :yield: array after build max heap and after every heapify, highlights the sorted part
+        :yield: the heap after build max heap and the swaps of every heapify,
+            highlights the sorted part
         """
         array = self.array.copy()
         length = len(array)
 
         _build_max_heap(array)
-        yield (array, None)
+        yield Step((Write(0, tuple(array)),), None)
         for i in reversed(range(1, length)):
             array[0], array[i] = array[i], array[0]
+            swaps = [Swap(0, i)]
             length -= 1
-            _max_heapify(array, 0, i)
-            highlight = [False] * length + [True] * (len(array) - length)
-            yield (array, highlight)
-
-
-task_base.register_task("sorting", Heapsort())
+            _max_heapify(array, 0, i, swaps)
+            highlight = range(length, len(array))
+            yield Step(tuple(swaps), highlight)
@@ -2,6 +2,7 @@
 from pyalgotask import language as lang
 from pyalgotask.tasks import task_base
 from pyalgotask.tasks.sorting.sorting_base import Sorting
+from pyalgotask.trace import Step, Write
 
 
 class Insertion(Sorting):
@@ -16,11 +17,7 @@ class Insertion(Sorting):
     def __init__(self):
         """Constructor initialized cmd and exercise texts infos"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="insertion",
-            description="Exercise to apply insertion sort on an unsorted array.",
-            help="Insertion sort on array of integers.",
-        )
+        self.cmd_info = task_base.get_task_info("sorting", "insertion")
         self.exercise_texts[0] = lang.get_text("sorting", "insertion-prefix")
         self.exercise_texts[1] = lang.get_text("sorting", "insertion-postfix")
 
@@ -34,10 +31,10 @@ class Insertion(Sorting):
 
         :param arg_input: result of argparser"""
 
-    def algorithm(self):
+    def delta_algorithm(self):
         """Insertion sort yielding after every insertion
 
-        :yield: the array after every insertion"""
+        :yield: the shifted range after every insertion"""
         array = self.array.copy()
         length = len(array)
 
@@ -48,7 +45,4 @@ class Insertion(Sorting):
                 array[j + 1] = array[j]
                 j = j - 1
             array[j + 1] = key
-            yield (array.copy(), None)
-
-
-task_base.register_task("sorting", Insertion())
+            yield Step((Write(j + 1, tuple(array[j + 1 : i + 1])),), None)
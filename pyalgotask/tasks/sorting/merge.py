@@ -5,66 +5,90 @@ from pyalgotask.tasks import task_base
 from pyalgotask import language as lang
 
 from pyalgotask.tasks.sorting.sorting_base import Sorting
+from pyalgotask.trace import Step, Write
 
 
-def _merge(array, left_index, middle_index, right_index):
-    """Merge for mergesort
+def _merge(array, aux, left_index, middle_index, right_index):
+    """Merge for mergesort, which copies the range into the auxiliary buffer and merges
+    both halves from there back into the array
 
     :param array: array to apply merge on
+    :param aux: auxiliary buffer of the same length as the array
     :param left_index: the left bound
     :param middle_index: the middle bound
     :param right_index: the right bound"""
-    length_left = middle_index - left_index + 1  # length of A[p:q]
-    length_right = right_index - middle_index  # length of A[q+1:r]
-    array_left = [0] * length_left
-    array_right = [0] * length_right
+    aux[left_index : right_index + 1] = array[left_index : right_index + 1]
+    i, j = left_index, middle_index + 1  # next entries of A[p:q] and A[q+1:r]
 
-    for i in range(0, length_left):
-        array_left[i] = array[left_index + i]
-    for j in range(0, length_right):
-        array_right[j] = array[middle_index + j + 1]
-
-    i, j, k = 0, 0, left_index
-
-    while i < length_left and j < length_right:
-        if array_left[i] <= array_right[j]:
-            array[k] = array_left[i]
+    for k in range(left_index, right_index + 1):
+        if j > right_index or (i <= middle_index and aux[i] <= aux[j]):
+            array[k] = aux[i]
             i += 1
         else:
-            array[k] = array_right[j]
+            array[k] = aux[j]
             j += 1
-        k += 1
 
-    while i < length_left:
-        array[k] = array_left[i]
-        i += 1
-        k += 1
-    while j < length_right:
-        array[k] = array_right[j]
-        j += 1
-        k += 1
+
+def _merge_step(array, aux, left_index, middle_index, right_index):
+    """Merges a range and creates its step
+
+    :param array: array to apply merge on
+    :param aux: auxiliary buffer of the same length as the array
+    :param left_index: the left bound
+    :param middle_index: the middle bound
+    :param right_index: the right bound
+    :return: the step writing the merged range with highlight on it"""
+    _merge(array, aux, left_index, middle_index, right_index)
+    highlight = range(left_index, right_index + 1)
+    merged = tuple(array[left_index : right_index + 1])
+    return Step((Write(left_index, merged),), highlight)
 
 
 def _mergesort(array, left_index, right_index):
-    """Mergesort yielding after every merge
+    """Mergesort yielding after every merge. The ranges are kept on an explicit stack
+    instead of recursing, such that the merges are yielded in the same order as by recursion.
 
     :param array: array to apply merge sort on
     :param left_index: the left index to sort
     :param right_index: the right index to sort
 
-    :yield: array after every merge"""
-    if left_index >= right_index:
-        return
-    middle_index = math.floor((left_index + right_index) / 2)
-    yield from _mergesort(array, left_index, middle_index)
-    yield from _mergesort(array, middle_index + 1, right_index)
-    _merge(array, left_index, middle_index, right_index)
-    highlight = (
-        ([False] * left_index)
-        + ([True] * (right_index - left_index + 1))
-        + ([False] * (len(array) - right_index))
-    )
-    yield (array.copy(), highlight)
+    :yield: the merged range after every merge"""
+    aux = [None] * len(array)
+    # a range is pushed again as divided after its halves, which are thus merged before
+    stack = [(left_index, right_index, False)]
+    while stack:
+        left_index, right_index, divided = stack.pop()
+        if left_index >= right_index:
+            continue
+        middle_index = math.floor((left_index + right_index) / 2)
+        if divided:
+            yield _merge_step(array, aux, left_index, middle_index, right_index)
+        else:
+            stack.append((left_index, right_index, True))
+            stack.append((middle_index + 1, right_index, False))
+            stack.append((left_index, middle_index, False))
+
+
+def _mergesort_bottom_up(array, left_index, right_index):
+    """Bottom-up mergesort yielding after every merge, which merges neighboured runs of
+    doubling width from left to right, i.e. level by level
+
+    :param array: array to apply merge sort on
+    :param left_index: the left index to sort
+    :param right_index: the right index to sort
+
+    :yield: the merged range after every merge"""
+    aux = [None] * len(array)
+    width = 1
+    while width <= right_index - left_index:
+        for start in range(left_index, right_index - width + 1, 2 * width):
+            end = min(start + 2 * width - 1, right_index)
+            yield _merge_step(array, aux, start, start + width - 1, end)
+        width *= 2
+
+
+MERGE_ORDERS = {"top-down": _mergesort, "bottom-up": _mergesort_bottom_up}
+"""The available orders of the merges"""
 
 
 class Merge(Sorting):
@@ -74,37 +98,53 @@ class Merge(Sorting):
     :ivar cmd_info: a bundle of cmd information
     :ivar task_io: an TaskIO object containing a parser, randomizer and output
     :ivar exercise_texts: texts for the exercise explanation
-    :ivar array: the array to sort"""
+    :ivar array: the array to sort
+    :ivar merge_order: the order of the merges, see ``MERGE_ORDERS``"""
 
     def __init__(self):
         """Constructor initialized cmd and exercise texts infos"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="merge",
-            description="Exercise to apply merge sort on an unsorted array.",
-            help="Merge sort on array of integers.",
-        )
+        self.cmd_info = task_base.get_task_info("sorting", "merge")
         self.exercise_texts[0] = lang.get_text("sorting", "merge-prefix")
         self.exercise_texts[1] = lang.get_text("sorting", "merge-postfix")
+        self.merge_order = "top-down"
 
     def init_sorting_argument_parser(self, parser):
-        """No additional parseres required
+        """Initializes the argument for the order of the merges
 
         :param parser: argparser parser"""
+        parser.add_argument(
+            "--merge-order",
+            choices=list(MERGE_ORDERS),
+            dest="merge_order",
+            default="top-down",
+            help=(
+                "The order of the merges. top-down divides the array recursively in halves, "
+                "bottom-up merges neighboured subarrays of length 1, 2, 4, ... level by level."
+            ),
+        )
 
     def sorting_parse(self, arg_input) -> None:
-        """No additional parsers required
+        """Reads the order of the merges and names the bottom-up order in the exercise
 
         :param arg_input: result of argparser"""
+        self.merge_order = arg_input.merge_order
+        if self.merge_order == "bottom-up":
+            self.task_io.output.task_info.postfix += lang.get_text(
+                "sorting", "merge-bottom-up"
+            )
+
+    def parameters(self) -> dict:
+        """Getter for the order of the merges
+
+        :return: a dictionary of the parameters"""
+        return {"merge_order": self.merge_order}
 
-    def algorithm(self):
+    def delta_algorithm(self):
         """Mergesort yielding after every merge
 
-        :yield: array after merge"""
+        :yield: the merged range after every merge"""
         array = self.array.copy()
         length = len(array)
 
-        yield from _mergesort(array, 0, length - 1)
-
-
-task_base.register_task("sorting", Merge())
+        yield from MERGE_ORDERS[self.merge_order](array, 0, length - 1)
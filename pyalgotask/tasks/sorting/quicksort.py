@@ -1,30 +1,88 @@
 """Module for quick sort tasks"""
+from random import Random
+
 from pyalgotask import language as lang
 from pyalgotask.tasks import task_base
 
 from pyalgotask.tasks.sorting.sorting_base import Sorting
+from pyalgotask.trace import Step, Write
+
+
+def _pivot_last(array, left_index, right_index):  # pylint: disable=unused-argument
+    """Pivot strategy keeping the last entry of the subarray as pivot
+
+    :param array: the array to sort
+    :param left_index: left index of the subarray
+    :param right_index: right index of the subarray"""
+
+
+def _pivot_median3(array, left_index, right_index):
+    """Pivot strategy moving the median of the first, middle and last entry of the subarray
+    to its end
+
+    :param array: the array to sort
+    :param left_index: left index of the subarray
+    :param right_index: right index of the subarray"""
+    middle_index = (left_index + right_index) // 2
+    median_index = sorted(
+        (left_index, middle_index, right_index), key=lambda index: array[index]
+    )[1]
+    array[median_index], array[right_index] = array[right_index], array[median_index]
+
+
+def _pivot_random(random: Random):
+    """Creates a pivot strategy moving a random entry of the subarray to its end
+
+    :param random: the random number generator choosing the pivots
+    :return: the pivot strategy"""
+
+    def pivot_random(array, left_index, right_index):
+        """Pivot strategy moving a random entry of the subarray to its end
+
+        :param array: the array to sort
+        :param left_index: left index of the subarray
+        :param right_index: right index of the subarray"""
+        random_index = random.randint(left_index, right_index)
+        array[random_index], array[right_index] = (
+            array[right_index],
+            array[random_index],
+        )
+
+    return pivot_random
+
+
+PIVOTS = ("last", "median3", "random")
+"""The available pivot strategies. Every strategy moves its pivot to the end of the subarray,
+where both partition schemes expect it."""
 
 
-def _quicksort(array, left_index, right_index, partition_scheme):
-    """Quicksort yielding after ever partition
+def _quicksort(array, left_index, right_index, partition_scheme, pivot=_pivot_last):
+    """Quicksort yielding after ever partition. The subarrays left to sort are kept on an
+    explicit stack instead of recursing, such that the steps are yielded in the same order as
+    by recursion but without nesting a generator per level.
 
     :param array: the array to sort
     :param left_index: left index to sort
     :param right_index: right_index to sort
     :param partition_scheme: the partition scheme to be used
-    :yield: array after every partition with highlight on the sorted parted"""
-    length = len(array)
-    if left_index < right_index:
+    :param pivot: the pivot strategy moving the pivot to the end of a subarray
+    :yield: the partitioned range after every partition with highlight on it"""
+    stack = [(left_index, right_index)] if left_index < right_index else []
+    while stack:
+        left_index, right_index = stack.pop()
+        pivot(array, left_index, right_index)
         pivot_index = partition_scheme(array, left_index, right_index)
-        highlight = (
-            [False] * left_index
-            + [True] * (right_index - left_index + 1)
-            + [False] * (length - right_index - 1)
-        )
-        yield (array.copy(), highlight)
+        highlight = range(left_index, right_index + 1)
+        partitioned = tuple(array[left_index : right_index + 1])
+        yield Step((Write(left_index, partitioned),), highlight)
 
-        yield from _quicksort(array, left_index, pivot_index - 1, partition_scheme)
-        yield from _quicksort(array, pivot_index + 1, right_index, partition_scheme)
+        # the left subarray is pushed last, such that it is sorted first
+        for subarray in (
+            (pivot_index + 1, right_index),
+            (left_index, pivot_index - 1),
+        ):
+            if subarray[0] < subarray[1]:
+                stack.append(subarray)
 
 
 class Quicksort(Sorting):
@@ -35,7 +93,11 @@ class Quicksort(Sorting):
     :ivar task_io: an TaskIO object containing a parser, randomizer and output
     :ivar exercise_texts: texts for the exercise explanation
     :ivar array: the array to sort
-    :ivar partition_scheme: the partition scheme to use"""
+    :ivar partition_scheme: the partition scheme to use
+    :ivar pivot: the name of the pivot strategy, see ``PIVOTS``
+    :ivar pivot_seed: the seed of the random pivot strategy
+    :ivar pivots: the values of the pivots in the order they were chosen by the algorithm
+    """
 
     def __init__(self):
         """Constructor initialized cmd and exercise texts infos"""
@@ -44,25 +106,90 @@ class Quicksort(Sorting):
         self.exercise_texts[0] = lang.get_text("sorting", "quick-prefix")
         self.exercise_texts[1] = lang.get_text("sorting", "quick-postfix")
         self.partition_scheme = None
+        self.pivot = "last"
+        self.pivot_seed = None
+        self.pivots = []
 
     def init_sorting_argument_parser(self, parser):
-        """No additional parseres required
+        """Initializes the arguments for the pivot strategy
 
         :param parser: argparser parser"""
+        parser.add_argument(
+            "--pivot",
+            choices=PIVOTS,
+            dest="pivot",
+            default="last",
+            help=(
+                "The pivot of every subarray. last uses its last entry, median3 the median of "
+                "its first, middle and last entry and random a random entry."
+            ),
+        )
+        parser.add_argument(
+            "--pivot-seed",
+            type=int,
+            dest="pivot_seed",
+            metavar="SEED",
+            help="The seed of the random pivots, drawn by the randomizer if not given.",
+        )
 
     def sorting_parse(self, arg_input) -> None:
-        """No additional parsers required
+        """Reads the pivot strategy and names it in the exercise. The random pivots
+        are listed in the order they are chosen, once the algorithm has run.
 
         :param arg_input: result of argparser"""
+        self.pivot = arg_input.pivot
+        self.pivot_seed = None
+        if self.pivot == "median3":
+            self.task_io.output.task_info.postfix += lang.get_text(
+                "sorting", "quick-pivot-median3"
+            )
+        elif self.pivot == "random":
+            self.pivot_seed = arg_input.pivot_seed
+            if self.pivot_seed is None:
+                self.pivot_seed = self.task_io.randomizer.random.getrandbits(32)
+            self.task_io.output.task_info.trace_postfix = self.random_pivots_text
+
+    def parameters(self) -> dict:
+        """Getter for the pivot strategy
+
+        :return: a dictionary of the parameters"""
+        return {"pivot": self.pivot, "pivot_seed": self.pivot_seed}
+
+    def pivot_strategy(self):
+        """Creates the pivot strategy, where random pivots always start from the pivot seed
+
+        :return: the pivot strategy"""
+        if self.pivot == "median3":
+            return _pivot_median3
+        if self.pivot == "random":
+            return _pivot_random(Random(self.pivot_seed))
+        return _pivot_last
+
+    def random_pivots_text(self) -> str:
+        """Creates the text listing the pivots chosen by the algorithm
+
+        :return: the text appended to the exercise"""
+        return lang.get_text("sorting", "quick-pivot-random").format(
+            ", ".join(str(value) for value in self.pivots)
+        )
 
-    def algorithm(self):
-        """Quicksort with genertic partition scheme that yields after every partition
+    def delta_algorithm(self):
+        """Quicksort with genertic partition scheme that yields after every partition.
+        The chosen pivots are recorded in ``pivots`` meanwhile.
 
-        :yield: array after every partition"""
+        :yield: the partitioned range after every partition"""
         array = self.array.copy()
         length = len(array)
+        pivot_strategy = self.pivot_strategy()
+        self.pivots = []
+
+        def recorded_pivot(array, left_index, right_index):
+            pivot_strategy(array, left_index, right_index)
+            self.pivots.append(array[right_index])
 
-        yield from _quicksort(array, 0, length - 1, self.partition_scheme)
+        yield from _quicksort(
+            array, 0, length - 1, self.partition_scheme, recorded_pivot
+        )
 
 
 def _partition_hoare(array, left_index, right_index):
@@ -103,14 +230,7 @@ class QuicksortHoare(Quicksort):
     def __init__(self):
         """Constructor initialized cmd and the partition scheme"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="quick-hoare",
-            description=(
-                "Exercise to apply quicksort "
-                "on an unsorted array with Hoares partition scheme."
-            ),
-            help="Quicksort on array of integers with Hoares partition.",
-        )
+        self.cmd_info = task_base.get_task_info("sorting", "quick-hoare")
         self.partition_scheme = _partition_hoare
 
 
@@ -144,16 +264,5 @@ class QuicksortLomuto(Quicksort):
     def __init__(self):
         """Constructor initialized cmd and the partition scheme"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="quick-lomuto",
-            description=(
-                "Exercise to apply quicksort "
-                "on an unsorted array using Lomuto's partition scheme."
-            ),
-            help="Quicksort on array of integers.",
-        )
+        self.cmd_info = task_base.get_task_info("sorting", "quick-lomuto")
         self.partition_scheme = _partition_lomuto
-
-
-task_base.register_task("sorting", QuicksortLomuto())
-task_base.register_task("sorting", QuicksortHoare())
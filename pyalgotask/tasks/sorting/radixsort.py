@@ -1,6 +1,4 @@
 """Module for radix sort task"""
-import math
-
 from pyalgotask.tasks import task_base
 from pyalgotask import language as lang
 
@@ -15,31 +13,47 @@ def str_to_nat(value: str) -> int:
     return i
 
 
-def _digit(value, position):
-    """Calculates the digit at position in base 10
+def str_to_base(value: str) -> int:
+    """Function to cast strings to the base of digits"""
+    base = int(value)
+    if base < 2:
+        raise ValueError(f"The base needs to be at least 2, but is {value}")
+    return base
+
 
-    :param value: value for which the digit is calculated
-    :param position: position of the digit
-    :return: the digit of value at position"""
-    return math.floor(value / 10**position) % 10
+def _num_of_digits(value, base=10):
+    """Calculates the number of digits of a value, where 0 has one digit
 
+    :param value: the natural number
+    :param base: the base of the digits
+    :return: the number of digits of value"""
+    num_of_digits = 1
+    while value >= base:
+        value //= base
+        num_of_digits += 1
+    return num_of_digits
 
-def _stable_sort(array, position, max_value):
-    """An easy stable sort sorting in linear time when elements are finite
-    by copying all values in a new array
+
+def _stable_sort(array, position, base=10):
+    """Counting sort on the digit at position, which is stable and takes O(n + base) steps
 
     :param array: array to sort
     :param position: digit position to sort
-    :param max_value: the max_value any digit can have
-    :return: array sorted according to position"""
-    array_b = [0] * len(array)
+    :param base: the base of the digits
+    :return: a new array sorted according to position"""
+    divisor = base**position
+    digits = [value // divisor % base for value in array]
 
-    index_b = 0
-    for digit in range(max_value + 1):
-        for value in array:
-            if _digit(value, position) == digit:
-                array_b[index_b] = value
-                index_b += 1
+    counts = [0] * base
+    for digit in digits:
+        counts[digit] += 1
+    for digit in range(1, base):
+        counts[digit] += counts[digit - 1]
+
+    array_b = [0] * len(array)
+    for index in range(len(array) - 1, -1, -1):
+        counts[digits[index]] -= 1
+        array_b[counts[digits[index]]] = array[index]
     return array_b
 
 
@@ -51,42 +65,53 @@ class Radixsort(Sorting):
     :ivar task_io: an TaskIO object containing a parser, randomizer and output
     :ivar exercise_texts: texts for the exercise explanation
     :ivar array: the array to sort
+    :ivar base: the base of the digits
     """
 
     def __init__(self):
         """Constructor initialized cmd and exercise texts infos"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="radix",
-            description="Exercise to apply radix sort on an unsorted array in decimal system.",
-            help="Radix sort on array of decimal integers.",
-        )
+        self.cmd_info = task_base.get_task_info("sorting", "radix")
         self.exercise_texts[0] = lang.get_text("sorting", "radix-prefix")
         self.exercise_texts[1] = lang.get_text("sorting", "radix-postfix")
         self.task_io.parser.cast_function = str_to_nat
+        self.base = 10
 
     def init_sorting_argument_parser(self, parser):
-        """No additional parseres required
+        """Initializes the argument for the base of the digits
 
         :param parser: argparser parser"""
+        parser.add_argument(
+            "--base",
+            type=str_to_base,
+            dest="radix_base",
+            default=10,
+            metavar="BASE",
+            help="The base of the digits to sort by, e.g. 10, 16 or another power of 2.",
+        )
 
     def sorting_parse(self, arg_input) -> None:
-        """No additional parsers required
+        """Reads the base of the digits and names it in the exercise if it is not 10
 
         :param arg_input: result of argparser"""
+        self.base = arg_input.radix_base
+        if self.base != 10:
+            self.task_io.output.task_info.postfix += lang.get_text(
+                "sorting", "radix-base"
+            ).format(self.base)
 
-    def algorithm(self):
-        """Radixsort yielding after every sorted digit
-
-        :yield: array after ever sorted digit"""
-        array = self.array.copy()
-        max_value = max(array)
+    def parameters(self) -> dict:
+        """Getter for the base of the digits
 
-        num_of_digits = math.ceil(math.log(max_value, 10))
-
-        for i in range(num_of_digits):
-            array = _stable_sort(array, i, max_value)
-            yield (array.copy(), None)
+        :return: a dictionary of the parameters"""
+        return {"base": self.base}
 
+    def algorithm(self):
+        """Radixsort yielding after every sorted digit, where every digit is sorted by
+        counting sort
 
-task_base.register_task("sorting", Radixsort())
+        :yield: array after ever sorted digit"""
+        array = self.array
+        for i in range(_num_of_digits(max(array), self.base)):
+            array = _stable_sort(array, i, self.base)
+            yield (array, None)
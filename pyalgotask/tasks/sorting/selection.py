@@ -2,6 +2,7 @@
 from pyalgotask import language as lang
 from pyalgotask.tasks import task_base
 from pyalgotask.tasks.sorting.sorting_base import Sorting
+from pyalgotask.trace import Step, Swap
 
 
 class Selection(Sorting):
@@ -16,11 +17,7 @@ class Selection(Sorting):
     def __init__(self):
         """Constructor initialized cmd and exercise texts infos"""
         super().__init__()
-        self.cmd_info = task_base.TaskCmd(
-            cmd="selection",
-            description="Exercise to apply selection sort on an unsorted array.",
-            help="Selection sort on array of integers.",
-        )
+        self.cmd_info = task_base.get_task_info("sorting", "selection")
         self.exercise_texts[0] = lang.get_text("sorting", "selection-prefix")
         self.exercise_texts[1] = lang.get_text("sorting", "selection-postfix")
 
@@ -34,10 +31,10 @@ class Selection(Sorting):
 
         :param arg_input: result of argparser"""
 
-    def algorithm(self):
+    def delta_algorithm(self):
         """Selection sort yielding after every swap
 
-        :yield: array after each swap"""
+        :yield: the swap of every step"""
         array = self.array.copy()
         length = len(array)
 
@@ -47,7 +44,4 @@ class Selection(Sorting):
                 if array[max_value] <= array[i]:
                     max_value = i
             array[j], array[max_value] = array[max_value], array[j]
-            yield (array.copy(), None)
-
-
-task_base.register_task("sorting", Selection())
+            yield Step((Swap(j, max_value),), None)
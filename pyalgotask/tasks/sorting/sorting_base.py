@@ -6,6 +6,7 @@ from pyalgotask.tasks import task_base
 from pyalgotask.input.array import ArrayInput
 from pyalgotask.randomizer.array import RandomIntArray
 from pyalgotask.output.array import AlgorithmArrayOutput
+from pyalgotask.trace import replay
 
 
 class Sorting(task_base.Task):
@@ -17,6 +18,10 @@ class Sorting(task_base.Task):
     :ivar exercise_texts: texts for the exercise explanation
     :ivar array: the array to sort"""
 
+    delta_algorithm = None
+    """The algorithm as generator of ``Step`` deltas to ``array``, if the task describes its
+    steps as deltas. Otherwise, the task overrides ``algorithm``."""
+
     def __init__(self):
         super().__init__()
         self.task_io = task_base.TaskIO(
@@ -75,22 +80,27 @@ class Sorting(task_base.Task):
             self.task_io.randomized = True
             self.array = self.task_io.randomizer.get_random_input()
         self.task_io.output = AlgorithmArrayOutput(
-            self.array, self.exercise_texts[0], self.exercise_texts[1], self.algorithm
+            self.array,
+            self.exercise_texts[0],
+            self.exercise_texts[1],
+            self.algorithm,
+            delta_algorithm=self.delta_algorithm,
         )
         self.task_io.output.init_exercise_algorithm_output(
             num_of_additional_arrays=arg_input.num_add_lines
         )
         self.sorting_parse(arg_input)
 
-    @abstractmethod
-    def algorithm(self):
-        """The algorithm for which this generator is generating exercises
+    def input_data(self):
+        """Getter for the array to sort
 
-        :yield: intermediate steps"""
+        :return: a copy of the array"""
+        return list(self.array)
 
+    def algorithm(self):
+        """The algorithm for which this generator is generating exercises.
+        By default, the deltas of ``delta_algorithm`` are replayed.
 
-task_base.register_category(
-    "sorting",
-    "Various sorting algorithms",
-    "Various tasks involving for sorting algorithms",
-)
+        :yield: intermediate steps"""
+        # pylint: disable-next=not-callable
+        yield from replay(self.array, self.delta_algorithm())
@@ -1,11 +1,19 @@
-"""Module containing the base class called Task and 
-the functionality to allow tasks register themself to the main method"""
+"""Module containing the base class called Task and
+the functionality to allow tasks register themself to the main method.
+Tasks are registered by their cmd information and the module implementing them,
+which is only imported once the task is requested."""
+from __future__ import annotations
+
 import dataclasses
+import importlib
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
-from pyalgotask.input.input_base import Input
-from pyalgotask.randomizer.randomizer_base import Randomizer
-from pyalgotask.output.output_base import Output
+if TYPE_CHECKING:
+    # only used in annotations, such that the registry does not import pylatex
+    from pyalgotask.input.input_base import Input
+    from pyalgotask.randomizer.randomizer_base import Randomizer
+    from pyalgotask.output.output_base import Output
 
 
 @dataclasses.dataclass
@@ -68,6 +76,35 @@ class Task(ABC):
 
         :yield: intermediate steps of the algorithm"""
 
+    def input_data(self):
+        """Getter for the parsed or randomized input of the task in a JSON compatible form,
+        e.g. for exporting traces. Only valid after parsing.
+
+        :return: the input of the task, None by default"""
+        return None
+
+    def parameters(self) -> dict:
+        """Getter for the parameters of the task besides its input in a JSON compatible form,
+        e.g. its hash functions and constants. Only valid after parsing.
+
+        :return: a dictionary of the parameters, which is empty by default"""
+        return {}
+
+
+@dataclasses.dataclass
+class TaskEntry:
+    """Dataclass to bundle the registration of a task
+
+    :ivar cmd_info: the cmd information of the task
+    :ivar module: the name of the module implementing the task
+    :ivar class_name: the name of the task class in this module
+    :ivar instance: the shared task object, once it was requested"""
+
+    cmd_info: TaskCmd
+    module: str
+    class_name: str
+    instance: Task = None
+
 
 __tasks_dict = {}
 """Dictionary for registrations of all tasks"""
@@ -89,23 +126,69 @@ def register_category(category: str, description: str, cmd_help: str):
     __tasks_dict[category] = {}
 
 
-def register_task(category: str, task: Task):
-    """Method to register a task
+def register_task(category: str, cmd_info: TaskCmd, module: str, class_name: str):
+    """Method to register a task without importing it
 
     :param category: the cmd name of the category
-    :param task: the cmd name of the task"""
-    __tasks_dict[category][task.cmd_info.cmd] = task
+    :param cmd_info: the cmd information of the task
+    :param module: the name of the module implementing the task
+    :param class_name: the name of the task class in this module"""
+    __tasks_dict[category][cmd_info.cmd] = TaskEntry(cmd_info, module, class_name)
 
 
-def get_task_by_cmd(category: str, cmd: str) -> Task:
+def _get_entry(category: str, cmd: str) -> TaskEntry:
     """Method to look into the task registry
 
     :param category: the cmd name of the category
     :param cmd: the cmd name of the task
-    :return: the task corresponding to this combination"""
+    :return: the registration of this combination
+    :raise ValueError: if no such task is registered"""
+    if category not in __tasks_dict or cmd not in __tasks_dict[category]:
+        raise ValueError(f"Unknown task {cmd} in category {category}")
     return __tasks_dict[category][cmd]
 
 
+def _get_task_class(entry: TaskEntry) -> type:
+    """Method to import the class of a registered task
+
+    :param entry: the registration of the task
+    :return: the task class"""
+    return getattr(importlib.import_module(entry.module), entry.class_name)
+
+
+def get_task_info(category: str, cmd: str) -> TaskCmd:
+    """Method to get the cmd information of a task without importing it
+
+    :param category: the cmd name of the category
+    :param cmd: the cmd name of the task
+    :return: the cmd information of this combination"""
+    return _get_entry(category, cmd).cmd_info
+
+
+def get_task_by_cmd(category: str, cmd: str) -> Task:
+    """Method to get the shared task object, importing its module on first use
+
+    :param category: the cmd name of the category
+    :param cmd: the cmd name of the task
+    :return: the task corresponding to this combination"""
+    entry = _get_entry(category, cmd)
+    if entry.instance is None:
+        entry.instance = _get_task_class(entry)()
+    return entry.instance
+
+
+def create_task(category: str, cmd: str) -> Task:
+    """Method to create a fresh instance of a registered task.
+    Tasks keep state after parsing, thus every generation in the same process
+    should use its own instance.
+
+    :param category: the cmd name of the category
+    :param cmd: the cmd name of the task
+    :return: a new task object corresponding to this combination
+    :raise ValueError: if no such task is registered"""
+    return _get_task_class(_get_entry(category, cmd))()
+
+
 def get_category_info(category: str):
     """
     Method to get the cmd information for a category
@@ -124,10 +207,10 @@ def category_iterator():
 
 
 def task_iterator(category: str):
-    """Method to iterate over all tasks of one category
+    """Method to iterate over the cmd information of all tasks of one category
 
-    :return: an iterator for all tasks fron this category"""
-    return iter(__tasks_dict[category].values())
+    :return: an iterator for the cmd information of all tasks fron this category"""
+    return (entry.cmd_info for entry in __tasks_dict[category].values())
 
 
 register_category(
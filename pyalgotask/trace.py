@@ -0,0 +1,252 @@
+"""Module for recording the steps of an algorithm, such that the algorithm of a task runs only
+once for its exercise and its solution.
+
+Highlights of a step are either None, a list of booleans per index, a ``range`` of highlighted
+indices, a tuple of such ranges or an integer used as bitset, where bit ``i`` highlights index
+``i``. Ranges and bitsets avoid allocating a list per step and are resolved by ``is_highlighted``.
+
+A ``StreamedTrace`` keeps only the lengths of the arrays and reruns the algorithm for every
+further iteration, such that a streamed solution holds one step in memory at a time.
+
+Algorithms modifying one array may describe their steps as deltas to the previous step instead
+of yielding a copy of the array, e.g. a swap of two entries. Such a ``DeltaTrace`` records only
+the initial array and the deltas, and materializes the arrays of the steps while it is replayed.
+"""
+from collections import namedtuple
+
+
+class Trace:
+    """Recorded steps of an algorithm generator. The steps are recorded while the trace is
+    iterated for the first time, such that the algorithm runs at most once and only as far as
+    requested. Every further iteration replays the recorded steps.
+
+    :ivar steps: the steps recorded so far, usually tuples of an array and its highlights
+    :ivar lengths: the lengths of the arrays of the recorded steps"""
+
+    def __init__(self, algorithm):
+        """
+        Constructor of a trace, which does not start the algorithm yet
+
+        :param algorithm: the algorithm generator function, which yields snapshots
+            not modified afterwards
+        """
+        self.steps = []
+        self.lengths = []
+        self._generator = algorithm()
+
+    def _record_next(self) -> bool:
+        """
+        Records the next step of the algorithm
+
+        :return: whether a step was recorded
+        """
+        if self._generator is None:
+            return False
+        try:
+            step = next(self._generator)
+        except StopIteration:
+            self._generator = None
+            return False
+        self._record(step)
+        return True
+
+    def _record(self, step):
+        """
+        Records one step
+
+        :param step: the step yielded by the algorithm
+        """
+        self.steps.append(step)
+        self.lengths.append(len(step[0]))
+
+    def __iter__(self):
+        """
+        Iterates over the recorded steps and records the further steps meanwhile
+
+        :yield: every step of the algorithm
+        """
+        index = 0
+        while index < len(self.steps) or self._record_next():
+            yield self.steps[index]
+            index += 1
+
+    def record(self) -> "Trace":
+        """
+        Runs the algorithm to its end and records every step
+
+        :return: the trace itself
+        """
+        while self._record_next():
+            pass
+        return self
+
+    def __len__(self) -> int:
+        """
+        Records every step
+
+        :return: the number of steps
+        """
+        return len(self.record().lengths)
+
+    @property
+    def max_length(self) -> int:
+        """
+        Records every step
+
+        :return: the maximal length of the arrays of the steps, 0 if there are none
+        """
+        return max(self.record().lengths, default=0)
+
+
+class StreamedTrace(Trace):
+    """Trace of an algorithm generator, which yields the steps without keeping them and records
+    only the lengths of their arrays. The first iteration records the lengths, every further
+    iteration reruns the algorithm, which therefore needs to be deterministic.
+
+    :ivar steps: always empty, as no step is kept
+    :ivar lengths: the lengths of the arrays of the recorded steps"""
+
+    def __init__(self, algorithm):
+        """
+        Constructor of a trace, which does not start the algorithm yet
+
+        :param algorithm: the algorithm generator function
+        """
+        super().__init__(algorithm)
+        self._algorithm = algorithm
+
+    def _record(self, step):
+        self.lengths.append(len(step[0]))
+
+    def __iter__(self):
+        """
+        Iterates over the steps of the first run while recording their lengths, or over the
+        steps of a new run if the first run was already started
+
+        :yield: every step of the algorithm
+        """
+        if self._generator is None or self.lengths:
+            yield from self._algorithm()
+            return
+        for step in self._generator:
+            self._record(step)
+            yield step
+        self._generator = None
+
+
+def is_highlighted(highlights, index: int) -> bool:
+    """
+    Resolves whether an index is highlighted
+
+    :param highlights: the highlights of a step in any supported encoding
+    :param index: the index of the entry
+    :return: whether the entry at index is highlighted
+    """
+    if not highlights:
+        return False
+    if isinstance(highlights, range):
+        return index in highlights
+    if isinstance(highlights, int):
+        return bool(highlights >> index & 1)
+    if isinstance(highlights[0], range):
+        return any(index in highlight for highlight in highlights)
+    return index < len(highlights) and bool(highlights[index])
+
+
+class Swap(namedtuple("Swap", ["first", "second"])):
+    """
+    Delta swapping two entries of an array
+
+    :ivar first: the index of the first entry
+    :ivar second: the index of the second entry
+    """
+
+    __slots__ = ()
+
+    def apply(self, array):
+        """
+        Applies the delta
+
+        :param array: the array to modify
+        """
+        array[self.first], array[self.second] = array[self.second], array[self.first]
+
+
+class Write(namedtuple("Write", ["start", "values"])):
+    """
+    Delta overwriting consecutive entries of an array
+
+    :ivar start: the index of the first overwritten entry
+    :ivar values: the new values, usually a tuple
+    """
+
+    __slots__ = ()
+
+    def apply(self, array):
+        """
+        Applies the delta
+
+        :param array: the array to modify
+        """
+        array[self.start : self.start + len(self.values)] = self.values
+
+
+class Step(namedtuple("Step", ["deltas", "highlights"])):
+    """
+    One step of an algorithm given as deltas to the array of the previous step
+
+    :ivar deltas: the deltas applied in order, e.g. ``Swap`` or ``Write``
+    :ivar highlights: the highlights of the array after this step, which may be None
+    """
+
+    __slots__ = ()
+
+
+def replay(initial, steps):
+    """
+    Adapter materializing the array of every step, such that deltas can be consumed
+    like an algorithm yielding copies of its array
+
+    :param initial: the array before the first step, which is not modified
+    :param steps: the steps of the algorithm
+    :yield: a tuple of a new array and the highlights after every step
+    """
+    array = list(initial)
+    for step in steps:
+        for delta in step.deltas:
+            delta.apply(array)
+        yield (array.copy(), step.highlights)
+
+
+class DeltaTrace(Trace):
+    """Trace of an algorithm yielding ``Step`` deltas. Only the deltas are recorded,
+    the arrays of the steps are materialized while the trace is iterated.
+
+    :ivar initial: the array before the first step
+    :ivar steps: the deltas recorded so far
+    :ivar lengths: the lengths of the arrays of the recorded steps"""
+
+    def __init__(self, initial, delta_algorithm):
+        """
+        Constructor of a trace, which does not start the algorithm yet
+
+        :param initial: the array before the first step, which is copied
+        :param delta_algorithm: the algorithm generator function, which yields ``Step`` deltas
+        """
+        super().__init__(delta_algorithm)
+        self.initial = list(initial)
+        self._array = list(initial)
+
+    def _record(self, step):
+        for delta in step.deltas:
+            delta.apply(self._array)
+        self.steps.append(step)
+        self.lengths.append(len(self._array))
+
+    def __iter__(self):
+        """
+        Replays the recorded steps and records the further steps meanwhile
+
+        :yield: a tuple of a new array and the highlights after every step
+        """
+        yield from replay(self.initial, super().__iter__())
@@ -0,0 +1,262 @@
+"""Module for testing the batch mode"""
+import json
+from xml.etree import ElementTree
+import pytest
+import mock
+
+import pyalgotask.main as pyAlgoTask
+from pyalgotask import batch, moodle
+
+
+def write_manifest(path, jobs, defaults=None):
+    """Writes a JSON manifest with the given jobs"""
+    manifest = {"jobs": jobs}
+    if defaults:
+        manifest["defaults"] = defaults
+    path.write_text(json.dumps(manifest), encoding="UTF-8")
+    return path
+
+
+class TestBatch:
+    """Class for testing the batch generation"""
+
+    @pytest.mark.timeout(10)
+    def test_failing_job_does_not_abort(self, tmp_path):
+        """tests that every valid job is written even if another job fails"""
+        manifest = write_manifest(
+            tmp_path / "manifest.json",
+            [
+                {
+                    "task": "bubble",
+                    "input": [3, 1, 2],
+                    "exercise": str(tmp_path / "e1"),
+                },
+                {"task": "bubble", "input": "a,b", "exercise": str(tmp_path / "e2")},
+                {"task": "unknown", "exercise": str(tmp_path / "e3")},
+                {"task": "merge", "seed": 3, "solution": str(tmp_path / "s4")},
+            ],
+            defaults={"category": "sorting"},
+        )
+        with mock.patch("sys.argv", ["pyAlgoTask", "batch", str(manifest)]):
+            with pytest.raises(SystemExit) as pytest_exit:
+                pyAlgoTask.main()
+        assert pytest_exit.value.code == 1
+        assert (tmp_path / "e1.tex").exists()
+        assert not (tmp_path / "e2.tex").exists()
+        assert not (tmp_path / "e3.tex").exists()
+        assert (tmp_path / "s4.tex").exists()
+
+    @pytest.mark.timeout(10)
+    def test_seed_is_reproducible(self, tmp_path):
+        """tests that jobs with the same seed generate the same files"""
+        jobs = [
+            batch.Job(
+                name=str(i),
+                category="hashing",
+                task="quadraticprobing",
+                seed=42,
+                arguments=["--div", "8"],
+                solution=str(tmp_path / f"solution{i}"),
+            )
+            for i in range(2)
+        ]
+        results = batch.run_batch(jobs)
+        assert all(result.success for result in results), results
+        assert (tmp_path / "solution0.tex").read_text() == (
+            tmp_path / "solution1.tex"
+        ).read_text()
+
+    @pytest.mark.timeout(10)
+    def test_trace_of_job(self, tmp_path):
+        """tests that a job writes its input, parameters and steps as JSON Lines"""
+        job = batch.Job(
+            name="0",
+            category="hashing",
+            task="doublehashing",
+            input="+3,+14,-3",
+            seed=7,
+            arguments=["--div", "11", "--div2", "7"],
+            trace=str(tmp_path / "trace"),
+        )
+        results = batch.run_batch([job])
+        assert all(result.success for result in results), results
+        lines = (tmp_path / "trace.jsonl").read_text(encoding="UTF-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        assert records[0] == {
+            "record": "task",
+            "category": "hashing",
+            "task": "doublehashing",
+            "seed": 7,
+            "randomized": False,
+            "input": [
+                {"operation": "insert", "value": 3},
+                {"operation": "insert", "value": 14},
+                {"operation": "delete", "value": 3},
+            ],
+            "parameters": {
+                "hashtable_size": 11,
+                "hash_function": {"method": "division", "size": 11},
+                "hash_function_2": {"method": "division", "size": 7},
+            },
+        }
+        assert records[1:] == [
+            {
+                "record": "step",
+                "step": 0,
+                "array": ["", "", "", "DEL", 14, "", "", "", "", "", ""],
+                "highlights": None,
+            }
+        ]
+        assert not list(tmp_path.glob("*.tex"))
+
+    @pytest.mark.timeout(30)
+    def test_parallel_equals_serial(self, tmp_path):
+        """tests that worker processes generate the same files as a serial run"""
+
+        def jobs(directory):
+            return [
+                batch.Job(
+                    name=task,
+                    category="sorting",
+                    task=task,
+                    seed=seed,
+                    exercise=str(directory / f"{task}-exercise"),
+                    solution=str(directory / f"{task}-solution"),
+                )
+                for seed, task in enumerate(["bubble", "merge", "heap", "counting"])
+            ]
+
+        (tmp_path / "serial").mkdir()
+        (tmp_path / "parallel").mkdir()
+        serial = batch.run_batch(jobs(tmp_path / "serial"))
+        parallel = batch.run_batch(jobs(tmp_path / "parallel"), num_workers=2)
+        assert all(result.success for result in serial + parallel)
+        for file in (tmp_path / "serial").iterdir():
+            assert file.read_bytes() == (tmp_path / "parallel" / file.name).read_bytes()
+
+    @pytest.mark.timeout(30)
+    def test_moodle_question_bank(self, tmp_path):
+        """tests that every successful job is streamed into one Moodle XML question bank"""
+        manifest = write_manifest(
+            tmp_path / "manifest.json",
+            [
+                {"category": "sorting", "task": "bubble", "input": [3, 1, 2]},
+                {"category": "sorting", "task": "bubble", "input": "a,b"},
+                {
+                    "category": "hashing",
+                    "task": "linearprobing",
+                    "input": "+3,+14",
+                    "arguments": ["--div", "11"],
+                },
+            ],
+        )
+        banks = []
+        for num_workers in ("1", "2"):
+            bank = tmp_path / f"bank{num_workers}"
+            arguments = ["pyAlgoTask", "batch", str(manifest), "-j", num_workers]
+            with mock.patch("sys.argv", arguments + ["--moodle", str(bank)]):
+                with pytest.raises(SystemExit) as pytest_exit:
+                    pyAlgoTask.main()
+            assert pytest_exit.value.code == 1
+            banks.append((tmp_path / f"bank{num_workers}.xml").read_text("UTF-8"))
+        assert banks[0] == banks[1]
+
+        quiz = ElementTree.fromstring(banks[0])
+        assert [question.get("type") for question in quiz] == ["category"] + [
+            "cloze"
+        ] * 2
+        assert quiz[0].find("category/text").text == "$course$/pyAlgoTask/manifest"
+        bubble = quiz[1].find("questiontext/text").text
+        assert bubble.count("{1:SHORTANSWER:=") == 2 * 3
+        assert "{1:SHORTANSWER:=1}" in bubble and "<em>each</em>" in bubble
+        hashing = quiz[2].find("questiontext/text").text
+        assert hashing.count("{1:SHORTANSWER:=-}") == 11 - 2
+        assert hashing.count("{1:SHORTANSWER:=14}") == 1
+
+    def test_cloze_answer(self):
+        """tests that special characters of cloze answers are escaped"""
+        assert moodle.cloze_answer(0.5) == "{1:SHORTANSWER:=0.5}"
+        assert moodle.cloze_answer("") == "{1:SHORTANSWER:=-}"
+        assert moodle.cloze_answer("a}#/b") == "{1:SHORTANSWER:=a\\}\\#\\/b}"
+
+    def test_malformed_manifest(self, tmp_path):
+        """tests that malformed manifests are rejected"""
+        manifest = write_manifest(tmp_path / "manifest.json", [{"category": "sorting"}])
+        with pytest.raises(ValueError):
+            batch.read_manifest(manifest)
+
+    @pytest.mark.timeout(10)
+    def test_sheet_combines_tasks(self, tmp_path):
+        """tests that a sheet writes every task into one exercise document"""
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(
+            json.dumps(
+                {
+                    "defaults": {"category": "sorting", "seed": 1},
+                    "sheets": [
+                        {
+                            "name": "week1",
+                            "exercise": str(tmp_path / "sheet"),
+                            "tasks": [{"task": "bubble"}, {"task": "insertion"}],
+                        }
+                    ],
+                }
+            ),
+            encoding="UTF-8",
+        )
+        results = batch.run_batch(batch.read_manifest(manifest))
+        assert all(result.success for result in results), results
+        content = (tmp_path / "sheet.tex").read_text()
+        assert "Task 1" in content and "Task 2" in content
+        assert content.count(r"\usetikzlibrary{positioning}") == 1
+
+    @pytest.mark.timeout(10)
+    def test_sheet_ignores_previous_job(self, tmp_path):
+        """tests that a sheet does not keep the output arguments of a previous job"""
+        sheet = {
+            "name": "week1",
+            "exercise": "",
+            "tasks": [{"task": "bubble"}, {"task": "insertion"}],
+        }
+        contents = []
+        for name, jobs in (("alone", []), ("after", [{"task": "bubble"}])):
+            manifest = tmp_path / f"{name}.json"
+            sheet["solution"] = str(tmp_path / name)
+            for job in jobs:
+                job["arguments"] = "--renderer macro --stream"
+                job["exercise"] = ""
+                job["solution"] = str(tmp_path / f"{name}-job")
+            manifest.write_text(
+                json.dumps(
+                    {
+                        "defaults": {"category": "sorting", "seed": 1},
+                        "jobs": jobs,
+                        "sheets": [sheet],
+                    }
+                ),
+                encoding="UTF-8",
+            )
+            results = batch.run_batch(batch.read_manifest(manifest))
+            assert all(result.success for result in results), results
+            contents.append((tmp_path / f"{name}.tex").read_text(encoding="UTF-8"))
+        assert "\\pyaarray" in (tmp_path / "after-job.tex").read_text(encoding="UTF-8")
+        assert contents[1] == contents[0] and "\\pyaarray" not in contents[0]
+
+    @pytest.mark.timeout(10)
+    def test_language_per_job(self, tmp_path):
+        """tests that jobs of different languages are generated in one batch"""
+        jobs = [
+            batch.Job(
+                name=language,
+                category="sorting",
+                task="bubble",
+                input="3,1,2",
+                exercise=str(tmp_path / language),
+                language=language,
+            )
+            for language in ["deDE", "enUK"]
+        ]
+        results = batch.run_batch(jobs)
+        assert all(result.success for result in results), results
+        assert "Gegeben" in (tmp_path / "deDE.tex").read_text(encoding="UTF-8")
+        assert "Given" in (tmp_path / "enUK.tex").read_text(encoding="UTF-8")
@@ -0,0 +1,138 @@
+"""Module for testing the compilation of LaTeX files"""
+import os
+import sys
+import pytest
+
+from pyalgotask.compile import CompileCache, CompileScheduler, FormatCache
+
+# a stand-in for latexmk writing a pdf, or a log with an error for files named fail*
+__FAKE_COMPILER__ = """
+import pathlib, sys
+outdir = pathlib.Path(sys.argv[-2].split("=", 1)[1])
+tex = pathlib.Path(sys.argv[-1])
+if tex.stem.startswith("fail"):
+    (outdir / (tex.stem + ".log")).write_text("This is pdfTeX\\n! Undefined control sequence.\\nl.3 \\\\foo\\n")
+    sys.exit(12)
+(outdir / (tex.stem + ".pdf")).write_text(tex.read_text() + " ".join(sys.argv[1:-2]))
+"""
+
+# a stand-in for pdftex dumping a format, counting its calls in builds.txt
+__FAKE_FORMAT_BUILDER__ = """
+import pathlib, sys
+arguments = dict(argument.split("=", 1) for argument in sys.argv[1:] if "=" in argument)
+with open(pathlib.Path(arguments["-output-directory"]).parent / "builds.txt", "a") as log:
+    log.write(arguments["-jobname"] + "\\n")
+if "broken" not in pathlib.Path(sys.argv[-1]).read_text():
+    (pathlib.Path(arguments["-output-directory"]) / (arguments["-jobname"] + ".fmt")).write_text("")
+"""
+
+
+def fake_scheduler(max_workers=2, cache=None, formats=None):
+    """Creates a scheduler running the fake compiler"""
+    return CompileScheduler(
+        max_workers,
+        compiler=sys.executable,
+        compiler_args=["-c", __FAKE_COMPILER__],
+        cache=cache,
+        formats=formats,
+    )
+
+
+def fake_formats(directory):
+    """Creates a format cache running the fake format builder"""
+    return FormatCache(
+        directory, builder=sys.executable, builder_args=["-c", __FAKE_FORMAT_BUILDER__]
+    )
+
+
+class TestCompile:
+    """Class for testing the compile scheduler"""
+
+    @pytest.mark.timeout(10)
+    def test_results_in_order(self, tmp_path):
+        """tests that every file is compiled and failures carry a log excerpt"""
+        names = ["first", "fail", "second", "third", "fail.v2"]
+        for name in names:
+            (tmp_path / f"{name}.tex").write_text(name)
+        scheduler = fake_scheduler()
+        for name in names:
+            scheduler.submit(tmp_path / f"{name}.tex")
+        results = scheduler.wait()
+        scheduler.close()
+
+        assert [result.success for result in results] == [
+            True,
+            False,
+            True,
+            True,
+            False,
+        ]
+        for failed in (results[1], results[4]):
+            assert "Undefined control sequence" in failed.log_excerpt
+        for name in ["first", "second", "third"]:
+            assert (tmp_path / f"{name}.pdf").read_text() == name
+        assert sorted(file.name for file in tmp_path.iterdir() if file.is_dir()) == []
+
+    @pytest.mark.timeout(10)
+    def test_missing_compiler(self, tmp_path):
+        """tests that a missing compiler is reported as failure"""
+        (tmp_path / "file.tex").write_text("")
+        scheduler = CompileScheduler(1, compiler="pyalgotask-missing-compiler")
+        scheduler.submit(tmp_path / "file.tex")
+        (result,) = scheduler.wait()
+        assert not result.success
+
+    @pytest.mark.timeout(10)
+    def test_cache_hit(self, tmp_path):
+        """tests that unchanged sources are taken from the cache"""
+        cache = CompileCache(tmp_path / "cache")
+        (tmp_path / "a.tex").write_text("same")
+        (tmp_path / "b.tex").write_text("same")
+        scheduler = fake_scheduler(cache=cache)
+        (first,) = [scheduler.compile(tmp_path / "a.tex")]
+        second = scheduler.compile(tmp_path / "b.tex")
+        assert first.success and not first.cached
+        assert second.success and second.cached
+        assert (tmp_path / "b.pdf").read_text().startswith("same")
+
+        (tmp_path / "a.tex").write_text("changed")
+        assert not scheduler.compile(tmp_path / "a.tex").cached
+
+    def test_cache_eviction(self, tmp_path):
+        """tests that the least recently used entries are evicted first"""
+        cache = CompileCache(tmp_path / "cache", max_size=15)
+        for index, key in enumerate(["old", "used", "new"]):
+            (tmp_path / f"{key}.pdf").write_bytes(b"12345")
+            cache.store(key, tmp_path / f"{key}.pdf")
+            os.utime(cache.directory / f"{key}.pdf", (index, index))
+        assert cache.fetch("old", tmp_path / "fetched.pdf")
+        cache.max_size = 10
+        cache.evict()
+        assert sorted(file.name for file in cache.directory.iterdir()) == [
+            "new.pdf",
+            "old.pdf",
+        ]
+
+    @pytest.mark.timeout(10)
+    def test_precompiled_format(self, tmp_path):
+        """tests that documents sharing a preamble share one precompiled format"""
+        preamble = "\\documentclass{article}\\usepackage{tikz}"
+        for name in ["a", "b"]:
+            (tmp_path / f"{name}.tex").write_text(
+                preamble + "\\begin{document}" + name + "\\end{document}"
+            )
+        (tmp_path / "c.tex").write_text("broken\\begin{document}\\end{document}")
+        formats = fake_formats(tmp_path / "formats")
+        scheduler = fake_scheduler(formats=formats)
+        results = [scheduler.compile(tmp_path / f"{name}.tex") for name in "abc"]
+        assert all(result.success for result in results)
+
+        (name,) = {
+            formats.name((tmp_path / f"{name}.tex").read_bytes()) for name in "ab"
+        }
+        assert (tmp_path / "formats" / f"{name}.fmt").exists()
+        assert f"-fmt={name}" in (tmp_path / "a.pdf").read_text()
+        assert f"-fmt={name}" in (tmp_path / "b.pdf").read_text()
+        assert "-fmt" not in (tmp_path / "c.pdf").read_text()
+        assert len((tmp_path / "formats" / "builds.txt").read_text().split()) == 2
+        assert formats.settings() in scheduler.settings()
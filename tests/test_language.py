@@ -0,0 +1,69 @@
+"""Module for testing the language catalogues"""
+# pylint: disable=protected-access
+import shutil
+import pytest
+import mock
+
+import pyalgotask.main as pyAlgoTask
+from pyalgotask import language as lang
+from pyalgotask.tasks import task_base
+
+
+@pytest.fixture(name="language_folder")
+def fixture_language_folder(tmp_path, monkeypatch):
+    """Copies the language files into a temporary folder and empties every cache"""
+    folder = tmp_path / "languages"
+    shutil.copytree(
+        lang._language_folder,
+        folder,
+        ignore=shutil.ignore_patterns("__pycache__"),
+    )
+    monkeypatch.setattr(lang, "_language_folder", folder)
+    monkeypatch.setattr(lang, "_cache_folder", folder / "__pycache__")
+    monkeypatch.setattr(lang, "_catalogues", {})
+    return folder
+
+
+class TestLanguage:
+    """Class for testing the lazily loaded language catalogues"""
+
+    def test_catalogue_parsed_once(self, language_folder, monkeypatch):
+        """tests that every language file is parsed only once, even by later processes"""
+        parse_language_file = lang._parse_language_file
+        parse = mock.Mock(side_effect=parse_language_file)
+        monkeypatch.setattr(lang, "_parse_language_file", parse)
+        for language in ["enUK", "deDE", "enUK", "deDE"]:
+            with lang.use_language(language):
+                lang.get_text("sorting", "bubble-prefix")
+        assert parse.call_count == 2
+
+        monkeypatch.setattr(lang, "_catalogues", {})
+        assert lang.get_catalogue("deDE").language_name == "German"
+        assert parse.call_count == 2
+
+        with (language_folder / "deDE.yaml").open("a", encoding="UTF-8") as file:
+            file.write("  extra: Zusatz\n")
+        monkeypatch.setattr(lang, "_catalogues", {})
+        assert lang.get_catalogue("deDE").texts[("extra",)] == "Zusatz"
+        assert parse.call_count == 3
+
+    @pytest.mark.usefixtures("language_folder")
+    def test_language_per_call(self):
+        """tests that tasks of different languages are created in one process"""
+        with lang.use_language("deDE"):
+            german = task_base.create_task("sorting", "bubble")
+        english = task_base.create_task("sorting", "bubble")
+        assert german.exercise_texts[0] == "Gegeben folgendes Array A:"
+        assert english.exercise_texts[0] == "Given this array A:"
+        with pytest.raises(ValueError):
+            with lang.use_language("xxXX"):
+                pass
+
+    @pytest.mark.timeout(10)
+    def test_language_argument(self, tmp_path):
+        """tests that the language of the command-line is used"""
+        exercise = tmp_path / "exercise"
+        arguments = ["pyAlgoTask", "-l", "deDE", "sorting", "merge", "-i", "3,1,2"]
+        with mock.patch("sys.argv", arguments + ["-e", str(exercise), "-s", ""]):
+            pyAlgoTask.main()
+        assert "Gegeben" in (tmp_path / "exercise.tex").read_text(encoding="UTF-8")
@@ -0,0 +1,382 @@
+"""Module for testing the output modules"""
+import io
+import json
+import pytest
+import mock
+
+import pyalgotask.main as pyAlgoTask
+
+from pyalgotask import batch
+from pyalgotask.export import exercise_document, solution_document, trace_records
+from pyalgotask.output import preview, tikz
+from pyalgotask.tasks import task_base
+from pyalgotask.trace import (
+    DeltaTrace,
+    Step,
+    StreamedTrace,
+    Swap,
+    Trace,
+    Write,
+    is_highlighted,
+    replay,
+)
+
+__TASKS__ = [
+    (category, cmd_info.cmd)
+    for category in ("sorting", "hashing")
+    for cmd_info in task_base.task_iterator(category)
+]
+__ARGUMENTS__ = {
+    "chaining": ["--div", "11"],
+    "linearprobing": ["--div", "11"],
+    "quadraticprobing": ["--div", "11"],
+    "doublehashing": ["--div", "11", "--div2", "7"],
+}
+
+__COPIED_INPUT__ = [4, 1, 5, 3, 2]
+# the arrays and highlighted indices yielded by the sorting algorithms on __COPIED_INPUT__,
+# before they were recorded as deltas, when they still yielded a copy of the array per step
+__COPIED_STEPS__ = {
+    "bubble": [
+        ([4, 1, 5, 2, 3], None),
+        ([4, 1, 2, 5, 3], None),
+        ([1, 4, 2, 5, 3], None),
+        ([1, 4, 2, 3, 5], None),
+        ([1, 2, 4, 3, 5], None),
+        ([1, 2, 3, 4, 5], None),
+    ],
+    "insertion": [
+        ([1, 4, 5, 3, 2], None),
+        ([1, 4, 5, 3, 2], None),
+        ([1, 3, 4, 5, 2], None),
+        ([1, 2, 3, 4, 5], None),
+    ],
+    "selection": [
+        ([4, 1, 2, 3, 5], None),
+        ([3, 1, 2, 4, 5], None),
+        ([2, 1, 3, 4, 5], None),
+        ([1, 2, 3, 4, 5], None),
+        ([1, 2, 3, 4, 5], None),
+    ],
+    "merge": [
+        ([1, 4, 5, 3, 2], [0, 1]),
+        ([1, 4, 5, 3, 2], [0, 1, 2]),
+        ([1, 4, 5, 2, 3], [3, 4]),
+        ([1, 2, 3, 4, 5], [0, 1, 2, 3, 4]),
+    ],
+    "heap": [
+        ([5, 3, 4, 1, 2], None),
+        ([4, 3, 2, 1, 5], [4]),
+        ([3, 1, 2, 4, 5], [3, 4]),
+        ([2, 1, 3, 4, 5], [2, 3, 4]),
+        ([1, 2, 3, 4, 5], [1, 2, 3, 4]),
+    ],
+    "quick-hoare": [
+        ([1, 2, 5, 3, 4], [0, 1, 2, 3, 4]),
+        ([1, 2, 3, 4, 5], [2, 3, 4]),
+    ],
+    "quick-lomuto": [
+        ([1, 2, 5, 3, 4], [0, 1, 2, 3, 4]),
+        ([1, 2, 3, 4, 5], [2, 3, 4]),
+    ],
+}
+
+
+def prepare_task(category: str, task_name: str, seed: int):
+    """Prepares a seeded task with the arguments it requires"""
+    return batch.prepare_job(
+        batch.Job(
+            name="0",
+            category=category,
+            task=task_name,
+            seed=seed,
+            arguments=__ARGUMENTS__.get(task_name, []),
+        )
+    )
+
+
+class TestOutput:
+    """Class for testing the rendering of outputs"""
+
+    @pytest.mark.parametrize("category, task_name", __TASKS__)
+    @pytest.mark.parametrize("seed", [1, 2])
+    @pytest.mark.timeout(10)
+    def test_renderers_are_identical(self, category, task_name, seed):
+        """tests that the string renderer produces the same LaTeX code as pylatex"""
+        task = prepare_task(category, task_name, seed)
+        output = task.task_io.output
+        sources = {}
+        for renderer in ("pylatex", "string"):
+            output.use_renderer(renderer)
+            sources[renderer] = (
+                exercise_document(task).dumps(),
+                solution_document(task).dumps(),
+            )
+        assert sources["string"] == sources["pylatex"]
+
+    @pytest.mark.parametrize("category, task_name", __TASKS__)
+    @pytest.mark.timeout(10)
+    def test_macro_renderer(self, category, task_name):
+        """tests that the macro renderer writes one macro call per array"""
+        task = prepare_task(category, task_name, 1)
+        output = task.task_io.output
+        output.use_renderer("macro")
+        solution = solution_document(task).dumps()
+        exercise = exercise_document(task).dumps()
+        for source in (exercise, solution):
+            assert source.count("\\newcommand{\\pyaarray}") == 1
+        body = solution.split("\\begin{document}")[1]
+        empty_rows = sum(1 for step in output.get_trace() if len(step[0]) == 0)
+        assert body.count("\\node[node") == empty_rows
+        assert body.count("\\pyaarray{") + empty_rows == len(output.get_trace()) + (
+            category == "sorting"
+        )
+
+    @pytest.mark.parametrize("category, task_name", __TASKS__)
+    @pytest.mark.timeout(10)
+    def test_table_renderer(self, category, task_name):
+        """tests that the table renderer writes one node per array and per label"""
+        task = prepare_task(category, task_name, 1)
+        output = task.task_io.output
+        output.use_renderer("table")
+        preamble, body = solution_document(task).dumps().split("\\begin{document}")
+        rows = len(output.get_trace()) + (category == "sorting")
+        tables = body.count("\\node[pyatable")
+        assert tables - body.count("(top_label") == rows
+        assert body.count("\\node") == tables + body.count("\\node[left=of")
+        assert "colortbl" in preamble and "pyatable" in preamble
+        assert "colortbl" in exercise_document(task).dumps()
+
+    @pytest.mark.parametrize("category, task_name", __TASKS__)
+    @pytest.mark.timeout(10)
+    def test_html_preview(self, category, task_name):
+        """tests that the HTML preview draws one rectangle per entry of every array"""
+        task = prepare_task(category, task_name, 1)
+        output = task.task_io.output
+        entries = sum(max(len(array), 1) for array, _ in output.get_trace())
+        if category == "sorting":
+            entries += len(output.task_info.task_array)
+        solution = preview.solution_body(output)
+        assert solution.count("<rect") == entries
+        highlights = sum(
+            preview.is_highlighted(highlights, i)
+            for array, highlights in output.get_trace()
+            for i in range(len(array))
+        )
+        assert solution.count('<rect class="highlight"') == highlights
+        exercise = preview.exercise_body(output)
+        assert exercise.count("<svg") == 1 + (category == "sorting")
+        assert "\\" not in exercise
+
+    def test_latex_to_html(self):
+        """tests the translation of the texts of the language files"""
+        assert preview.latex_to_html("note \\emph{each} <step>") == (
+            "note <em>each</em> &lt;step&gt;"
+        )
+        assert preview.latex_to_html("$$h_{2}(x) = x \\bmod 7$$") == (
+            '<span class="display math">h<sub>2</sub>(x) = x mod 7</span>'
+        )
+        assert preview.latex_to_text("$2^{4}$ \\noindent~C:") == "24 \xa0C:"
+
+    def test_html_option(self, tmp_path):
+        """tests that --html writes a preview next to the LaTeX files"""
+        arguments = ["pyAlgoTask", "sorting", "bubble", "-i", "3,1,2", "--html"]
+        arguments += ["-e", str(tmp_path / "e"), "-s", str(tmp_path / "s")]
+        with mock.patch("sys.argv", arguments):
+            pyAlgoTask.main()
+        solution = (tmp_path / "s.html").read_text(encoding="UTF-8")
+        assert solution.startswith("<!DOCTYPE html>")
+        assert solution.count("<rect") == 3 * 3
+        assert (tmp_path / "e.html").exists() and (tmp_path / "e.tex").exists()
+
+    @pytest.mark.parametrize("category, task_name", __TASKS__)
+    @pytest.mark.timeout(10)
+    def test_trace_records(self, category, task_name):
+        """tests that the trace records contain every step and are valid JSON"""
+        task = prepare_task(category, task_name, 1)
+        records = list(trace_records(task, category=category, seed=1))
+        assert json.loads(json.dumps(records, default=str))[0]["task"] == task_name
+        assert records[0]["randomized"] and records[0]["input"]
+        steps = list(task.task_io.output.get_trace())
+        assert [record["array"] for record in records[1:]] == [
+            list(array) for array, _ in steps
+        ]
+        for record, (array, highlights) in zip(records[1:], steps):
+            assert [i in (record["highlights"] or []) for i in range(len(array))] == [
+                is_highlighted(highlights, i) for i in range(len(array))
+            ]
+        if category == "hashing":
+            assert records[0]["parameters"]["hashtable_size"] == 11
+
+    @pytest.mark.parametrize(
+        "task_name", ["bubble", "quick-hoare", "radix", "counting"]
+    )
+    @pytest.mark.timeout(10)
+    def test_stream_equals_document(self, tmp_path, task_name):
+        """tests that a streamed solution equals the solution written at once"""
+        for name, options in (("streamed", ["--stream"]), ("whole", [])):
+            arguments = ["pyAlgoTask", "sorting", task_name, "-i", "9,3,7,1,8,2,5"]
+            arguments += ["-e", "", "-s", str(tmp_path / name)] + options
+            with mock.patch("sys.argv", arguments):
+                pyAlgoTask.main()
+        streamed = (tmp_path / "streamed.tex").read_text(encoding="UTF-8")
+        assert streamed == (tmp_path / "whole.tex").read_text(encoding="UTF-8")
+
+    def test_streamed_picture(self):
+        """tests that a streamed picture keeps only the nodes of the current row"""
+        renderer = tikz.create_renderer("string", stream=True)
+        picture = renderer.create_picture("node distance=0")
+        sizes = []
+
+        def rows():
+            for i in range(3):
+                renderer.value_node(picture, f"n{i}", ["node"], i, 0)
+                sizes.append(len(picture.nodes))
+                yield
+
+        streamed = renderer.finish_picture(picture, rows())
+        stream = io.StringIO()
+        streamed.write(stream)
+        assert sizes == [1, 1, 1]
+        assert stream.getvalue() == (
+            "\\begin{tikzpicture}[node distance=0]%\n"
+            + "".join(
+                f"\\node[node] (n{i}) {{\\vphantom{{A}} \\phantom{{}} {i}}};%\n"
+                for i in range(3)
+            )
+            + "\\end{tikzpicture}"
+        )
+
+    def test_stream_requires_string_renderer(self):
+        """tests that only the string renderer can stream"""
+        with pytest.raises(ValueError):
+            tikz.create_renderer("pylatex", stream=True)
+
+    @pytest.mark.parametrize("task_name", ["bubble", "counting"])
+    def test_algorithm_runs_once(self, task_name):
+        """tests that exercise and solution share one run of the algorithm"""
+        task = prepare_task("sorting", task_name, 1)
+        output = task.task_io.output
+        runs = []
+        name = "delta_algorithm" if output.delta_algorithm else "algorithm"
+        algorithm = getattr(output, name)
+
+        def counted_algorithm():
+            runs.append(None)
+            yield from algorithm()
+
+        setattr(output, name, counted_algorithm)
+        exercise_document(task).dumps()
+        solution_document(task).dumps()
+        assert len(runs) == 1
+
+    def test_trace_records_lazily(self):
+        """tests that a trace runs the algorithm only as far as requested"""
+        steps = []
+
+        def algorithm():
+            for i in range(3):
+                steps.append(i)
+                yield ([i] * i, None)
+
+        trace = Trace(algorithm)
+        assert not steps
+        assert next(iter(trace)) == ([], None)
+        assert steps == [0]
+        assert list(trace) == [([], None), ([1], None), ([2, 2], None)]
+        assert trace.lengths == [0, 1, 2]
+        assert trace.max_length == 2
+        assert len(trace) == 3 and steps == [0, 1, 2]
+
+    def test_streamed_trace_keeps_no_steps(self):
+        """tests that a streamed trace keeps only the lengths and reruns its algorithm"""
+        runs = []
+
+        def algorithm():
+            runs.append(None)
+            for i in range(3):
+                yield ([i] * i, None)
+
+        trace = StreamedTrace(algorithm)
+        assert len(trace) == 3 and trace.max_length == 2
+        assert trace.lengths == [0, 1, 2] and not trace.steps
+        assert list(trace) == [([], None), ([1], None), ([2, 2], None)]
+        assert len(runs) == 2
+
+    @pytest.mark.parametrize("task_name, expected", __COPIED_STEPS__.items())
+    def test_delta_trace_equals_copies(self, task_name, expected):
+        """tests that the replayed deltas of a task equal the arrays and highlights yielded by
+        the former implementation copying its array in every step"""
+        task = batch.prepare_job(
+            batch.Job(
+                name="0",
+                category="sorting",
+                task=task_name,
+                arguments=["-i", ",".join(map(str, __COPIED_INPUT__))],
+            )
+        )
+        trace = task.task_io.output.get_trace()
+        assert isinstance(trace, DeltaTrace)
+        assert all(isinstance(step, Step) for step in trace.steps)
+        assert [
+            (
+                array,
+                [i for i in range(len(array)) if is_highlighted(highlights, i)] or None,
+            )
+            for array, highlights in trace
+        ] == expected
+        assert trace.lengths == [len(__COPIED_INPUT__)] * len(expected)
+
+    def test_replay(self):
+        """tests the replay of swaps and writes"""
+        steps = [
+            Step((Swap(0, 2),), None),
+            Step((Write(1, (7, 8)), Swap(0, 1)), [True, False, False]),
+        ]
+        assert list(replay([1, 2, 3], steps)) == [
+            ([3, 2, 1], None),
+            ([7, 3, 8], [True, False, False]),
+        ]
+
+    @pytest.mark.parametrize(
+        "highlights",
+        [
+            [False, True, True, False, True],
+            (range(1, 3), range(4, 5)),
+            0b10110,
+        ],
+    )
+    def test_highlight_encodings(self, highlights):
+        """tests that every highlight encoding resolves to the same entries"""
+        assert [is_highlighted(highlights, i) for i in range(6)] == [
+            False,
+            True,
+            True,
+            False,
+            True,
+            False,
+        ]
+        assert [is_highlighted(range(2, 4), i) for i in range(5)] == [
+            False,
+            False,
+            True,
+            True,
+            False,
+        ]
+        assert not any(is_highlighted(None, i) for i in range(3))
+
+    def test_write_picture(self):
+        """tests that writing a picture into a stream equals its LaTeX code"""
+        renderer = tikz.create_renderer("string")
+        for nodes in range(3):
+            picture = renderer.create_picture("node distance=0")
+            for i in range(nodes):
+                renderer.value_node(picture, f"n{i}", ["node"], i, 0)
+            stream = io.StringIO()
+            picture.write(stream)
+            assert stream.getvalue() == picture.dumps()
+
+    def test_unknown_renderer(self):
+        """tests that unknown renderers are rejected"""
+        with pytest.raises(ValueError):
+            tikz.create_renderer("unknown")
@@ -0,0 +1,109 @@
+"""Module for testing the server mode"""
+# pylint: disable=protected-access
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+import pathlib
+import sys
+import pytest
+
+from pyalgotask import server
+from pyalgotask.compile import CompileScheduler
+
+# a stand-in for latexmk copying the LaTeX file into the pdf file
+__FAKE_COMPILER__ = """
+import pathlib, shutil, sys
+outdir = pathlib.Path(sys.argv[-2].split("=", 1)[1])
+tex = pathlib.Path(sys.argv[-1])
+shutil.copy(tex, outdir / (tex.stem + ".pdf"))
+"""
+
+
+async def send_requests(tmp_path, lines):
+    """Starts a server on a unix socket, sends the lines and returns the responses"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        generation_server = server.Server(executor, tmp_path)
+        socket = tmp_path / "server.sock"
+        async with await generation_server.start(unix_socket=socket):
+            reader, writer = await asyncio.open_unix_connection(str(socket))
+            for line in lines:
+                writer.write(line.encode() + b"\n")
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in lines]
+            writer.close()
+            await writer.wait_closed()
+    return responses
+
+
+class TestServer:
+    """Class for testing the generation server"""
+
+    @pytest.mark.timeout(10)
+    def test_requests(self, tmp_path):
+        """tests that valid and invalid requests are answered in order"""
+        lines = [
+            json.dumps({"id": 1, "category": "sorting", "task": "bubble", "seed": 1}),
+            "not json",
+            json.dumps({"id": 3, "category": "sorting", "task": "unknown"}),
+            json.dumps(
+                {"id": 4, "category": "sorting", "task": "bubble", "exercise": "x"}
+            ),
+            json.dumps({"id": 5, "category": "sorting", "task": "bubble", "seed": 1}),
+            json.dumps(
+                {"id": 6, "category": "sorting", "task": "bubble", "trace": "steps"}
+            ),
+        ]
+        responses = asyncio.run(send_requests(tmp_path, lines))
+        assert responses[0]["id"] == 1
+        assert r"\begin{document}" in responses[0]["exercise"]
+        assert r"\begin{document}" in responses[0]["solution"]
+        assert "error" in responses[1]
+        assert responses[2]["id"] == 3 and "error" in responses[2]
+        assert responses[3]["id"] == 4 and "error" in responses[3]
+        assert responses[4]["exercise"] == responses[0]["exercise"]
+        assert responses[5]["id"] == 6 and "trace" in responses[5]["error"]
+        assert "exercise" not in responses[5]
+
+    def test_generate_without_server(self, tmp_path):
+        """tests that the worker function answers requests directly"""
+        response = server.generate(
+            {
+                "category": "hashing",
+                "task": "chaining",
+                "seed": 2,
+                "arguments": "--div 5",
+            },
+            tmp_path,
+        )
+        assert "error" not in response, response
+        assert response["id"] is None
+
+    @pytest.mark.timeout(10)
+    def test_pdf_retention(self, tmp_path):
+        """tests that pdf requests delete their LaTeX files and keep only the newest pdfs"""
+        server._worker_state["scheduler"] = CompileScheduler(
+            1, compiler=sys.executable, compiler_args=["-c", __FAKE_COMPILER__]
+        )
+        try:
+            responses = [
+                server.generate(
+                    {
+                        "category": "sorting",
+                        "task": "bubble",
+                        "seed": seed,
+                        "pdf": True,
+                    },
+                    tmp_path,
+                    max_pdfs=3,
+                )
+                for seed in range(3)
+            ]
+        finally:
+            server._worker_state.pop("scheduler").close()
+        assert all("error" not in response for response in responses), responses
+        assert not list(tmp_path.glob("*.tex"))
+        assert len(list(tmp_path.glob("*.pdf"))) == 3
+        assert all(
+            pathlib.Path(responses[-1][key]).exists()
+            for key in ("exercise", "solution")
+        )
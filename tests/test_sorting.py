@@ -5,6 +5,7 @@ import mock
 
 import pyalgotask.main as pyAlgoTask
 from pyalgotask.tasks import task_base
+from pyalgotask.tasks.sorting import quicksort
 
 __CATEGORY__ = "sorting"
 __TASK_NAMES__ = [
@@ -73,8 +74,144 @@ class TestSorting:
                     False
                 ), f'The argument {sys.argv} on input {task.task_io.randomizer.last_result} \
                     raised the exception "{exc}" but should not have.'
-            output = [task.array] + [array for (array, _) in task.algorithm()]
+            output = [task.array] + [
+                array for (array, _) in task.task_io.output.get_trace()
+            ]
             assert output[-1] == sorted(task.array), (
                 f"The list {task.array} was not sorted correctly by {task_name}. "
                 f"Instead it gave {output[-1]}"
             )
+
+    @pytest.mark.parametrize(
+        "base, input_array, passes",
+        [
+            ("10", "5,3,1", 1),
+            ("10", "10,3,1", 2),
+            ("10", "1000000,999999,0", 7),
+            ("16", "255,16,3", 2),
+            ("2", "0,1,1", 1),
+        ],
+    )
+    @pytest.mark.timeout(2)
+    def test_radix_base(self, base, input_array, passes):
+        """tests that radix sort makes one counting pass per digit in the given base"""
+        arguments = input_argument("radix", input_array) + ["--base", base]
+        with mock.patch("sys.argv", arguments):
+            task = task_base.get_task_by_cmd("sorting", "radix")
+            pyAlgoTask.main()
+        steps = [array for (array, _) in task.task_io.output.get_trace()]
+        assert len(steps) == passes
+        assert steps[-1] == sorted(task.array)
+        assert task.parameters() == {"base": int(base)}
+
+    @pytest.mark.parametrize(
+        "mode, counts", [("offset", [2, 0, 0, 1, 0, 2, 1]), ("sparse", [2, 1, 2, 1])]
+    )
+    @pytest.mark.timeout(2)
+    def test_counting_modes(self, mode, counts):
+        """tests that the counting array only has entries for the values of the mode"""
+        arguments = input_argument("counting", "3,-2,1,-2,3,4")
+        with mock.patch("sys.argv", arguments + ["--counting-mode", mode]):
+            task = task_base.get_task_by_cmd("sorting", "counting")
+            pyAlgoTask.main()
+        steps = [array for (array, _) in task.task_io.output.get_trace()]
+        assert steps[0] == counts
+        assert steps[-1] == sorted(task.array)
+        labels = task.task_io.output.latex_options.exercise_top_labels
+        assert labels[0] == [str(key) for key in task.counting_keys()]
+        assert len(labels[0]) == len(counts) and labels[2] is None
+
+    @pytest.mark.timeout(2)
+    def test_counting_dense_rejects_negative(self):
+        """tests that the dense counting mode rejects negative values"""
+        with mock.patch("sys.argv", input_argument("counting", "3,-2,1")):
+            with pytest.raises(SystemExit) as pytest_exit:
+                pyAlgoTask.main()
+        assert pytest_exit.value.code == 2
+
+    @pytest.mark.parametrize("scheme", ["quick-lomuto", "quick-hoare"])
+    @pytest.mark.parametrize("pivot", ["last", "median3", "random"])
+    @pytest.mark.timeout(2)
+    def test_quick_pivot(self, scheme, pivot):
+        """tests that every pivot strategy sorts with both partition schemes"""
+        arguments = input_argument(scheme, "9,3,7,1,8,2,5,3") + ["--pivot", pivot]
+        with mock.patch("sys.argv", arguments + ["--pivot-seed", "4"]):
+            task = task_base.get_task_by_cmd("sorting", scheme)
+            pyAlgoTask.main()
+        steps = [array for (array, _) in task.task_io.output.get_trace()]
+        assert steps[-1] == sorted(task.array)
+        assert task.parameters()["pivot"] == pivot
+        if pivot == "random":
+            pivots = ", ".join(str(value) for value in task.pivots)
+            assert pivots in task.task_io.output.get_postfix()
+
+    @pytest.mark.parametrize("scheme", ["quick-lomuto", "quick-hoare"])
+    @pytest.mark.timeout(10)
+    def test_quick_sorted_input(self, scheme):
+        """tests that the worst case of the last pivot does not exceed the recursion limit"""
+        task = task_base.get_task_by_cmd("sorting", scheme)
+        task.array = list(range(sys.getrecursionlimit() + 1000))
+        steps = list(task.delta_algorithm())
+        assert len(steps) >= len(task.array) // 2
+        assert all(
+            step.deltas[0].values == tuple(sorted(step.deltas[0].values))
+            for step in steps
+        )
+
+    @pytest.mark.timeout(2)
+    def test_quick_random_pivot_is_reproducible(self):
+        """tests that the random pivots only depend on the seed"""
+        pivots = []
+        for seed in ("5", "5", "6"):
+            arguments = input_argument("quick-hoare", "9,3,7,1,8,2,5,3,6,4,0")
+            with mock.patch(
+                "sys.argv", arguments + ["--pivot", "random"] + ["--pivot-seed", seed]
+            ):
+                task = task_base.get_task_by_cmd("sorting", "quick-hoare")
+                pyAlgoTask.main()
+            pivots.append(task.pivots)
+        assert pivots[0] == pivots[1] != pivots[2]
+
+    @pytest.mark.timeout(2)
+    def test_quick_random_pivot_runs_once(self):
+        """tests that listing the random pivots in the exercise does not sort again"""
+        arguments = input_argument("quick-lomuto", "9,3,7,1,8,2,5,3,6,4,0")
+        with mock.patch(
+            "pyalgotask.tasks.sorting.quicksort._quicksort", wraps=quicksort._quicksort
+        ) as sort, mock.patch("sys.argv", arguments + ["--pivot", "random"]):
+            task = task_base.get_task_by_cmd("sorting", "quick-lomuto")
+            pyAlgoTask.main()
+        assert sort.call_count == 1
+        assert len(task.pivots) == len(task.task_io.output.get_trace())
+
+    @pytest.mark.parametrize(
+        "order, ranges",
+        [
+            ("top-down", [(0, 1), (0, 2), (3, 4), (0, 4)]),
+            ("bottom-up", [(0, 1), (2, 3), (0, 3), (0, 4)]),
+        ],
+    )
+    @pytest.mark.timeout(2)
+    def test_merge_order(self, order, ranges):
+        """tests that the merges are made in the given order"""
+        arguments = input_argument("merge", "5,2,4,1,3") + ["--merge-order", order]
+        with mock.patch("sys.argv", arguments):
+            task = task_base.get_task_by_cmd("sorting", "merge")
+            pyAlgoTask.main()
+        steps = list(task.delta_algorithm())
+        assert [
+            (step.highlights.start, step.highlights.stop - 1) for step in steps
+        ] == (ranges)
+        assert list(task.task_io.output.get_trace())[-1][0] == [1, 2, 3, 4, 5]
+        assert task.parameters() == {"merge_order": order}
+
+    @pytest.mark.parametrize("order", ["top-down", "bottom-up"])
+    @pytest.mark.timeout(10)
+    def test_merge_large_input(self, order):
+        """tests that large arrays are merged without exceeding the recursion limit"""
+        task = task_base.get_task_by_cmd("sorting", "merge")
+        task.array = [(i * 7919) % 5003 for i in range(5003)]
+        task.merge_order = order
+        steps = list(task.delta_algorithm())
+        assert len(steps) == len(task.array) - 1
+        assert list(steps[-1].deltas[0].values) == sorted(task.array)
@@ -0,0 +1,50 @@
+"""Module for testing the task registry"""
+import os
+import pathlib
+import subprocess
+import sys
+import pytest
+
+import pyalgotask
+from pyalgotask.tasks import task_base
+
+__IMPORTED_MODULES__ = """
+import sys
+import pyalgotask.main as pyAlgoTask
+sys.argv = ["pyAlgoTask", "sorting", "bubble", "-i", "3,1,2", "-e", "", "-s", ""]
+pyAlgoTask.main()
+print(" ".join(sorted(sys.modules)))
+"""
+
+
+class TestTasks:
+    """Class for testing the lazy task registry"""
+
+    @pytest.mark.timeout(10)
+    def test_only_requested_task_is_imported(self, tmp_path):
+        """tests that running one task does not import other tasks or modes"""
+        process = subprocess.run(
+            [sys.executable, "-c", __IMPORTED_MODULES__],
+            cwd=tmp_path,
+            env=dict(
+                os.environ, PYTHONPATH=str(pathlib.Path(pyalgotask.__file__).parents[1])
+            ),
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+        modules = process.stdout.decode().split()
+        assert "pyalgotask.tasks.sorting.bubble" in modules
+        assert "pyalgotask.tasks.sorting.merge" not in modules
+        assert "pyalgotask.tasks.hashing.hashing_base" not in modules
+        assert "pyalgotask.batch" not in modules
+        assert "pyalgotask.server" not in modules
+
+    def test_registry(self):
+        """tests that every registered task matches its registration"""
+        for category in task_base.category_iterator():
+            for cmd_info in task_base.task_iterator(category):
+                task = task_base.create_task(category, cmd_info.cmd)
+                assert task.cmd_info == cmd_info
+                assert task is not task_base.create_task(category, cmd_info.cmd)
+        with pytest.raises(ValueError):
+            task_base.get_task_info("sorting", "unknown")